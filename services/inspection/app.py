@@ -1,19 +1,45 @@
 from __future__ import annotations
 
 import logging
-from contextlib import asynccontextmanager
+import os
+import time
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from functools import partial
+from typing import AsyncIterator, Callable, Iterable, Iterator, List, Sequence, TypeVar
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, PlainTextResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
+from core.admission import AdmissionController, AdmissionRejected
+from core.config.loader import load_config
+from core.detectors.protocols import IDetector
+from core.execution import DetectorRun
 from core.health import check_liveness, check_readiness
-from core.models import PromptInspectionRequest, PromptInspectionResponse
-from core.rules import analyze_prompt
-from bootstrap import initialize_pipeline
+from core.metrics import InspectionMetrics
+from core.models import (
+    TIMINGS_HEADER,
+    ConversationInspectionRequest,
+    DetectorTiming,
+    Finding,
+    InspectionTimings,
+    PromptInspectionBatchRequest,
+    PromptInspectionBatchResponse,
+    PromptInspectionRequest,
+    PromptInspectionResponse,
+)
+from core.pipeline import InspectionPipeline, PipelineHolder
+from core.rules import analyze_conversation, analyze_prompt, analyze_prompts
+from core.runtime import InspectionRuntime
+from bootstrap import initialize_pipeline, initialize_reloader, initialize_runtime
 from infra.logging import configure_logging
+from infra.prefork import read_process_memory
 
 
 logger = logging.getLogger(__name__)
+T = TypeVar("T")
 # Ensure logging is configured even when uvicorn is launched directly (bypassing main.py).
 configure_logging()
 
@@ -22,9 +48,143 @@ configure_logging()
 async def lifespan(app: FastAPI):
     """Initialize detectors before serving; app only starts if it succeeds."""
     detector_pipeline = initialize_pipeline()
-    app.state.detectors = detector_pipeline
+    config = load_config(os.getenv("INSPECTION_CONFIG_PATH"))
+    holder = PipelineHolder(
+        InspectionPipeline(
+            config=config,
+            detectors=detector_pipeline,
+            runtime=initialize_runtime(),
+        )
+    )
+    app.state.pipelines = holder
+    app.state.admission = AdmissionController.from_config(config.runtime.admission)
+    app.state.metrics = InspectionMetrics.from_config(config.runtime.metrics)
+    app.state.reloader = initialize_reloader(holder)
     logger.info("Inspection service started with %d detectors", len(detector_pipeline))
     yield
+    app.state.reloader.stop()
+    holder.close()
+
+
+@contextmanager
+def _active_pipeline(request: Request) -> Iterator[tuple[Sequence[IDetector] | None, InspectionRuntime | None]]:
+    """Detectors and runtime of the pipeline active when the request started.
+
+    The lease keeps that pipeline alive until the request finishes, even if a
+    config reload swaps in a new one meanwhile.
+    """
+    holder: PipelineHolder | None = getattr(request.app.state, "pipelines", None)
+    if holder is None:
+        yield None, None
+        return
+    with holder.lease() as pipeline:
+        yield pipeline.detectors, pipeline.runtime
+
+
+@asynccontextmanager
+async def _admission(request: Request) -> AsyncIterator[float]:
+    """Admission slot for one inspection; yields its queue wait in ms (0 with admission control off)."""
+    admission: AdmissionController | None = getattr(request.app.state, "admission", None)
+    if admission is None:
+        yield 0.0
+        return
+    async with admission.admit() as queue_ms:
+        yield queue_ms
+
+
+class _ReceivedAt:
+    """ASGI middleware stamping when a request reached the app, so handlers can tell body parsing time."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            scope.setdefault("state", {})["received_at"] = time.perf_counter()
+        await self.app(scope, receive, send)
+
+
+def _parse_ms(request: Request) -> float:
+    """Time from the request reaching the app to the handler (body read and validated)."""
+    received_at = getattr(request.state, "received_at", None)
+    return (time.perf_counter() - received_at) * 1000.0 if received_at is not None else 0.0
+
+
+@dataclass(frozen=True)
+class _Stages:
+    queue_ms: float             # waiting for an admission slot
+    threadpool_wait_ms: float   # admitted, waiting for a worker thread
+    processing_ms: float        # handed to the threadpool until the result came back
+
+
+def _started(analyze: Callable[..., T], *args) -> tuple[float, T]:
+    """Run ``analyze`` and also return when it started, i.e. when the threadpool picked it up."""
+    return time.perf_counter(), analyze(*args)
+
+
+async def _run_inspection(
+    request: Request,
+    endpoint: str,
+    analyze: Callable[..., T],
+    req,
+    prompt_chars: Iterable[int],
+) -> tuple[T, _Stages]:
+    """Admit, lease the active pipeline and run ``analyze`` on the threadpool.
+
+    Returns the result and where the time went, and records the request in
+    the metrics.
+    """
+    metrics: InspectionMetrics | None = getattr(request.app.state, "metrics", None)
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        async with _admission(request) as queue_ms:
+            with _active_pipeline(request) as (detectors, runtime):
+                submitted = time.perf_counter()
+                run_started, result = await run_in_threadpool(_started, analyze, req, detectors, runtime)
+                processing_ms = (time.perf_counter() - submitted) * 1000.0
+        outcome = "ok"
+    except AdmissionRejected:
+        outcome = "rejected"
+        raise
+    finally:
+        if metrics is not None:
+            metrics.requests.labels(endpoint, outcome).inc()
+
+    if metrics is not None:
+        metrics.request_seconds.labels(endpoint).observe(time.perf_counter() - started)
+        metrics.admission_wait_seconds.observe(queue_ms / 1000.0)
+        metrics.threadpool_wait_seconds.observe(run_started - submitted)
+        sizes = metrics.prompt_chars.labels(endpoint)
+        for chars in prompt_chars:
+            sizes.observe(chars)
+    return result, _Stages(queue_ms, (run_started - submitted) * 1000.0, processing_ms)
+
+
+def _wants_timings(req: PromptInspectionRequest | ConversationInspectionRequest, request: Request) -> bool:
+    return req.includeTimings or request.headers.get(TIMINGS_HEADER, "").lower() in ("1", "true", "yes")
+
+
+def _timings(parse_ms: float, stages: _Stages, runs: Sequence[DetectorRun], prompt: str) -> InspectionTimings:
+    return InspectionTimings(
+        parseMs=round(parse_ms, 3),
+        queueMs=round(stages.queue_ms, 3),
+        threadpoolWaitMs=round(stages.threadpool_wait_ms, 3),
+        processingMs=round(stages.processing_ms, 3),
+        detectors=[
+            DetectorTiming(detector=run.detector_name, wallMs=round(run.wall_ms, 3), cpuMs=round(run.cpu_ms, 3))
+            for run in runs
+        ],
+        promptChars=len(prompt),
+        promptLines=len(prompt.splitlines()),
+    )
+
+
+def _count_findings(request: Request, findings: Iterable[Finding]) -> None:
+    metrics: InspectionMetrics | None = getattr(request.app.state, "metrics", None)
+    if metrics is not None:
+        for finding in findings:
+            metrics.findings.labels(finding.type).inc()
 
 
 app = FastAPI(
@@ -45,6 +205,17 @@ app = FastAPI(
     openapi_url="/openapi.json",
     lifespan=lifespan,
 )
+app.add_middleware(_ReceivedAt)
+
+
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected(request: Request, exc: AdmissionRejected) -> JSONResponse:
+    logger.warning("Inspection request shed (%s %s): %s", exc.status_code, request.url.path, exc.reason)
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": exc.reason},
+        headers={"Retry-After": str(exc.retry_after_seconds)},
+    )
 
 
 @app.post(
@@ -55,6 +226,7 @@ app = FastAPI(
 )
 async def inspect(req: PromptInspectionRequest, request: Request) -> PromptInspectionResponse:
     """Runs all enabled detectors on the given prompt and returns findings."""
+    parse_ms = _parse_ms(request)
     meta = req.meta.dict() if req.meta else {}
     prompt_len = len(req.prompt or "")
     logger.info(
@@ -63,14 +235,86 @@ async def inspect(req: PromptInspectionRequest, request: Request) -> PromptInspe
         meta.get("userId"),
         meta.get("source"),
     )
-    detectors = getattr(request.app.state, "detectors", None)
-    resp = await run_in_threadpool(analyze_prompt, req, detectors)
+    runs: List[DetectorRun] | None = [] if _wants_timings(req, request) else None
+    resp, stages = await _run_inspection(
+        request, "/inspect", partial(analyze_prompt, detector_runs=runs), req, [prompt_len]
+    )
+    _count_findings(request, resp.findings)
     finding_types = sorted({f.type for f in resp.findings})
     logger.info(
-        "Inspect request completed (findings=%d, types=%s)",
+        "Inspect request completed (findings=%d, types=%s, queue_ms=%.1f, processing_ms=%.1f)",
         len(resp.findings),
         finding_types if finding_types else "none",
+        stages.queue_ms,
+        stages.processing_ms,
     )
+    if runs is not None:
+        resp = resp.model_copy(update={"timings": _timings(parse_ms, stages, runs, req.prompt or "")})
+    return resp
+
+
+@app.post(
+    "/inspect/batch",
+    response_model=PromptInspectionBatchResponse,
+    summary="Inspect a batch of prompts for security issues",
+    tags=["inspection"],
+)
+async def inspect_batch(req: PromptInspectionBatchRequest, request: Request) -> PromptInspectionBatchResponse:
+    """Runs all enabled detectors on every prompt of the batch; results keep the request order."""
+    total_len = sum(len(item.prompt or "") for item in req.items)
+    logger.info(
+        "Batch inspect request received (items=%d, total_prompt_len=%d)",
+        len(req.items),
+        total_len,
+    )
+    results, stages = await _run_inspection(
+        request, "/inspect/batch", analyze_prompts, req.items, [len(item.prompt or "") for item in req.items]
+    )
+    _count_findings(request, (finding for result in results for finding in result.findings))
+    logger.info(
+        "Batch inspect request completed (items=%d, findings=%d, queue_ms=%.1f, processing_ms=%.1f)",
+        len(results),
+        sum(len(r.findings) for r in results),
+        stages.queue_ms,
+        stages.processing_ms,
+    )
+    return PromptInspectionBatchResponse(results=results)
+
+
+@app.post(
+    "/inspect/conversation",
+    response_model=PromptInspectionResponse,
+    summary="Inspect a chat history, re-analyzing only new messages",
+    tags=["inspection"],
+)
+async def inspect_conversation(req: ConversationInspectionRequest, request: Request) -> PromptInspectionResponse:
+    """
+    Runs the detectors on messages not seen before (`runtime.conversation_cache`, independent of the result
+    cache); offsets refer to the messages joined by a blank line.
+    """
+    parse_ms = _parse_ms(request)
+    total_len = sum(len(message.content) for message in req.messages)
+    logger.info(
+        "Conversation inspect request received (messages=%d, total_prompt_len=%d, conversation_id=%s)",
+        len(req.messages),
+        total_len,
+        req.conversationId,
+    )
+    runs: List[DetectorRun] | None = [] if _wants_timings(req, request) else None
+    resp, stages = await _run_inspection(
+        request, "/inspect/conversation", partial(analyze_conversation, detector_runs=runs), req, [total_len]
+    )
+    _count_findings(request, resp.findings)
+    finding_types = sorted({f.type for f in resp.findings})
+    logger.info(
+        "Conversation inspect request completed (findings=%d, types=%s, queue_ms=%.1f, processing_ms=%.1f)",
+        len(resp.findings),
+        finding_types if finding_types else "none",
+        stages.queue_ms,
+        stages.processing_ms,
+    )
+    if runs is not None:
+        resp = resp.model_copy(update={"timings": _timings(parse_ms, stages, runs, req.combined_prompt())})
     return resp
 
 
@@ -80,5 +324,52 @@ async def health_live() -> dict:
 
 
 @app.get("/health/ready", tags=["health"])
-async def health_ready() -> dict:
-    return check_readiness()
+async def health_ready(request: Request) -> dict:
+    holder: PipelineHolder | None = getattr(request.app.state, "pipelines", None)
+    reloader = getattr(request.app.state, "reloader", None)
+    return check_readiness(
+        config_fingerprint=holder.active.config_fingerprint if holder is not None else None,
+        reload_error=reloader.last_error if reloader is not None else None,
+    )
+
+
+@app.get("/metrics", tags=["health"], summary="Prometheus metrics of this worker process")
+async def metrics(request: Request) -> PlainTextResponse:
+    inspection_metrics: InspectionMetrics | None = getattr(request.app.state, "metrics", None)
+    holder: PipelineHolder | None = getattr(request.app.state, "pipelines", None)
+    if inspection_metrics is None or holder is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+    pipeline = holder.active
+    reloader = getattr(request.app.state, "reloader", None)
+
+    def render() -> str:
+        memory = read_process_memory()
+        return inspection_metrics.render(
+            detectors=pipeline.detectors,
+            runtime=pipeline.runtime,
+            admission=getattr(request.app.state, "admission", None),
+            reloads=reloader.reloads if reloader is not None else None,
+            rss_bytes=memory.rss_mb * 1024 * 1024 if memory is not None else None,
+        )
+
+    # /proc/self/smaps_rollup walks the mappings; keep that off the event loop
+    body = await run_in_threadpool(render)
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.post("/admin/reload", tags=["admin"], summary="Reload the config file and swap the detector pipeline")
+async def admin_reload(request: Request) -> dict:
+    """Re-reads the config; a changed config is built in the background and swapped in atomically."""
+    holder: PipelineHolder | None = getattr(request.app.state, "pipelines", None)
+    reloader = getattr(request.app.state, "reloader", None)
+    if holder is None or reloader is None or not holder.active.config.runtime.reload.admin_endpoint:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+    result = await run_in_threadpool(reloader.reload)
+    if result.status == "failed":
+        raise HTTPException(
+            status_code=422,
+            detail={"status": result.status, "config_fingerprint": result.config_fingerprint, "error": result.error},
+        )
+    return {"status": result.status, "config_fingerprint": result.config_fingerprint}
@@ -0,0 +1,113 @@
+"""
+Fixed concurrency limits vs the adaptive (AIMD) limit under overload.
+
+`--clients` closed-loop clients send inspections as fast as they are
+answered. Each passes the `AdmissionController` (on the event loop, as in
+the app) and then runs `analyze_prompt` on a 40-thread pool, like
+Starlette's threadpool. The result caches are off. The queue is unbounded
+here, so nothing is shed and every limit sees the same load. Reports
+throughput, end-to-end p50/p99 (queue wait included), processing p50 and,
+for the adaptive run, where the limit settled.
+
+Run from services/inspection (honours INSPECTION_CONFIG_PATH):
+
+    python -m benchmarks.bench_adaptive_concurrency [--clients 48] [--seconds 8]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Sequence
+
+from bootstrap import build_detectors
+from core.admission import AdmissionController
+from core.config.loader import config_fingerprint, load_config
+from core.config.models import AdmissionConfig
+from core.detectors.protocols import IDetector
+from core.execution import DetectorExecutor
+from core.models import PromptInspectionRequest
+from core.pipeline import close_detectors
+from core.rules import analyze_prompt
+from core.runtime import InspectionRuntime
+from core.warmup import load_warmup_corpus
+
+FIXED_LIMITS = (1, 2, 4, 8, 16, 32)
+
+
+async def _run(
+    controller: AdmissionController,
+    detectors: Sequence[IDetector],
+    runtime: InspectionRuntime,
+    prompts: Sequence[str],
+    clients: int,
+    seconds: float,
+) -> tuple[float, float, float, float]:
+    loop = asyncio.get_running_loop()
+    pool = ThreadPoolExecutor(max_workers=40)
+    deadline = time.perf_counter() + seconds
+    total_ms: List[float] = []
+    processing_ms: List[float] = []
+
+    async def client(slot: int) -> None:
+        n = 0
+        while time.perf_counter() < deadline:
+            # long and short prompts mixed; distinct text so no cache answers
+            prompt = f"{prompts[n % len(prompts)] * (1 + (slot + n) % 4)} #{slot}-{n}"
+            started = time.perf_counter()
+            async with controller.admit():
+                run_started = time.perf_counter()
+                await loop.run_in_executor(
+                    pool, analyze_prompt, PromptInspectionRequest(prompt=prompt), detectors, runtime
+                )
+                processing_ms.append((time.perf_counter() - run_started) * 1000.0)
+            total_ms.append((time.perf_counter() - started) * 1000.0)
+            n += 1
+
+    await asyncio.gather(*(client(slot) for slot in range(clients)))
+    pool.shutdown()
+    total_ms.sort()
+    p99 = total_ms[min(len(total_ms) - 1, int(len(total_ms) * 0.99))]
+    return len(total_ms) / seconds, statistics.median(total_ms), p99, statistics.median(processing_ms)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=48)
+    parser.add_argument("--seconds", type=float, default=8.0)
+    args = parser.parse_args()
+
+    config = load_config(os.getenv("INSPECTION_CONFIG_PATH"))
+    prompts = load_warmup_corpus(config.runtime.warmup.corpus_path)
+    detectors = build_detectors(config)
+    runtime = InspectionRuntime(
+        config_fingerprint=config_fingerprint(config),
+        executor=DetectorExecutor.from_config(config.runtime.execution),
+    )
+
+    unbounded = {"enabled": True, "max_queue": 100_000, "queue_timeout_seconds": 3600}
+    runs = [(f"fixed {limit}", AdmissionConfig(max_concurrency=limit, **unbounded)) for limit in FIXED_LIMITS]
+    adaptive = config.runtime.admission.adaptive.model_copy(update={"enabled": True})
+    runs.append(("adaptive", AdmissionConfig(adaptive=adaptive, **unbounded)))
+
+    print(f"cpus={os.cpu_count()} clients={args.clients}")
+    print(f"{'limit':<10}{'req/s':>8}{'p50 ms':>9}{'p99 ms':>9}{'proc p50':>10}  settled limit")
+    try:
+        for name, admission_cfg in runs:
+            controller = AdmissionController(admission_cfg)
+            rate, p50, p99, proc_p50 = asyncio.run(
+                _run(controller, detectors, runtime, prompts, args.clients, args.seconds)
+            )
+            stats = controller.stats()
+            settled = f"{stats.limit} (+{stats.limit_increases}/-{stats.limit_decreases})" if name == "adaptive" else ""
+            print(f"{name:<10}{rate:>8.0f}{p50:>9.1f}{p99:>9.1f}{proc_p50:>10.1f}  {settled}")
+    finally:
+        runtime.close()
+        close_detectors(detectors)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Prompt injection matching: one finditer per pattern vs. the fused matcher.
+
+Scans benign prose prompts of growing length, first with the bundled
+patterns, then with the pattern list padded with synthetic phrases, and
+reports the median latency of each approach.
+
+Run from services/inspection:
+
+    python -m benchmarks.bench_injection_patterns [--repeat 20]
+"""
+from __future__ import annotations
+
+import argparse
+import re
+import statistics
+import time
+from typing import Callable, List, Sequence
+
+from core.config.loader import load_config
+from core.detectors.injection.pattern.detector import InjectionPatternDetector
+from core.detectors.patterns import MultiPatternMatcher
+
+LINES = (
+    "User: can you summarize the following deployment notes for me?",
+    "Assistant: Sure, please paste them and I will take a look.",
+    "User: the service listens on port 8080 and writes logs to stdout.",
+    "User: show me the previous version of the release checklist.",
+)
+
+LINE_COUNTS = (10, 100, 1000)
+PATTERN_COUNTS = (0, 50, 200)
+
+
+def _synthetic_patterns(count: int) -> List[re.Pattern[str]]:
+    return [re.compile(rf"(?i)pretend (that )?rule {i} (is|was) (void|lifted)") for i in range(count)]
+
+
+def _median_ms(fn: Callable[[str], object], prompt: str, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(prompt)
+        samples.append((time.perf_counter() - started) * 1000.0)
+    return statistics.median(samples)
+
+
+def _per_pattern(patterns: Sequence[re.Pattern[str]]) -> Callable[[str], object]:
+    return lambda prompt: [m for p in patterns for m in p.finditer(prompt)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    detector = InjectionPatternDetector(load_config())
+    bundled = [p.regex for p in detector._patterns]
+
+    print(f"{'patterns':>9}{'lines':>7}{'bytes':>9}{'per-pattern ms':>16}{'fused ms':>10}{'speedup':>9}")
+    for extra in PATTERN_COUNTS:
+        patterns = bundled + _synthetic_patterns(extra)
+        matcher = MultiPatternMatcher(patterns, prefilter=True)
+        fused = lambda prompt: list(matcher.finditer(prompt))
+        for count in LINE_COUNTS:
+            prompt = "\n".join(LINES[i % len(LINES)] for i in range(count))
+            slow = _median_ms(_per_pattern(patterns), prompt, args.repeat)
+            fast = _median_ms(fused, prompt, args.repeat)
+            print(f"{len(patterns):>9}{count:>7}{len(prompt):>9}{slow:>16.3f}{fast:>10.3f}{slow / fast:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
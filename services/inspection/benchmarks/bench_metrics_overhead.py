@@ -0,0 +1,110 @@
+"""
+Cost of the /metrics instrumentation.
+
+Times the primitives (counter increment, histogram observation, label
+lookup) from one and from several threads, what one request records
+(the endpoint's metrics plus one detector histogram per detector), the
+end-to-end cost on `analyze_prompt` with metrics on and off, and one
+scrape.
+
+Run from services/inspection (honours INSPECTION_CONFIG_PATH):
+
+    python -m benchmarks.bench_metrics_overhead [--ops 200000] [--threads 8]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from bootstrap import build_detectors
+from core.config.loader import config_fingerprint, load_config
+from core.execution import DetectorExecutor
+from core.metrics import DETECTORS, InspectionMetrics
+from core.models import PromptInspectionRequest
+from core.pipeline import close_detectors
+from core.rules import analyze_prompt
+from core.runtime import InspectionRuntime
+from core.warmup import load_warmup_corpus
+
+
+def _ns_per_op(op: Callable[[], None], ops: int, threads: int) -> float:
+    def loop(_: int) -> None:
+        for _ in range(ops):
+            op()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(loop, range(threads)))
+    return (time.perf_counter() - started) * 1e9 / (ops * threads)
+
+
+def _record_request(metrics: InspectionMetrics) -> None:
+    """What one /inspect records: the endpoint metrics plus one observation per detector."""
+    metrics.requests.labels("/inspect", "ok").inc()
+    metrics.request_seconds.labels("/inspect").observe(0.004)
+    metrics.admission_wait_seconds.observe(0.0)
+    metrics.threadpool_wait_seconds.observe(0.0001)
+    metrics.prompt_chars.labels("/inspect").observe(512)
+    for detector in DETECTORS[:3]:
+        metrics.detector_seconds.labels(detector).observe(0.001)
+        metrics.detector_cpu_seconds.labels(detector).inc(0.001)
+    metrics.findings.labels("pii_email").inc()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ops", type=int, default=200_000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    metrics = InspectionMetrics()
+    counter = metrics.requests.labels("/inspect", "ok")
+    histogram = metrics.detector_seconds.labels("PresidioPiiDetector")
+    primitives = [
+        ("counter.inc", lambda: counter.inc()),
+        ("histogram.observe", lambda: histogram.observe(0.003)),
+        ("labels().observe", lambda: metrics.detector_seconds.labels("PresidioPiiDetector").observe(0.003)),
+        ("one request", lambda: _record_request(metrics)),
+    ]
+
+    print(f"cpus={os.cpu_count()}")
+    print(f"{'operation':<20}{'ns/op 1 thread':>16}{f'ns/op {args.threads} threads':>18}")
+    for name, op in primitives:
+        ops = args.ops // 10 if name == "one request" else args.ops
+        single = _ns_per_op(op, ops, 1)
+        threaded = _ns_per_op(op, ops // args.threads, args.threads)
+        print(f"{name:<20}{single:>16.0f}{threaded:>18.0f}")
+
+    config = load_config(os.getenv("INSPECTION_CONFIG_PATH"))
+    prompts = list(load_warmup_corpus(config.runtime.warmup.corpus_path))
+    detectors = build_detectors(config)
+    executor = DetectorExecutor.from_config(config.runtime.execution)
+    try:
+        per_prompt: dict[str, list[float]] = {"off": [], "on": []}
+        for _ in range(args.rounds):
+            for label, recorder in (("off", None), ("on", metrics)):
+                runtime = InspectionRuntime(
+                    config_fingerprint=config_fingerprint(config), executor=executor, metrics=recorder
+                )
+                started = time.perf_counter()
+                for prompt in prompts:
+                    analyze_prompt(PromptInspectionRequest(prompt=prompt), detectors, runtime)
+                per_prompt[label].append((time.perf_counter() - started) * 1e6 / len(prompts))
+        off, on = statistics.median(per_prompt["off"]), statistics.median(per_prompt["on"])
+        print(f"analyze_prompt: {off:.1f} us/prompt without metrics, {on:.1f} us/prompt with ({on - off:+.1f} us)")
+
+        started = time.perf_counter()
+        body = metrics.render(detectors=detectors)
+        print(f"scrape: {(time.perf_counter() - started) * 1000.0:.2f} ms, {len(body)} bytes")
+    finally:
+        executor.shutdown()
+        close_detectors(detectors)
+
+
+if __name__ == "__main__":
+    main()
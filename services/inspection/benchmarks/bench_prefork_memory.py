@@ -0,0 +1,130 @@
+"""
+Memory per pre-forked worker: does copy-on-write sharing survive traffic and GC?
+
+The master preloads the pipeline exactly as `server.py` does, then forks
+workers. Each worker inspects the warmup corpus `--rounds` times through
+`analyze_prompt`, runs a full `gc.collect()` and reports its memory from
+/proc/self/smaps_rollup (Linux only):
+
+  rss      resident pages, shared ones included
+  shared   pages still shared with the master / other workers
+  private  pages only this worker holds (its own allocations + copied pages)
+  pss      shared pages split among the processes mapping them
+
+Runs with and without `prepare_for_fork()` (gc.freeze) to show what the
+freeze saves. Without it, the worker's collector writes to every object
+header it traverses and copies the page it sits on.
+
+Run from services/inspection (honours INSPECTION_CONFIG_PATH):
+
+    python -m benchmarks.bench_prefork_memory [--workers 2] [--rounds 20]
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+from typing import List
+
+from infra.prefork import read_process_memory
+
+
+def _worker(rounds: int, ready_fd: int, release_fd: int) -> None:
+    import bootstrap
+    from core.config.loader import load_config
+    from core.models import PromptInspectionRequest
+    from core.rules import analyze_prompt
+    from core.runtime import InspectionRuntime
+    from core.warmup import load_warmup_corpus
+
+    config = load_config(os.getenv("INSPECTION_CONFIG_PATH"))
+    detectors = bootstrap.initialize_pipeline()  # preloaded: no rebuild
+    runtime = InspectionRuntime.from_config(config)
+    prompts = load_warmup_corpus(config.runtime.warmup.corpus_path)
+    for round_no in range(rounds):
+        for prompt in prompts:
+            # distinct text per round so the result cache does not answer
+            analyze_prompt(PromptInspectionRequest(prompt=f"{prompt} #{round_no}"), detectors, runtime)
+    runtime.close()
+    gc.collect()
+
+    os.write(ready_fd, b"x")
+    os.read(release_fd, 1)  # stay alive until the master has measured every worker
+
+
+def _measure(freeze: bool, workers: int, rounds: int) -> dict:
+    """Child process: preload, fork ``workers``, and measure them all while alive."""
+    import bootstrap
+    from infra.prefork import prepare_for_fork
+
+    bootstrap.preload_pipeline()
+    if freeze:
+        prepare_for_fork()
+    else:
+        gc.collect()
+
+    ready_r, ready_w = os.pipe()
+    release_r, release_w = os.pipe()
+    pids: List[int] = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            try:
+                os.close(ready_r)
+                os.close(release_w)
+                _worker(rounds, ready_w, release_r)
+            finally:
+                os._exit(0)
+        pids.append(pid)
+
+    for _ in pids:
+        os.read(ready_r, 1)
+    result = {
+        "master": read_process_memory().__dict__,
+        "workers": [read_process_memory(pid).__dict__ for pid in pids],
+    }
+    os.close(release_w)
+    for pid in pids:
+        os.waitpid(pid, 0)
+    return result
+
+
+def _run(freeze: bool, workers: int, rounds: int) -> dict:
+    args = [sys.executable, "-m", "benchmarks.bench_prefork_memory", "--child", "freeze" if freeze else "no-freeze"]
+    args += ["--workers", str(workers), "--rounds", str(rounds)]
+    out = subprocess.run(args, check=True, capture_output=True, text=True)
+    return json.loads(out.stdout.splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--child", choices=("freeze", "no-freeze"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if read_process_memory() is None:
+        print("/proc/self/smaps_rollup is not available; Linux only")
+        return
+
+    if args.child:
+        print(json.dumps(_measure(args.child == "freeze", args.workers, args.rounds)))
+        return
+
+    print(f"{'variant':<11}{'process':<10}{'rss MB':>8}{'shared MB':>11}{'private MB':>12}{'pss MB':>8}")
+    for freeze in (True, False):
+        result = _run(freeze, args.workers, args.rounds)
+        label = "gc.freeze" if freeze else "no freeze"
+        rows = [("master", result["master"])] + [(f"worker {i}", w) for i, w in enumerate(result["workers"])]
+        for name, m in rows:
+            print(
+                f"{label:<11}{name:<10}{m['rss_mb']:>8.0f}{m['shared_mb']:>11.0f}"
+                f"{m['private_mb']:>12.1f}{m['pss_mb']:>8.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Presidio on long prompts: one spaCy pass vs. chunked, parallel analysis.
+
+"whole" analyzes the prompt in one piece (chunking disabled); "chunked"
+uses the `chunking` settings from the config with `min_chars` lowered so
+every size is chunked. Both share one AnalyzerEngine. Peak memory is the
+tracemalloc peak of one call (Python-level allocations, incl. spaCy's
+arrays). Prompts longer than `nlp.max_length` cannot be analyzed whole;
+whole-prompt runs above `--max-whole` are skipped as they grow
+superlinearly (minutes at 1 MB).
+
+Run from services/inspection (honours INSPECTION_CONFIG_PATH):
+
+    python -m benchmarks.bench_presidio_chunking [--repeat 5] [--sizes 1000,10000,100000,1000000] [--max-whole 100000]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import time
+import tracemalloc
+from typing import Callable, Optional, Tuple
+
+from core.config.loader import load_config, with_presidio_settings
+from core.detectors.pii.presidio.detector import PresidioPiiDetector
+from core.detectors.pii.presidio.engine import get_presidio_analyzer
+
+PARAGRAPH = (
+    "Our customer John Doe from Berlin wrote on 2024-03-01 about invoice 4711. "
+    "Please reach him at john.doe@example.com or +1 212-555-0199. "
+    "Refunds go to DE89 3704 0044 0532 0130 00 once the ticket is closed. "
+    "The rest of this paragraph is ordinary prose about quarterly planning and hiring.\n\n"
+)
+
+
+def _measure(fn: Callable[[str], object], prompt: str, repeat: int) -> Optional[Tuple[float, float, int]]:
+    """Median ms, peak MiB and finding count; None if the call is rejected."""
+    try:
+        tracemalloc.start()
+        findings = fn(prompt)
+        peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    except ValueError:
+        return None
+    finally:
+        tracemalloc.stop()
+
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(prompt)
+        samples.append((time.perf_counter() - started) * 1000.0)
+    return statistics.median(samples), peak, len(findings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--sizes", default="1000,10000,100000,1000000")
+    parser.add_argument("--max-whole", type=int, default=100_000)
+    args = parser.parse_args()
+
+    config = load_config(os.getenv("INSPECTION_CONFIG_PATH"))
+    analyzer = get_presidio_analyzer(config)
+    whole = PresidioPiiDetector(with_presidio_settings(config, chunking={"enabled": False}), analyzer=analyzer)
+    chunked = PresidioPiiDetector(
+        with_presidio_settings(config, chunking={"enabled": True, "min_chars": 1}), analyzer=analyzer
+    )
+    chunking = config.detection.pii.engines.presidio.chunking
+
+    print(
+        f"chunk_chars={chunking.chunk_chars} overlap_chars={chunking.overlap_chars} "
+        f"max_workers={chunking.max_workers}"
+    )
+    print(f"{'chars':>9}{'whole ms':>11}{'peak MiB':>10}{'chunked ms':>12}{'peak MiB':>10}{'speedup':>9}  findings")
+    for size in (int(s) for s in args.sizes.split(",")):
+        prompt = (PARAGRAPH * (size // len(PARAGRAPH) + 1))[:size]
+        chunked_run = _measure(chunked.detect, prompt, args.repeat)
+        assert chunked_run is not None
+        if size > args.max_whole:
+            whole_run = None
+            reason = "skipped"
+        else:
+            whole_run = _measure(whole.detect, prompt, args.repeat)
+            reason = "> max_length"
+
+        if whole_run is None:
+            print(f"{size:>9}{reason:>21}{chunked_run[0]:>12.1f}{chunked_run[1]:>10.1f}{'':>9}  {chunked_run[2]}")
+            continue
+        print(
+            f"{size:>9}{whole_run[0]:>11.1f}{whole_run[1]:>10.1f}{chunked_run[0]:>12.1f}{chunked_run[1]:>10.1f}"
+            f"{whole_run[0] / chunked_run[0]:>8.1f}x  {whole_run[2]}/{chunked_run[2]}"
+        )
+
+
+if __name__ == "__main__":
+    main()
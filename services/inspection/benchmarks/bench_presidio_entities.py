@@ -0,0 +1,85 @@
+"""
+Presidio per-request cost: full recognizer catalogue vs. the pruned plan.
+
+"before" analyzes with every predefined recognizer and no entity filter,
+as the detector used to; "after" is the current PresidioPiiDetector
+(registry pruned to the enabled entities, `entities=` and a pushed-down
+score floor). Both share one spaCy pipeline, so only the recognizer work
+differs.
+
+Run from services/inspection (honours INSPECTION_CONFIG_PATH):
+
+    python -m benchmarks.bench_presidio_entities [--repeat 50]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import time
+from typing import Callable
+
+from presidio_analyzer import AnalyzerEngine, RecognizerRegistry
+
+from core.config.loader import load_config
+from core.detectors.pii.presidio.detector import PresidioPiiDetector
+
+PROMPTS = (
+    "Please contact john.doe@example.com or call +1 212-555-0199 tomorrow.",
+    "Transfer the refund to DE89 3704 0044 0532 0130 00 before the end of the month.",
+    "Can you summarize the attached meeting notes in three bullet points?",
+    "Our customer John Doe from Berlin opened a ticket on 2024-03-01 about invoice 4711.",
+)
+
+
+def _median_ms(fn: Callable[[str], object], prompt: str, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(prompt)
+        samples.append((time.perf_counter() - started) * 1000.0)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    config = load_config(os.getenv("INSPECTION_CONFIG_PATH"))
+    presidio_cfg = config.detection.pii.engines.presidio
+
+    detector = PresidioPiiDetector(config)
+    nlp_engine = detector._analyzer.nlp_engine
+
+    full_registry = RecognizerRegistry()
+    full_registry.load_predefined_recognizers(nlp_engine=nlp_engine)
+    full = AnalyzerEngine(
+        nlp_engine=nlp_engine,
+        registry=full_registry,
+        supported_languages=[presidio_cfg.default_lang],
+    )
+
+    def before(prompt: str) -> object:
+        return full.analyze(
+            text=prompt,
+            language=presidio_cfg.default_lang,
+            score_threshold=presidio_cfg.default_score_threshold,
+        )
+
+    print(
+        f"recognizers: before {len(full_registry.recognizers)}, "
+        f"after {len(detector._analyzer.registry.recognizers)} "
+        f"for {len(detector._plan.entities)} enabled entities"
+    )
+    print(f"{'prompt':<48}{'before ms':>11}{'after ms':>10}{'speedup':>9}")
+    for prompt in PROMPTS:
+        before(prompt)
+        detector.detect(prompt)
+        slow = _median_ms(before, prompt, args.repeat)
+        fast = _median_ms(detector.detect, prompt, args.repeat)
+        print(f"{prompt[:46]:<48}{slow:>11.2f}{fast:>10.2f}{slow / fast:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
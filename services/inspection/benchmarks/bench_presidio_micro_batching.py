@@ -0,0 +1,81 @@
+"""
+Presidio throughput under bursts, with and without micro-batching.
+
+`--clients` threads call `PresidioPiiDetector.detect` in a loop, as
+concurrent /inspect requests do. Without micro-batching every call is
+its own `AnalyzerEngine.analyze`; with it, calls arriving within
+`--wait-ms` of each other (up to `--batch-size`) share one `nlp.pipe`
+pass. Reports prompts/s, p50/p99 latency and the mean batch size.
+
+Run from services/inspection (honours INSPECTION_CONFIG_PATH):
+
+    python -m benchmarks.bench_presidio_micro_batching [--seconds 5] [--batch-size 16] [--wait-ms 2]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from core.config.loader import load_config, with_presidio_settings
+from core.detectors.pii.presidio.detector import PresidioPiiDetector
+from core.warmup import load_warmup_corpus
+
+CLIENTS = (1, 8, 32)
+
+
+def _run(detector: PresidioPiiDetector, prompts: List[str], clients: int, seconds: float) -> tuple[float, float, float]:
+    deadline = time.perf_counter() + seconds
+    latencies: List[List[float]] = [[] for _ in range(clients)]
+
+    def client(slot: int) -> None:
+        n = slot
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            detector.detect(prompts[n % len(prompts)])
+            latencies[slot].append((time.perf_counter() - started) * 1000.0)
+            n += 1
+
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        list(pool.map(client, range(clients)))
+
+    merged = sorted(ms for per_client in latencies for ms in per_client)
+    p99 = merged[min(len(merged) - 1, int(len(merged) * 0.99))]
+    return len(merged) / seconds, statistics.median(merged), p99
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--wait-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    config = load_config(os.getenv("INSPECTION_CONFIG_PATH"))
+    prompts = list(load_warmup_corpus(config.runtime.warmup.corpus_path))
+
+    print(f"{'batching':<10}{'clients':>8}{'prompts/s':>11}{'p50 ms':>9}{'p99 ms':>9}{'mean batch':>12}")
+    for enabled in (False, True):
+        micro_batching = {"enabled": enabled, "max_batch_size": args.batch_size, "max_wait_ms": args.wait_ms}
+        detector = PresidioPiiDetector(with_presidio_settings(config, micro_batching=micro_batching))
+        for prompt in prompts:
+            detector.detect(prompt)
+        try:
+            for clients in CLIENTS:
+                before = detector.batching_stats()
+                rate, p50, p99 = _run(detector, prompts, clients, args.seconds)
+                after = detector.batching_stats()
+                mean_batch = (
+                    (after.items - before.items) / max(after.batches - before.batches, 1) if enabled else 1.0
+                )
+                label = f"{args.batch_size}/{args.wait_ms:g}ms" if enabled else "off"
+                print(f"{label:<10}{clients:>8}{rate:>11.0f}{p50:>9.1f}{p99:>9.1f}{mean_batch:>12.1f}")
+        finally:
+            detector.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Inspection throughput with Presidio in-process vs in a process pool, at 1/4/16 clients.
+
+Each client is a thread calling `analyze_prompt` in a loop, as the app's
+threadpool does per request, over the full detector pipeline with the
+result caches off. In "thread" mode Presidio/spaCy runs in the client
+thread and holds the GIL against request handling and the other
+detectors; in "process" mode it runs in `--workers` pre-warmed worker
+processes and the client thread only waits on a pipe.
+
+Run from services/inspection (honours INSPECTION_CONFIG_PATH):
+
+    python -m benchmarks.bench_presidio_process_pool [--workers 2] [--seconds 5]
+
+Process mode needs free cores to pay off: with fewer cores than workers
+plus the serving process, the workers only add IPC to the same CPU time.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Sequence
+
+from bootstrap import build_detectors
+from core.config.loader import config_fingerprint, load_config, with_presidio_settings
+from core.detectors.protocols import IDetector
+from core.execution import DetectorExecutor
+from core.models import PromptInspectionRequest
+from core.pipeline import close_detectors
+from core.rules import analyze_prompt
+from core.runtime import InspectionRuntime
+from core.warmup import load_warmup_corpus
+
+CLIENTS = (1, 4, 16)
+
+
+def _run(detectors: Sequence[IDetector], runtime: InspectionRuntime, prompts: Sequence[str], clients: int,
+         seconds: float) -> tuple[float, float, float]:
+    """(prompts/s, p50 ms, p99 ms) of ``clients`` threads inspecting for ``seconds``."""
+    deadline = time.perf_counter() + seconds
+    latencies: List[List[float]] = [[] for _ in range(clients)]
+
+    def client(slot: int) -> None:
+        n = 0
+        while time.perf_counter() < deadline:
+            # distinct text per call: nothing is answered from a cache
+            prompt = f"{prompts[n % len(prompts)]} #{slot}-{n}"
+            started = time.perf_counter()
+            analyze_prompt(PromptInspectionRequest(prompt=prompt), detectors, runtime)
+            latencies[slot].append((time.perf_counter() - started) * 1000.0)
+            n += 1
+
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        list(pool.map(client, range(clients)))
+
+    merged = sorted(ms for per_client in latencies for ms in per_client)
+    p99 = merged[min(len(merged) - 1, int(len(merged) * 0.99))]
+    return len(merged) / seconds, statistics.median(merged), p99
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    config = load_config(os.getenv("INSPECTION_CONFIG_PATH"))
+    prompts = load_warmup_corpus(config.runtime.warmup.corpus_path)
+    print(f"cpus={os.cpu_count()} process workers={args.workers}")
+    print(f"{'mode':<9}{'clients':>8}{'prompts/s':>11}{'p50 ms':>9}{'p99 ms':>9}")
+
+    for mode in ("thread", "process"):
+        mode_config = with_presidio_settings(
+            config, process_pool={"enabled": mode == "process", "workers": args.workers}
+        )
+        detectors = build_detectors(mode_config)
+        runtime = InspectionRuntime(
+            config_fingerprint=config_fingerprint(mode_config),
+            executor=DetectorExecutor.from_config(mode_config.runtime.execution),
+        )
+        try:
+            for prompt in prompts:
+                analyze_prompt(PromptInspectionRequest(prompt=prompt), detectors, runtime)
+            for clients in CLIENTS:
+                rate, p50, p99 = _run(detectors, runtime, prompts, clients, args.seconds)
+                print(f"{mode:<9}{clients:>8}{rate:>11.0f}{p50:>9.1f}{p99:>9.1f}")
+        finally:
+            runtime.close()
+            close_detectors(detectors)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Worst-case regex inputs: plain `re` vs. the bounded regex engines.
+
+Crafts prompts that drive the injection patterns and a catastrophic
+custom PII-style pattern into heavy backtracking, and times one scan with
+plain `re`, with the backtracking engine under its time budget, and with
+RE2 when google-re2 is installed. Plain `re` is quadratic or worse here,
+so it only runs on the smaller inputs; larger ones are extrapolated.
+
+Run from services/inspection:
+
+    python -m benchmarks.bench_regex_worst_case [--timeout-ms 250]
+"""
+from __future__ import annotations
+
+import argparse
+import re
+import time
+from typing import Callable, Dict, Optional
+
+from core.config.loader import load_config
+from core.config.models import RegexSafetyConfig
+from core.detectors.injection.pattern.detector import InjectionPatternDetector
+from core.detectors.regex_safety import RegexTimeoutError, compile_guarded, re2
+
+SIZES = (16_384, 65_536, 262_144, 1_048_576)
+# Plain `re` is only timed up to this size; beyond, the last timing is scaled.
+PLAIN_RE_LIMIT = 65_536
+
+INJECTION_UNIT = "follow my instructions "
+# Classic nested-quantifier pattern, as a user might paste into patterns[].regex
+REDOS_PATTERN = r"(\w+\s?)+$"
+REDOS_UNIT = "a "
+
+
+def _elapsed_ms(fn: Callable[[], object]) -> float:
+    started = time.perf_counter()
+    try:
+        fn()
+    except RegexTimeoutError:
+        pass
+    return (time.perf_counter() - started) * 1000.0
+
+
+def _injection_detector(engine: str, timeout_ms: float) -> InjectionPatternDetector:
+    config = load_config()
+    regex_cfg = RegexSafetyConfig(engine=engine, match_timeout_ms=timeout_ms)
+    return InjectionPatternDetector(
+        config.model_copy(update={"runtime": config.runtime.model_copy(update={"regex": regex_cfg})})
+    )
+
+
+def _row(label: str, size: int, plain: Optional[float], estimated: bool, bounded: Dict[str, float]) -> None:
+    plain_text = f"{'~' if estimated else ''}{plain:,.0f}" if plain is not None else "-"
+    cells = "".join(f"{ms:>18,.1f}" for ms in bounded.values())
+    print(f"{label:<11}{size:>10,}{plain_text:>14}{cells}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--timeout-ms", type=float, default=250.0)
+    args = parser.parse_args()
+
+    engines = ["backtracking"] + (["re2"] if re2 is not None else [])
+    detectors = {engine: _injection_detector(engine, args.timeout_ms) for engine in engines}
+    redos = {
+        engine: compile_guarded(
+            REDOS_PATTERN,
+            0,
+            RegexSafetyConfig(engine=engine, match_timeout_ms=args.timeout_ms, on_unsafe_pattern="warn"),
+            "benchmark pattern",
+        )
+        for engine in engines
+    }
+    plain_injection = [re.compile(p.regex.pattern, p.regex.flags) for p in detectors["backtracking"]._patterns]
+
+    print(f"{'case':<11}{'bytes':>10}{'plain re ms':>14}" + "".join(f"{e + ' ms':>18}" for e in engines))
+
+    last: Optional[tuple[int, float]] = None
+    for size in SIZES:
+        prompt = INJECTION_UNIT * (size // len(INJECTION_UNIT))
+        if size <= PLAIN_RE_LIMIT:
+            plain = _elapsed_ms(lambda: [m for p in plain_injection for m in p.finditer(prompt)])
+            last, estimated = (size, plain), False
+        else:
+            plain, estimated = last[1] * (size / last[0]) ** 2, True
+        bounded = {engine: _elapsed_ms(lambda: detector.detect(prompt)) for engine, detector in detectors.items()}
+        _row("injection", size, plain, estimated, bounded)
+
+    for size in SIZES:
+        # Exponential in the input for plain `re`; even 16 KiB does not finish
+        prompt = REDOS_UNIT * (size // len(REDOS_UNIT)) + "!"
+        bounded = {engine: _elapsed_ms(lambda: list(pattern.finditer(prompt))) for engine, pattern in redos.items()}
+        _row("nested-q", size, None, False, bounded)
+
+    print("plain re does not finish the nested-quantifier case; '~' marks extrapolated times")
+
+
+if __name__ == "__main__":
+    main()
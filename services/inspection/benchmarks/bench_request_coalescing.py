@@ -0,0 +1,86 @@
+"""
+Bursts of identical prompts, with and without request coalescing.
+
+`--clients` threads send the same prompt at the same moment (gateway
+retries, one templated prompt from many users), then wait for every
+answer before the next burst with a new prompt. The result caches are
+off, so only coalescing can spare duplicate work. Reports bursts/s, the
+p50/p99 time to answer a whole burst and how many calls were coalesced.
+
+Run from services/inspection (honours INSPECTION_CONFIG_PATH):
+
+    python -m benchmarks.bench_request_coalescing [--clients 16] [--seconds 5]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from bootstrap import build_detectors
+from core.coalescing import RequestCoalescer
+from core.config.loader import config_fingerprint, load_config
+from core.execution import DetectorExecutor
+from core.models import PromptInspectionRequest
+from core.pipeline import close_detectors
+from core.rules import analyze_prompt
+from core.runtime import InspectionRuntime
+from core.warmup import load_warmup_corpus
+
+
+def _run(detectors, runtime: InspectionRuntime, prompts: List[str], clients: int, seconds: float) -> tuple[float, float, float]:
+    barrier = threading.Barrier(clients)
+    burst_ms: List[float] = []
+    deadline = time.perf_counter() + seconds
+
+    def client(prompt: str) -> None:
+        barrier.wait()
+        analyze_prompt(PromptInspectionRequest(prompt=prompt), detectors, runtime)
+
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        n = 0
+        while time.perf_counter() < deadline:
+            # a new prompt per burst, as retries of distinct requests would be
+            prompt = f"{prompts[n % len(prompts)]} #{n}"
+            started = time.perf_counter()
+            list(pool.map(client, [prompt] * clients))
+            burst_ms.append((time.perf_counter() - started) * 1000.0)
+            n += 1
+
+    burst_ms.sort()
+    p99 = burst_ms[min(len(burst_ms) - 1, int(len(burst_ms) * 0.99))]
+    return len(burst_ms) / seconds, statistics.median(burst_ms), p99
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    config = load_config(os.getenv("INSPECTION_CONFIG_PATH"))
+    prompts = list(load_warmup_corpus(config.runtime.warmup.corpus_path))
+    detectors = build_detectors(config)
+    executor = DetectorExecutor.from_config(config.runtime.execution)
+
+    print(f"cpus={os.cpu_count()} clients={args.clients}")
+    print(f"{'coalescing':<12}{'bursts/s':>9}{'p50 ms':>9}{'p99 ms':>9}{'coalesced':>11}")
+    try:
+        for coalescer in (None, RequestCoalescer()):
+            runtime = InspectionRuntime(
+                config_fingerprint=config_fingerprint(config), executor=executor, coalescer=coalescer
+            )
+            rate, p50, p99 = _run(detectors, runtime, prompts, args.clients, args.seconds)
+            coalesced = coalescer.stats().coalesced if coalescer is not None else 0
+            print(f"{'on' if coalescer else 'off':<12}{rate:>9.1f}{p50:>9.1f}{p99:>9.1f}{coalesced:>11}")
+    finally:
+        executor.shutdown()
+        close_detectors(detectors)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+spaCy pipeline cost for the PII engine: model tier and excluded components.
+
+Each variant loads its pipeline in a fresh interpreter, so the reported
+peak RSS is that pipeline's own footprint. Latency is the median time of
+one `nlp(prompt)` call, which is what Presidio runs per request before
+any recognizer. Tiers whose package is not installed are skipped.
+
+Variants per tier:
+  full      every component of the package
+  config    `spacy_exclude` from the config (what the service loads)
+  ner-only  parser and the lemma chain dropped as well (context words
+            then match surface forms only; shown as a lower bound)
+
+Run from services/inspection (honours INSPECTION_CONFIG_PATH):
+
+    python -m benchmarks.bench_spacy_pipeline [--repeat 50] [--tiers sm,md,lg]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from typing import List, Sequence
+
+from core.config.loader import load_config
+from core.detectors.pii.presidio.engine import resolve_spacy_model
+
+PROMPTS = (
+    "Please contact john.doe@example.com or call +1 212-555-0199 tomorrow.",
+    "Transfer the refund to DE89 3704 0044 0532 0130 00 before the end of the month.",
+    "Can you summarize the attached meeting notes in three bullet points?",
+    "Our customer John Doe from Berlin opened a ticket on 2024-03-01 about invoice 4711.",
+)
+
+NER_ONLY_EXCLUDE = ("parser", "tagger", "attribute_ruler", "lemmatizer", "senter")
+
+
+def _measure(model_name: str, exclude: Sequence[str], repeat: int) -> dict:
+    """Child process: load one pipeline and time it."""
+    import spacy
+
+    started = time.perf_counter()
+    nlp = spacy.load(model_name, exclude=list(exclude))
+    load_s = time.perf_counter() - started
+
+    for prompt in PROMPTS:
+        nlp(prompt)
+    samples = []
+    for _ in range(repeat):
+        for prompt in PROMPTS:
+            started = time.perf_counter()
+            nlp(prompt)
+            samples.append((time.perf_counter() - started) * 1000.0)
+
+    return {
+        "pipes": nlp.pipe_names,
+        "load_s": load_s,
+        "median_ms": statistics.median(samples),
+        # Linux reports ru_maxrss in KiB
+        "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0,
+    }
+
+
+def _run_variant(model_name: str, exclude: Sequence[str], repeat: int) -> dict:
+    out = subprocess.run(
+        [
+            sys.executable, "-m", "benchmarks.bench_spacy_pipeline",
+            "--child", model_name, "--exclude", ",".join(exclude), "--repeat", str(repeat),
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(out.stdout.splitlines()[-1])
+
+
+def _installed(model_name: str) -> bool:
+    import spacy.util
+
+    return spacy.util.is_package(model_name) or os.path.isdir(model_name)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--tiers", default="sm,md,lg")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--exclude", default="", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        exclude = [name for name in args.exclude.split(",") if name]
+        print(json.dumps(_measure(args.child, exclude, args.repeat)))
+        return
+
+    presidio_cfg = load_config(os.getenv("INSPECTION_CONFIG_PATH")).detection.pii.engines.presidio
+
+    # Without a configured tier the model name is not assumed to be sized
+    models: List[str] = [resolve_spacy_model(presidio_cfg)]
+    if presidio_cfg.spacy_model_tier is not None:
+        models = [
+            resolve_spacy_model(presidio_cfg.model_copy(update={"spacy_model_tier": tier}))
+            for tier in args.tiers.split(",")
+        ]
+    variants = (
+        ("full", ()),
+        ("config", presidio_cfg.spacy_exclude),
+        ("ner-only", NER_ONLY_EXCLUDE),
+    )
+
+    print(f"{'model':<18}{'variant':<10}{'load s':>8}{'rss MB':>9}{'median ms':>11}  components")
+    for model_name in models:
+        if not _installed(model_name):
+            print(f"{model_name:<18}not installed, skipped")
+            continue
+        for label, exclude in variants:
+            result = _run_variant(model_name, exclude, args.repeat)
+            print(
+                f"{os.path.basename(model_name):<18}{label:<10}{result['load_s']:>8.2f}"
+                f"{result['rss_mb']:>9.0f}{result['median_ms']:>11.2f}  {','.join(result['pipes'])}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,19 +2,37 @@ from __future__ import annotations
 
 import logging
 import os
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
 
 from core.config.loader import load_config
-from core.detectors.injection.pattern.detector import InjectionPatternDetector
-from core.detectors.pii.presidio.detector import PresidioPiiDetector
-from core.detectors.pii.presidio.engine import warmup_analyzer
 from core.detectors.protocols import IDetector
-from core.detectors.secret.detectsecret.detector import DetectSecretsDetector
+from core.config.models import InspectionConfig
+from core.pipeline import InspectionPipeline, PipelineHolder, close_detectors
+from core.reload import ConfigReloader
+from core.runtime import InspectionRuntime
+from core.startup import StartupTimeline
+from core.warmup import WarmupReport, load_warmup_corpus, run_warmup
 
 logger = logging.getLogger(__name__)
 
 
 WARMUP_OK = False
 WARMUP_ERRORS: list[str] = []
+STARTUP_TIMELINE: StartupTimeline | None = None
+WARMUP_REPORT: WarmupReport | None = None
+
+# Detectors built by a pre-fork master (server.py); forked workers reuse them
+_PRELOADED: tuple[IDetector, ...] | None = None
+
+# Runs through every detector once after warmup (the "first_inference" phase)
+_FIRST_INFERENCE_PROMPT = (
+    "Please email jane.doe@example.com the summary of yesterday's meeting in Berlin."
+)
+
+DetectorBuilder = Callable[[InspectionConfig, StartupTimeline], IDetector]
 
 
 def initialize_pipeline() -> tuple[IDetector, ...]:
@@ -22,34 +40,246 @@ def initialize_pipeline() -> tuple[IDetector, ...]:
     Load config and prime heavy dependencies before the app starts serving.
 
     - load_config() validates config.yml and caches it
-    - warmup_analyzer() builds the Presidio analyzer (spaCy load)
-    - detector instances build their rule maps / patterns
+    - build_detectors() loads the spaCy model, builds the Presidio registry
+      and warms every detector, concurrently with `runtime.startup.parallel_warmup`
+    - warm_up() runs the warmup corpus through analyze_prompt until latency
+      settles, so readiness is only reported once requests run warm
+    - each step is recorded in the startup timeline (logs + /health/ready)
 
     Any exception is allowed to bubble up so startup fails fast.
     """
-    global WARMUP_OK, WARMUP_ERRORS
+    global WARMUP_OK, WARMUP_ERRORS, STARTUP_TIMELINE, WARMUP_REPORT
+    if _PRELOADED is not None:
+        logger.info("Initialization: reusing %d detectors preloaded before fork", len(_PRELOADED))
+        # Worker processes and threads do not survive the fork; start this process's own
+        for detector in _PRELOADED:
+            detector.warmup()
+        return _PRELOADED
+
     cfg_path = os.getenv("INSPECTION_CONFIG_PATH")
+    timeline = StartupTimeline()
+    STARTUP_TIMELINE = timeline
 
     try:
         logger.info("Initialization: loading inspection config (path=%s)", cfg_path or "default bundled config")
-        config = load_config(cfg_path)
+        with timeline.phase("config_parse"):
+            config = load_config(cfg_path)
 
-        logger.info("Initialization: initializing Presidio analyzer")
-        warmup_analyzer(config)
+        detector_pipeline = build_detectors(config, timeline)
 
-        detector_pipeline: tuple[IDetector, ...] = (
-            DetectSecretsDetector(config),
-            PresidioPiiDetector(config),
-            InjectionPatternDetector(config),
-        )
-
-        for detector in detector_pipeline:
-            detector.warmup()
+        # Same executor settings as the serving runtime; its caches stay empty
+        runtime = InspectionRuntime.from_config(config)
+        try:
+            WARMUP_REPORT = warm_up(config, detector_pipeline, runtime, timeline)
+        finally:
+            runtime.close()
 
         WARMUP_OK = True
-        logger.info("Initialization: completed successfully")
+        logger.info("Initialization: completed successfully in %.1f ms", timeline.total_ms)
         return detector_pipeline
     except Exception as exc:  # bubble up to fail startup
         WARMUP_ERRORS.append(str(exc))
         logger.exception("Initialization failed: %s", exc)
         raise
+
+
+def preload_pipeline() -> tuple[IDetector, ...]:
+    """
+    Build and warm the detectors in a pre-fork master process.
+
+    Workers forked afterwards get them (and the loaded spaCy model) from
+    `initialize_pipeline()` without building anything, sharing the memory
+    pages copy-on-write. The master's detector processes and threads
+    (Presidio's process pool) are stopped; each worker starts its own.
+    """
+    global _PRELOADED
+    _PRELOADED = initialize_pipeline()
+    close_detectors(_PRELOADED)
+    return _PRELOADED
+
+
+def build_detectors(
+    config: InspectionConfig,
+    timeline: StartupTimeline | None = None,
+) -> tuple[IDetector, ...]:
+    """Build and warm up the detectors for ``config``; also used by config reloads.
+
+    Detectors come out in a fixed order either way; in parallel mode the
+    Presidio build (the spaCy load dominates startup) is submitted first so
+    the cheaper detectors finish in its shadow.
+    """
+    timeline = timeline or StartupTimeline()
+    builders = _detector_builders(config)
+    startup_cfg = config.runtime.startup
+
+    if startup_cfg.parallel_warmup and len(builders) > 1:
+        logger.info("Initialization: warming up %d detectors in parallel", len(builders))
+        with ThreadPoolExecutor(
+            max_workers=min(startup_cfg.max_workers, len(builders)), thread_name_prefix="warmup"
+        ) as pool:
+            futures = {
+                build: pool.submit(build, config, timeline)
+                for build in sorted(builders, key=lambda build: build is not _build_presidio)
+            }
+            detector_pipeline = tuple(futures[build].result() for build in builders)
+    else:
+        detector_pipeline = tuple(build(config, timeline) for build in builders)
+
+    with timeline.phase("first_inference"):
+        for detector in detector_pipeline:
+            detector.detect(_FIRST_INFERENCE_PROMPT)
+
+    return detector_pipeline
+
+
+def _detector_builders(config: InspectionConfig) -> list[DetectorBuilder]:
+    """Detector builders in pipeline order; a disabled Presidio engine is never imported."""
+    builders: list[DetectorBuilder] = [
+        _build_detect_secrets,
+        _build_native_secrets,
+        _build_injection_patterns,
+    ]
+    if config.detection.pii.engines.presidio.enabled:
+        builders.insert(2, _build_presidio)
+    else:
+        logger.info(
+            "Presidio PII engine is disabled via config "
+            "(detection.pii.engines.presidio.enabled=false); spaCy is not loaded."
+        )
+    return builders
+
+
+# Heavy libraries (detect-secrets, Presidio/spaCy) are imported inside the
+# builders, so importing the app stays cheap. Imports are serialized: module
+# graphs with import cycles (detect-secrets' plugins) deadlock when two
+# threads import them at once. Model loads and warmups still overlap.
+_IMPORT_LOCK = threading.Lock()
+
+
+def _build_detect_secrets(config: InspectionConfig, timeline: StartupTimeline) -> IDetector:
+    with timeline.phase("detector:DetectSecretsDetector"):
+        with _IMPORT_LOCK:
+            from core.detectors.secret.detectsecret.detector import DetectSecretsDetector
+
+        detector = DetectSecretsDetector(config)
+        detector.warmup()
+    return detector
+
+
+def _build_native_secrets(config: InspectionConfig, timeline: StartupTimeline) -> IDetector:
+    with timeline.phase("detector:NativeSecretDetector"):
+        with _IMPORT_LOCK:
+            from core.detectors.secret.native.detector import NativeSecretDetector
+
+        detector = NativeSecretDetector(config)
+        detector.warmup()
+    return detector
+
+
+def _build_presidio(config: InspectionConfig, timeline: StartupTimeline) -> IDetector:
+    if config.detection.pii.engines.presidio.process_pool.enabled:
+        # The workers load the model and build their analyzers; this process does neither
+        with timeline.phase("detector:PresidioPiiDetector"):
+            with _IMPORT_LOCK:
+                from core.detectors.pii.presidio.detector import PresidioPiiDetector
+
+            detector = PresidioPiiDetector(config)
+        with timeline.phase("process_pool_start"):
+            detector.warmup()
+        return detector
+
+    with timeline.phase("model_load"):
+        logger.info("Initialization: initializing Presidio analyzer")
+        with _IMPORT_LOCK:
+            from core.detectors.pii.presidio.engine import load_nlp_engine, warmup_analyzer
+
+        load_nlp_engine(config)
+    with timeline.phase("registry_build"):
+        warmup_analyzer(config)
+    with timeline.phase("detector:PresidioPiiDetector"):
+        with _IMPORT_LOCK:
+            from core.detectors.pii.presidio.detector import PresidioPiiDetector
+
+        detector = PresidioPiiDetector(config)
+        detector.warmup()
+    return detector
+
+
+def _build_injection_patterns(config: InspectionConfig, timeline: StartupTimeline) -> IDetector:
+    with timeline.phase("detector:InjectionPatternDetector"):
+        with _IMPORT_LOCK:
+            from core.detectors.injection.pattern.detector import InjectionPatternDetector
+
+        detector = InjectionPatternDetector(config)
+        detector.warmup()
+    return detector
+
+
+def warm_up(
+    config: InspectionConfig,
+    detectors: tuple[IDetector, ...],
+    runtime: InspectionRuntime,
+    timeline: StartupTimeline | None = None,
+) -> WarmupReport | None:
+    """Run the configured warmup corpus through the full inspection path; None if disabled."""
+    warmup_cfg = config.runtime.warmup
+    if not warmup_cfg.enabled:
+        logger.info("Initialization: warmup corpus disabled (runtime.warmup.enabled=false)")
+        return None
+
+    timeline = timeline or StartupTimeline()
+    with timeline.phase("warmup_corpus"):
+        prompts = load_warmup_corpus(warmup_cfg.corpus_path)
+        return run_warmup(prompts, detectors, runtime, warmup_cfg)
+
+
+def build_pipeline(config: InspectionConfig) -> InspectionPipeline:
+    """Detectors plus runtime for ``config``, warmed up and ready to be swapped in by a reload."""
+    detectors = build_detectors(config)
+    runtime = InspectionRuntime.from_config(config)
+    try:
+        warm_up(config, detectors, runtime)
+    except Exception:
+        runtime.close()
+        close_detectors(detectors)
+        raise
+    return InspectionPipeline(config=config, detectors=detectors, runtime=runtime)
+
+
+def initialize_reloader(holder: PipelineHolder) -> ConfigReloader:
+    """
+    Reloader for the config at INSPECTION_CONFIG_PATH.
+
+    Starts watching the file when `runtime.reload.watch` is set; the admin
+    endpoint uses the same reloader.
+    """
+    reload_cfg = holder.active.config.runtime.reload
+    reloader = ConfigReloader(
+        holder,
+        build_pipeline,
+        path=os.getenv("INSPECTION_CONFIG_PATH"),
+        poll_interval_seconds=reload_cfg.poll_interval_seconds,
+    )
+    if _PRELOADED is not None:
+        # A worker forked to replace a recycled one may start after the file
+        # changed; the preloaded pipeline is the master's startup config.
+        reloader.reload()
+    if reload_cfg.watch:
+        reloader.start()
+    return reloader
+
+
+def initialize_runtime() -> InspectionRuntime:
+    """
+    Build the shared runtime services (result cache, ...) for the loaded config.
+
+    Uses the same cached config as `initialize_pipeline()`.
+    """
+    config = load_config(os.getenv("INSPECTION_CONFIG_PATH"))
+    runtime = InspectionRuntime.from_config(config)
+    logger.info(
+        "Initialization: runtime ready (config_fingerprint=%s, result_cache=%s)",
+        runtime.config_fingerprint,
+        "enabled" if runtime.result_cache is not None else "disabled",
+    )
+    return runtime
@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import statistics
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Deque, List
+
+from core.config.models import AdaptiveConcurrencyConfig, AdmissionConfig
+
+logger = logging.getLogger(__name__)
+
+# Window medians the no-load latency estimate is taken over, so one lucky
+# window does not set a target that ordinary windows then exceed.
+_BASELINE_WINDOWS = 5
+
+
+class AdmissionRejected(Exception):
+    """A request was shed instead of queued; maps to a 429/503 with Retry-After."""
+
+    def __init__(self, status_code: int, reason: str, retry_after_seconds: int) -> None:
+        super().__init__(reason)
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after_seconds = retry_after_seconds
+
+
+@dataclass(frozen=True)
+class AdmissionStats:
+    """Point-in-time counters of an :class:`AdmissionController`."""
+    limit: int                    # current concurrency limit (fixed, or set by the adaptive limiter)
+    max_queue: int
+    in_flight: int
+    queued: int
+    admitted: int
+    rejected_queue_full: int      # answered 429 without waiting
+    rejected_queue_timeout: int   # answered 503 after waiting queue_timeout_seconds
+    queue_wait_ms: float          # summed over admitted requests
+    limit_increases: int = 0
+    limit_decreases: int = 0
+
+
+class AimdLimit:
+    """
+    Additive-increase / multiplicative-decrease concurrency limit.
+
+    Latency samples (time an admitted request held its slot) are grouped
+    in windows of at least `window` samples and at least the current
+    limit, i.e. roughly one round of every slot. After each window:
+
+    - median latency above the target: limit x `decrease_factor` (at least -1)
+    - otherwise, if the limit was reached during the window: limit + 1
+      (a limit that is never reached says nothing about the next step)
+
+    The median keeps a few slow prompts (long RAG contexts among short
+    chat turns) from reading as overload; only a shift of the typical
+    request does.
+
+    The limit starts at `min_concurrency`. Without `target_latency_ms` the
+    target is `latency_tolerance` times the no-load latency: the median of
+    the last windows that ran with at most `min_concurrency` requests in
+    flight. Busier windows may only lower that estimate (a faster host),
+    so it cannot creep up under sustained load; a host that became slower
+    drives the limit down to `min_concurrency`, where it is measured
+    again. Past the throughput knee extra concurrency only adds latency,
+    so the limit settles around the knee without a host-specific setting.
+    """
+
+    def __init__(self, cfg: AdaptiveConcurrencyConfig) -> None:
+        self._cfg = cfg
+        self._limit = cfg.min_concurrency
+        self._samples: List[float] = []
+        self._saturated = False
+        self._peak_in_flight = 0
+        self._baseline_ms: float | None = None
+        self._recent_medians: Deque[float] = deque(maxlen=_BASELINE_WINDOWS)
+        self._idle_medians: Deque[float] = deque(maxlen=_BASELINE_WINDOWS)
+        self.increases = 0
+        self.decreases = 0
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    @property
+    def target_ms(self) -> float | None:
+        if self._cfg.target_latency_ms is not None:
+            return self._cfg.target_latency_ms
+        return self._baseline_ms * self._cfg.latency_tolerance if self._baseline_ms is not None else None
+
+    def on_admit(self, in_flight: int) -> None:
+        if in_flight >= self._limit:
+            self._saturated = True
+        if in_flight > self._peak_in_flight:
+            self._peak_in_flight = in_flight
+
+    def on_sample(self, latency_ms: float) -> None:
+        self._samples.append(latency_ms)
+        if len(self._samples) < max(self._cfg.window, self._limit):
+            return
+
+        median_ms = statistics.median(self._samples)
+        saturated = self._saturated
+        idle = self._peak_in_flight <= self._cfg.min_concurrency
+        self._samples.clear()
+        self._saturated = False
+        self._peak_in_flight = 0
+
+        self._recent_medians.append(median_ms)
+        if idle:
+            # Nothing else ran alongside: a no-load measurement, which may also raise the estimate
+            self._idle_medians.append(median_ms)
+            self._baseline_ms = statistics.median(self._idle_medians)
+        elif self._baseline_ms is not None:
+            self._baseline_ms = min(self._baseline_ms, statistics.median(self._recent_medians))
+        else:
+            self._baseline_ms = median_ms
+
+        previous = self._limit
+        if median_ms > self.target_ms:
+            self._limit = max(self._cfg.min_concurrency, min(previous - 1, int(previous * self._cfg.decrease_factor)))
+        elif saturated:
+            self._limit = min(self._cfg.max_concurrency, previous + 1)
+
+        if self._limit < previous:
+            self.decreases += 1
+        elif self._limit > previous:
+            self.increases += 1
+        if self._limit != previous:
+            logger.debug(
+                "Adaptive concurrency limit %d -> %d (window median %.1f ms, target %.1f ms)",
+                previous, self._limit, median_ms, self.target_ms,
+            )
+
+
+class AdmissionController:
+    """
+    Bounded admission for inspection requests of one worker process.
+
+    - up to `limit` requests run at once; the rest wait in FIFO order, up
+      to `max_queue` of them. The limit is `max_concurrency`, or moves with
+      observed latency when `adaptive` is enabled (`AimdLimit`)
+    - a request finding the queue full is rejected at once (429); one that
+      waits longer than `queue_timeout_seconds` is rejected then (503), so
+      callers get a fast answer they can retry elsewhere instead of timing
+      out behind work that is already too late
+    - `admit()` yields the time the request waited, so logs and responses
+      can report queue wait apart from processing time
+
+    A freed slot is handed to the oldest waiter directly. Used from the
+    event loop only, so counters need no lock.
+    """
+
+    def __init__(self, cfg: AdmissionConfig) -> None:
+        self._cfg = cfg
+        self._aimd = AimdLimit(cfg.adaptive) if cfg.adaptive.enabled else None
+        self._waiters: Deque[asyncio.Future[None]] = deque()
+        self._in_flight = 0
+        self._queued = 0
+        self._admitted = 0
+        self._rejected_queue_full = 0
+        self._rejected_queue_timeout = 0
+        self._queue_wait_ms = 0.0
+
+    @classmethod
+    def from_config(cls, cfg: AdmissionConfig) -> "AdmissionController | None":
+        return cls(cfg) if cfg.enabled else None
+
+    @property
+    def limit(self) -> int:
+        return self._aimd.limit if self._aimd is not None else self._cfg.max_concurrency
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[float]:
+        """Hold a slot while the body runs; yields the queue wait in ms or raises `AdmissionRejected`."""
+        started = time.perf_counter()
+        if self._in_flight < self.limit and not self._queued:
+            self._in_flight += 1
+        else:
+            await self._wait_for_slot()
+
+        queue_ms = (time.perf_counter() - started) * 1000.0
+        self._admitted += 1
+        self._queue_wait_ms += queue_ms
+        if self._aimd is not None:
+            self._aimd.on_admit(self._in_flight)
+
+        held_from = time.perf_counter()
+        try:
+            yield queue_ms
+        finally:
+            if self._aimd is not None:
+                self._aimd.on_sample((time.perf_counter() - held_from) * 1000.0)
+            self._in_flight -= 1
+            self._hand_over()
+
+    async def _wait_for_slot(self) -> None:
+        if self._queued >= self._cfg.max_queue:
+            self._rejected_queue_full += 1
+            raise AdmissionRejected(429, "inspection queue is full", self._cfg.retry_after_seconds)
+
+        slot: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(slot)
+        self._queued += 1
+        # Slots may be free while earlier waiters have been handed theirs but not resumed yet
+        self._hand_over()
+        try:
+            await asyncio.wait_for(slot, timeout=self._cfg.queue_timeout_seconds)
+        except asyncio.TimeoutError:
+            self._rejected_queue_timeout += 1
+            raise AdmissionRejected(
+                503, "inspection queue wait exceeded its timeout", self._cfg.retry_after_seconds
+            ) from None
+        except BaseException:
+            # Cancelled (client went away) after the slot was handed over: give it back
+            if slot.done() and not slot.cancelled():
+                self._in_flight -= 1
+                self._hand_over()
+            raise
+        finally:
+            self._queued -= 1
+
+    def _hand_over(self) -> None:
+        """Give free slots to the oldest waiters; the slot counts as taken before they wake."""
+        while self._waiters and self._in_flight < self.limit:
+            slot = self._waiters.popleft()
+            if slot.done():  # timed out or cancelled
+                continue
+            self._in_flight += 1
+            slot.set_result(None)
+
+    def stats(self) -> AdmissionStats:
+        return AdmissionStats(
+            limit=self.limit,
+            max_queue=self._cfg.max_queue,
+            in_flight=self._in_flight,
+            queued=self._queued,
+            admitted=self._admitted,
+            rejected_queue_full=self._rejected_queue_full,
+            rejected_queue_timeout=self._rejected_queue_timeout,
+            queue_wait_ms=self._queue_wait_ms,
+            limit_increases=self._aimd.increases if self._aimd is not None else 0,
+            limit_decreases=self._aimd.decreases if self._aimd is not None else 0,
+        )
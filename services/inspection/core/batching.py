@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Callable, Generic, List, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+I = TypeVar("I")
+O = TypeVar("O")
+
+
+@dataclass(frozen=True)
+class BatchingStats:
+    """Cumulative counters of a :class:`MicroBatcher`, plus its window settings."""
+    max_batch_size: int
+    max_wait_ms: float
+    batches: int = 0
+    items: int = 0
+    full_batches: int = 0        # closed by max_batch_size rather than by the window
+    queue_wait_ms: float = 0.0   # summed time items waited for their batch to start
+
+    @property
+    def mean_batch_size(self) -> float:
+        return self.items / self.batches if self.batches else 0.0
+
+
+class MicroBatcher(Generic[I, O]):
+    """
+    Coalesces concurrent single-item calls into one batch call.
+
+    - callers block in `submit()`; a collector thread takes the first
+      queued item, then keeps collecting until `max_batch_size` items or
+      until `max_wait_ms` after the first one, and passes them to
+      ``run_batch`` as one list
+    - each caller gets its own result, or the exception of its batch
+    - the collector thread starts on first use in each process, so a
+      batcher built before the pre-fork server forks works in the workers
+    - stats are written by the collector thread only and replaced as a
+      whole, so reading them takes no lock
+    """
+
+    def __init__(
+        self,
+        run_batch: Callable[[List[I]], List[O]],
+        max_batch_size: int,
+        max_wait_ms: float,
+        name: str = "micro-batcher",
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be >= 1")
+
+        self._run_batch = run_batch
+        self._max_batch_size = max_batch_size
+        self._max_wait = max_wait_ms / 1000.0
+        self._name = name
+        self._stats = BatchingStats(max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+
+        self._lock = threading.Lock()
+        self._queue: queue.SimpleQueue[Tuple[I, Future[O], float] | None] | None = None
+        self._thread: threading.Thread | None = None
+        self._owner_pid: int | None = None
+
+    def submit(self, item: I) -> O:
+        """Run ``item`` in the next batch and return its result."""
+        future: Future[O] = Future()
+        self._ensure_started().put((item, future, time.perf_counter()))
+        return future.result()
+
+    def stats(self) -> BatchingStats:
+        return self._stats
+
+    def close(self) -> None:
+        """Run what is queued, then stop the collector thread; a later `submit()` starts a new one."""
+        with self._lock:
+            pending, self._queue = self._queue, None
+            thread, self._thread = self._thread, None
+            owned = self._owner_pid == os.getpid()
+        if pending is not None and owned:
+            pending.put(None)
+            thread.join()
+
+    def _ensure_started(self) -> queue.SimpleQueue:
+        with self._lock:
+            if self._queue is None or self._owner_pid != os.getpid():
+                # First use, or forked: the parent's collector thread does not exist here
+                self._queue = queue.SimpleQueue()
+                self._thread = threading.Thread(
+                    target=self._collect, args=(self._queue,), name=self._name, daemon=True
+                )
+                self._thread.start()
+                self._owner_pid = os.getpid()
+            return self._queue
+
+    def _collect(self, pending: queue.SimpleQueue) -> None:
+        while True:
+            entry = pending.get()
+            if entry is None:
+                return
+
+            batch = [entry]
+            deadline = time.perf_counter() + self._max_wait
+            stop = False
+            while len(batch) < self._max_batch_size:
+                timeout = deadline - time.perf_counter()
+                try:
+                    entry = pending.get(timeout=timeout) if timeout > 0 else pending.get_nowait()
+                except queue.Empty:
+                    break
+                if entry is None:
+                    stop = True
+                    break
+                batch.append(entry)
+
+            self._run(batch)
+            if stop:
+                return
+
+    def _run(self, batch: List[Tuple[I, Future[O], float]]) -> None:
+        started = time.perf_counter()
+        try:
+            results = self._run_batch([item for item, _, _ in batch])
+            if len(results) != len(batch):
+                # zip would leave the surplus callers waiting forever
+                raise RuntimeError(f"{self._name}: batch of {len(batch)} item(s) returned {len(results)} result(s)")
+        except BaseException as exc:
+            logger.exception("%s: batch of %d item(s) failed", self._name, len(batch))
+            for _, future, _ in batch:
+                future.set_exception(exc)
+        else:
+            for (_, future, _), result in zip(batch, results):
+                future.set_result(result)
+
+        current = self._stats
+        self._stats = BatchingStats(
+            max_batch_size=current.max_batch_size,
+            max_wait_ms=current.max_wait_ms,
+            batches=current.batches + 1,
+            items=current.items + len(batch),
+            full_batches=current.full_batches + (len(batch) == self._max_batch_size),
+            queue_wait_ms=current.queue_wait_ms + sum(started - queued for _, _, queued in batch) * 1000.0,
+        )
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Callable, List, Sequence
+
+from core.config.models import ResultCacheConfig
+from core.models import Finding
+
+logger = logging.getLogger(__name__)
+
+# Rough per-object overheads used for memory accounting. Exact sizes depend on
+# the interpreter; the goal is a stable, conservative upper bound.
+_ENTRY_OVERHEAD_BYTES = 256
+_FINDING_OVERHEAD_BYTES = 512
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Point-in-time counters of an :class:`InspectionResultCache`."""
+    entries: int
+    bytes: int
+    hits: int
+    misses: int
+    evictions: int      # dropped to honour max_entries / max_bytes
+    expirations: int    # dropped because the TTL elapsed
+    invalidations: int  # full flushes caused by a config fingerprint change
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+@dataclass
+class _Entry:
+    findings: tuple[Finding, ...]
+    size: int
+    expires_at: float
+
+
+def prompt_digest(text: str) -> bytes:
+    """Content hash used as cache key for prompt text."""
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
+def _estimate_size(findings: Sequence[Finding]) -> int:
+    size = _ENTRY_OVERHEAD_BYTES
+    for f in findings:
+        size += _FINDING_OVERHEAD_BYTES + len(f.type) + len(f.snippet) + len(f.message) + len(f.severity)
+    return size
+
+
+class InspectionResultCache:
+    """
+    Content-addressed LRU+TTL cache for detector findings.
+
+    - Keys are a hash of the text plus the fingerprint of the config that
+      produced the findings.
+    - Memory is bounded by entry count and by an approximate byte budget.
+    - A lookup or store with a different config fingerprint flushes the
+      cache, so results from an old config are never served.
+    - Thread-safe: the inspection endpoints call it from the threadpool.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_bytes: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_entries < 1 or max_bytes < 1 or ttl_seconds <= 0:
+            raise ValueError("Cache bounds must be positive")
+
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._ttl = ttl_seconds
+        self._clock = clock
+
+        self._lock = Lock()
+        self._entries: OrderedDict[bytes, _Entry] = OrderedDict()
+        self._bytes = 0
+        self._fingerprint: str | None = None
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    @classmethod
+    def from_config(cls, cfg: ResultCacheConfig) -> "InspectionResultCache | None":
+        """Build a cache from config, or return None when caching is disabled."""
+        if not cfg.enabled:
+            return None
+        return cls(max_entries=cfg.max_entries, max_bytes=cfg.max_bytes, ttl_seconds=cfg.ttl_seconds)
+
+    def get(self, text: str, fingerprint: str) -> List[Finding] | None:
+        """Return cached findings for ``text`` or None on a miss."""
+        key = prompt_digest(text)
+        now = self._clock()
+
+        with self._lock:
+            self._check_fingerprint(fingerprint)
+
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            if entry.expires_at <= now:
+                self._remove(key)
+                self._expirations += 1
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return list(entry.findings)
+
+    def put(self, text: str, fingerprint: str, findings: Sequence[Finding]) -> None:
+        """Store findings for ``text``; oversized results are not cached."""
+        key = prompt_digest(text)
+        size = _estimate_size(findings)
+        if size > self._max_bytes:
+            logger.debug("Result too large to cache (estimated_bytes=%d)", size)
+            return
+
+        entry = _Entry(findings=tuple(findings), size=size, expires_at=self._clock() + self._ttl)
+
+        with self._lock:
+            self._check_fingerprint(fingerprint)
+
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = entry
+            self._bytes += size
+
+            while len(self._entries) > self._max_entries or self._bytes > self._max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                entries=len(self._entries),
+                bytes=self._bytes,
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+                invalidations=self._invalidations,
+            )
+
+    def _check_fingerprint(self, fingerprint: str) -> None:
+        """Flush all entries when the config fingerprint changes (caller holds the lock)."""
+        if fingerprint == self._fingerprint:
+            return
+
+        if self._fingerprint is not None:
+            logger.info(
+                "Inspection config fingerprint changed (%s -> %s); flushing %d cached result(s)",
+                self._fingerprint,
+                fingerprint,
+                len(self._entries),
+            )
+            self._invalidations += 1
+
+        self._entries.clear()
+        self._bytes = 0
+        self._fingerprint = fingerprint
+
+    def _remove(self, key: bytes) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
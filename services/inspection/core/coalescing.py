@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, Generic, Hashable, TypeVar
+
+from core.config.models import CoalescingConfig
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class CoalescingStats:
+    """Point-in-time counters of a :class:`RequestCoalescer`."""
+    in_flight: int    # distinct computations running right now
+    leaders: int      # computations started
+    coalesced: int    # callers that waited for another caller's computation instead
+
+
+class _Call(Generic[T]):
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: T | None = None
+        self.error: BaseException | None = None
+
+
+class RequestCoalescer(Generic[T]):
+    """
+    Single-flight execution of identical work.
+
+    The first caller for a key runs the computation; callers arriving with
+    the same key while it runs wait for it and get the same result (or the
+    same exception) instead of repeating the work. Nothing is kept once the
+    computation finishes, so this is no cache: a later call with that key
+    runs again (or is answered by a result cache, if one is configured).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call[T]] = {}
+        self._leaders = 0
+        self._coalesced = 0
+
+    @classmethod
+    def from_config(cls, cfg: CoalescingConfig) -> "RequestCoalescer | None":
+        return cls() if cfg.enabled else None
+
+    def run(self, key: Hashable, compute: Callable[[], T]) -> T:
+        """Return `compute()`, shared with every concurrent caller using the same key."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._leaders += 1
+            else:
+                self._coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = compute()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def stats(self) -> CoalescingStats:
+        with self._lock:
+            return CoalescingStats(in_flight=len(self._calls), leaders=self._leaders, coalesced=self._coalesced)
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import pathlib
 from functools import lru_cache
 from typing import Any, TYPE_CHECKING
@@ -31,6 +33,52 @@ def load_config(path: str | pathlib.Path | None = None) -> "InspectionConfig":
     return _load_cached_config(str(resolved_path.resolve()))
 
 
+def config_path(path: str | pathlib.Path | None = None) -> pathlib.Path:
+    """Resolved location of the config file `load_config(path)` reads."""
+    return _resolve_config_path(path).resolve()
+
+
+def reload_config(path: str | pathlib.Path | None = None) -> "InspectionConfig":
+    """
+    Re-read and validate the config from disk, bypassing the cache.
+
+    On success the cached config is dropped so later `load_config()` calls
+    see the new file; on failure the error is raised and nothing changes.
+    """
+    config = _parse_config(config_path(path))
+    _load_cached_config.cache_clear()
+    return config
+
+
+def config_fingerprint(config: "InspectionConfig") -> str:
+    """
+    Return a stable content hash of a validated config.
+
+    Used to key caches so results computed under one config are never
+    served under another.
+    """
+    canonical = json.dumps(config.model_dump(mode="json"), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def with_presidio_settings(config: "InspectionConfig", **updates: Any) -> "InspectionConfig":
+    """
+    Return `config` with the Presidio engine settings changed.
+
+    Keyword arguments are fields of `detection.pii.engines.presidio`; a dict
+    given for a nested block (`chunking`, `process_pool`, ...) updates only
+    the listed fields of that block.
+    """
+    presidio = config.detection.pii.engines.presidio
+    updates = {
+        name: getattr(presidio, name).model_copy(update=value) if isinstance(value, dict) else value
+        for name, value in updates.items()
+    }
+    engines = config.detection.pii.engines.model_copy(update={"presidio": presidio.model_copy(update=updates)})
+    pii = config.detection.pii.model_copy(update={"engines": engines})
+    return config.model_copy(update={"detection": config.detection.model_copy(update={"pii": pii})})
+
+
 def _resolve_config_path(path: str | pathlib.Path | None) -> pathlib.Path:
     """Resolve the condig file path, preferring the caller-provided path."""
     candidates: list[pathlib.Path]
@@ -53,9 +101,12 @@ def _resolve_config_path(path: str | pathlib.Path | None) -> pathlib.Path:
 
 @lru_cache(maxsize=1)
 def _load_cached_config(resolved_path: str) -> "InspectionConfig":
+    return _parse_config(pathlib.Path(resolved_path))
+
+
+def _parse_config(path: pathlib.Path) -> "InspectionConfig":
     from core.config.models import InspectionConfig
 
-    path = pathlib.Path(resolved_path)
     try:
         raw: dict[str, Any] = _read_config_yaml(path)
         return InspectionConfig.model_validate(raw)
@@ -63,11 +63,16 @@ class DetectorBase(FrozenModel):
 # ---------- Secrets ----------
 FilterMode = Literal["blacklist", "whitelist"]
 
+# detect_secrets: scan with detect-secrets itself (per line, per plugin)
+# native:         scan with the plugin's regexes directly (no detect-secrets plumbing)
+SecretScanEngine = Literal["detect_secrets", "native"]
+
 
 class SecretDetectSecretDetectorConfig(DetectorBase):
     """Configuration for a single detect-secrets plugin."""
     plugin_name: str
     plugin_type: str
+    engine: SecretScanEngine = "detect_secrets"
 
 
 class DetectSecretsFiltersConfig(FrozenModel):
@@ -107,11 +112,49 @@ class PiiPresidioPatternConfig(FrozenModel):
     score: float
 
 
+class PiiPresidioChunkingConfig(FrozenModel):
+    """Split long prompts into overlapping chunks analyzed in parallel."""
+    enabled: bool = False
+    min_chars: int = Field(default=20_000, ge=1)      # shorter prompts go to spaCy in one piece
+    chunk_chars: int = Field(default=10_000, ge=100)  # target size; cut at paragraph, sentence or space
+    overlap_chars: int = Field(default=400, ge=0)     # shared by neighbouring chunks; >= longest entity
+    max_workers: int = Field(default=4, ge=1)         # chunks of one prompt analyzed concurrently
+
+    @model_validator(mode="after")
+    def _check_overlap(self) -> "PiiPresidioChunkingConfig":
+        if self.overlap_chars * 2 >= self.chunk_chars:
+            raise ValueError("overlap_chars must be less than half of chunk_chars")
+        return self
+
+
+class PiiPresidioProcessPoolConfig(FrozenModel):
+    """Run Presidio in pre-warmed worker processes instead of the request thread (off the GIL)."""
+    enabled: bool = False
+    workers: int = Field(default=2, ge=1)                       # processes, each loading its own spaCy model
+    startup_timeout_seconds: float = Field(default=300.0, gt=0)  # model load + warmup of all workers
+
+
+class PiiPresidioMicroBatchingConfig(FrozenModel):
+    """Coalesce concurrent single-prompt requests into one spaCy batch."""
+    enabled: bool = False
+    max_batch_size: int = Field(default=16, ge=1)    # a batch runs as soon as it has this many prompts
+    max_wait_ms: float = Field(default=2.0, ge=0)    # ... or this long after its first prompt arrived
+
+
+SpacyModelTier = Literal["sm", "md", "lg"]
+
+
 class PiiPresidioEngineConfig(EngineBase):
     """Configuration for the Presidio NLP engine used for PII."""
     default_lang: str                        # e.g. "en"
     default_spacy_model: str                 # e.g. "en_core_web_lg"
+    spacy_model_tier: Optional[SpacyModelTier] = None       # swaps the size suffix of default_spacy_model
+    spacy_exclude: tuple[str, ...] = Field(default_factory=tuple)  # pipeline components never loaded
     default_score_threshold: float           # global default threshold
+    batch_size: int = Field(default=32, ge=1)  # spaCy nlp.pipe batch size for batch inspection
+    chunking: PiiPresidioChunkingConfig = Field(default_factory=PiiPresidioChunkingConfig)
+    process_pool: PiiPresidioProcessPoolConfig = Field(default_factory=PiiPresidioProcessPoolConfig)
+    micro_batching: PiiPresidioMicroBatchingConfig = Field(default_factory=PiiPresidioMicroBatchingConfig)
     detectors: Mapping[str, PiiPresidioDetectorConfig]  # email/phone/iban/...
 
 
@@ -140,6 +183,150 @@ class PromptInjectionConfig(FrozenModel):
     engines: PromptInjectionEnginesConfig
 
 
+# ---------- Runtime ----------
+
+class ResultCacheConfig(FrozenModel):
+    """In-process LRU+TTL cache for whole-prompt inspection results."""
+    enabled: bool = True
+    max_entries: int = Field(default=10_000, ge=1)                # LRU bound on number of prompts
+    max_bytes: int = Field(default=64 * 1024 * 1024, ge=1)        # approximate bound on cached findings
+    ttl_seconds: float = Field(default=300.0, gt=0)               # entries expire after this age
+
+
+class ConversationCacheConfig(ResultCacheConfig):
+    """Per-message findings cache for /inspect/conversation, kept apart from the result cache."""
+    max_entries: int = Field(default=50_000, ge=1)
+    ttl_seconds: float = Field(default=3_600.0, gt=0)             # outlives pauses between chat turns
+
+
+class FragmentCacheConfig(ResultCacheConfig):
+    """Per-paragraph findings cache for long prompts sharing boilerplate blocks."""
+    enabled: bool = False
+    max_entries: int = Field(default=50_000, ge=1)
+    min_prompt_chars: int = Field(default=4_096, ge=1)    # shorter prompts are analyzed whole
+    min_fragment_chars: int = Field(default=512, ge=1)    # short paragraphs are grouped with the next ones
+    seam_chars: int = Field(default=256, ge=1)            # re-scanned on each side of a fragment boundary
+
+    @model_validator(mode="after")
+    def _check_seam(self) -> "FragmentCacheConfig":
+        if self.seam_chars > self.min_fragment_chars:
+            raise ValueError("seam_chars must not exceed min_fragment_chars")
+        return self
+
+
+ExecutionMode = Literal["sequential", "parallel"]
+
+
+class DetectorExecutionConfig(FrozenModel):
+    """How the detectors of a single request are scheduled."""
+    mode: ExecutionMode = "sequential"        # parallel: fan out on a dedicated thread pool
+    max_workers: int = Field(default=4, ge=1)  # size of the dedicated detector pool
+
+
+# auto: RE2 when the optional google-re2 package is installed, else backtracking
+RegexEngine = Literal["auto", "re2", "backtracking"]
+UnsafePatternAction = Literal["reject", "warn"]
+
+
+class RegexSafetyConfig(FrozenModel):
+    """How injection and custom PII regexes run against untrusted prompts."""
+    engine: RegexEngine = "auto"
+    match_timeout_ms: float = Field(default=250.0, gt=0)    # per-call budget on the backtracking engine
+    on_unsafe_pattern: UnsafePatternAction = "reject"       # startup audit: exponential-backtracking patterns
+
+
+class ConfigReloadConfig(FrozenModel):
+    """Hot reload of the config file; these settings themselves apply after a restart."""
+    watch: bool = False                                       # poll the config file and reload on change
+    poll_interval_seconds: float = Field(default=2.0, gt=0)
+    admin_endpoint: bool = False                              # POST /admin/reload
+
+
+class StartupConfig(FrozenModel):
+    """How detectors are built and warmed up before the service takes traffic."""
+    parallel_warmup: bool = False               # build + warm detectors concurrently (spaCy load overlaps the rest)
+    max_workers: int = Field(default=4, ge=1)   # warmup threads; only used at startup and on reload
+
+
+class WarmupConfig(FrozenModel):
+    """Representative prompts run through `analyze_prompt` before the service reports ready."""
+    enabled: bool = True
+    corpus_path: Optional[str] = None                     # YAML `prompts:` list; default: bundled warmup_corpus.yml
+    min_rounds: int = Field(default=2, ge=1)
+    max_rounds: int = Field(default=10, ge=1)
+    stable_tolerance: float = Field(default=0.1, gt=0)    # stop once a round is within 10% of the one before
+    max_seconds: float = Field(default=60.0, gt=0)        # give up waiting for stable latency after this
+
+    @model_validator(mode="after")
+    def _check_rounds(self) -> "WarmupConfig":
+        if self.min_rounds > self.max_rounds:
+            raise ValueError("min_rounds must not exceed max_rounds")
+        return self
+
+
+class ServerConfig(FrozenModel):
+    """Pre-forking production server (server.py); applies on (re)start."""
+    workers: int = Field(default=1, ge=1)                      # processes forked from the preloaded master
+    max_requests: int = Field(default=0, ge=0)                 # recycle a worker after this many requests; 0 = never
+    max_requests_jitter: int = Field(default=0, ge=0)          # random extra per worker so they do not recycle together
+    max_worker_memory_mb: float = Field(default=0.0, ge=0)     # recycle a worker above this private memory; 0 = never
+    memory_check_interval_seconds: float = Field(default=10.0, gt=0)
+    graceful_timeout_seconds: float = Field(default=30.0, gt=0)  # in-flight requests drain before a worker is killed
+
+
+class AdaptiveConcurrencyConfig(FrozenModel):
+    """AIMD tuning of the admission concurrency limit from observed inspection latency."""
+    enabled: bool = False
+    min_concurrency: int = Field(default=1, ge=1)                    # also the starting limit
+    max_concurrency: int = Field(default=32, ge=1)                   # keep under the threadpool size (40)
+    target_latency_ms: Optional[float] = Field(default=None, gt=0)   # None: latency_tolerance x no-load latency
+    latency_tolerance: float = Field(default=2.0, gt=1.0)            # auto target relative to the fastest window
+    decrease_factor: float = Field(default=0.8, gt=0, lt=1)          # limit *= this when a window is too slow
+    window: int = Field(default=20, ge=1)                            # samples per adjustment (at least the limit)
+
+    @model_validator(mode="after")
+    def _check_bounds(self) -> "AdaptiveConcurrencyConfig":
+        if self.min_concurrency > self.max_concurrency:
+            raise ValueError("min_concurrency must not exceed max_concurrency")
+        return self
+
+
+class CoalescingConfig(FrozenModel):
+    """Single-flight /inspect: concurrent identical prompts share one analysis."""
+    enabled: bool = True
+
+
+class MetricsConfig(FrozenModel):
+    """Prometheus metrics on GET /metrics, per worker process; the endpoint applies on restart."""
+    enabled: bool = True
+
+
+class AdmissionConfig(FrozenModel):
+    """Bounded admission for the inspect endpoints, per worker process; applies on (re)start."""
+    enabled: bool = False
+    max_concurrency: int = Field(default=8, ge=1)               # inspections running at once (unless adaptive)
+    max_queue: int = Field(default=64, ge=0)                    # requests waiting for a slot; more -> 429
+    queue_timeout_seconds: float = Field(default=5.0, gt=0)     # waited this long for a slot -> 503
+    retry_after_seconds: int = Field(default=1, ge=0)           # Retry-After header of 429/503 answers
+    adaptive: AdaptiveConcurrencyConfig = Field(default_factory=AdaptiveConcurrencyConfig)
+
+
+class RuntimeConfig(FrozenModel):
+    """Service runtime settings (caching, execution); detection semantics live in `detection`."""
+    result_cache: ResultCacheConfig = Field(default_factory=ResultCacheConfig)
+    fragment_cache: FragmentCacheConfig = Field(default_factory=FragmentCacheConfig)
+    conversation_cache: ConversationCacheConfig = Field(default_factory=ConversationCacheConfig)
+    execution: DetectorExecutionConfig = Field(default_factory=DetectorExecutionConfig)
+    regex: RegexSafetyConfig = Field(default_factory=RegexSafetyConfig)
+    reload: ConfigReloadConfig = Field(default_factory=ConfigReloadConfig)
+    startup: StartupConfig = Field(default_factory=StartupConfig)
+    warmup: WarmupConfig = Field(default_factory=WarmupConfig)
+    server: ServerConfig = Field(default_factory=ServerConfig)
+    admission: AdmissionConfig = Field(default_factory=AdmissionConfig)
+    coalescing: CoalescingConfig = Field(default_factory=CoalescingConfig)
+    metrics: MetricsConfig = Field(default_factory=MetricsConfig)
+
+
 # ---------- Top-Level Detection & Policy ----------
 
 class DetectionConfig(FrozenModel):
@@ -150,3 +337,4 @@ class DetectionConfig(FrozenModel):
 
 class InspectionConfig(FrozenModel):
     detection: DetectionConfig
+    runtime: RuntimeConfig = Field(default_factory=RuntimeConfig)
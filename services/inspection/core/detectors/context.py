@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import threading
+import unicodedata
+from functools import cached_property
+from typing import TYPE_CHECKING, Dict, NamedTuple, Tuple
+
+from core.detectors.patterns import fold_case
+
+if TYPE_CHECKING:
+    from presidio_analyzer.nlp_engine import NlpArtifacts, NlpEngine
+
+
+class PromptLine(NamedTuple):
+    """One line of a prompt without its line break, plus its prompt offset."""
+    start: int
+    text: str
+
+
+class PromptContext:
+    """
+    Views of one prompt shared by all detectors of a request.
+
+    Built once per request by the rule engine. Every view is derived lazily
+    on first access and then reused, so a view costs one pass over the
+    prompt however many detectors read it:
+
+    - lines:        `PromptLine`s as `str.splitlines()` cuts them, with offsets
+    - folded:       `fold_case(text)`, the form keyword prefilters search
+    - folded_lines: `fold_case` of each line, aligned with `lines`
+    - normalized:   NFKC form of the text (offsets do not map back to `text`)
+    - nlp_artifacts(): Presidio's spaCy pass (the `Doc` is `.tokens`)
+
+    Views are pure functions of the prompt. Detectors running in parallel
+    may race to build one; both build the same value, so no lock is needed
+    except for the spaCy pass, which is too expensive to run twice.
+    """
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self._nlp_lock = threading.Lock()
+        self._nlp_artifacts: Dict[Tuple[int, str], NlpArtifacts] = {}
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    @cached_property
+    def lines(self) -> Tuple[PromptLine, ...]:
+        lines = []
+        offset = 0
+        for raw_line in self.text.splitlines(keepends=True):
+            lines.append(PromptLine(offset, raw_line.rstrip("\r\n")))
+            offset += len(raw_line)
+        return tuple(lines)
+
+    @cached_property
+    def folded(self) -> str:
+        return fold_case(self.text)
+
+    @cached_property
+    def folded_lines(self) -> Tuple[str, ...]:
+        return tuple(fold_case(line.text) for line in self.lines)
+
+    @cached_property
+    def normalized(self) -> str:
+        return unicodedata.normalize("NFKC", self.text)
+
+    def nlp_artifacts(self, nlp_engine: NlpEngine, language: str) -> NlpArtifacts:
+        """Run ``nlp_engine`` over the prompt once and reuse the result."""
+        key = (id(nlp_engine), language)
+        with self._nlp_lock:
+            artifacts = self._nlp_artifacts.get(key)
+            if artifacts is None:
+                artifacts = nlp_engine.process_text(self.text, language)
+                self._nlp_artifacts[key] = artifacts
+        return artifacts
@@ -3,10 +3,13 @@ from __future__ import annotations
 import logging
 import re
 from dataclasses import dataclass
-from typing import List
+from typing import List, Sequence
 
 from core.models import Finding
-from core.detectors.protocols import IDetector
+from core.detectors.context import PromptContext
+from core.detectors.patterns import MultiPatternMatcher
+from core.detectors.protocols import IBatchDetector, IContextDetector
+from core.detectors.regex_safety import BoundedPattern, compile_guarded
 from core.config.models import InspectionConfig
 
 logger = logging.getLogger(__name__)
@@ -25,7 +28,7 @@ class _ResolvedPattern:
     """Runtime pattern with resolved type + severity from policy."""
     type_id: str                 # e.g. "prompt_injection_override"
     severity: str                # e.g. "high"
-    regex: re.Pattern[str]
+    regex: BoundedPattern        # audited; RE2 or time-bounded backtracking
     message: str
 
 
@@ -64,18 +67,27 @@ _PATTERN_DEFS: list[_PatternDefinition] = [
 ]
 
 
-class InjectionPatternDetector(IDetector):
+class InjectionPatternDetector(IContextDetector, IBatchDetector):
     """
     Regex-based prompt injection detector.
 
     For each static pattern we:
       - look up the matching detector by its key (generic/override/suspicious)
       - skip if engine or detector is disabled
+      - audit each pattern for catastrophic backtracking and compile it for
+        `runtime.regex.engine` (RE2, or backtracking with a time budget)
+      - compile the remaining patterns into one `MultiPatternMatcher`: a single
+        keyword pass over the prompt selects the patterns whose literals occur,
+        only those are run, and hits come back ordered by position
       - emit Finding with:
           type      -> detector.id   (e.g. "prompt_injection_override")
           severity  -> detector.severity
           snippet   -> matched part of the prompt
           confidence-> 1.0 (static rules)
+
+    A pattern that exceeds its time budget fails closed: the prompt gets one
+    finding for that pattern spanning the whole prompt, so padding a prompt
+    cannot be used to slip past the detector.
     """
 
     def __init__(self, config: InspectionConfig) -> None:
@@ -90,8 +102,10 @@ class InjectionPatternDetector(IDetector):
                 "(detection.prompt_injection.engines.pattern.enabled=false)."
             )
             self._patterns: tuple[_ResolvedPattern, ...] = ()
+            self._matcher = MultiPatternMatcher(())
             return
 
+        regex_cfg = policy.runtime.regex
         resolved: list[_ResolvedPattern] = []
 
         for p in _PATTERN_DEFS:
@@ -120,7 +134,12 @@ class InjectionPatternDetector(IDetector):
                 _ResolvedPattern(
                     type_id=detector_cfg.id,
                     severity=detector_cfg.severity,
-                    regex=p.regex,
+                    regex=compile_guarded(
+                        p.regex.pattern,
+                        p.regex.flags,
+                        regex_cfg,
+                        f"Prompt injection pattern of '{detector_cfg.id}'",
+                    ),
                     message=p.message,
                 )
             )
@@ -132,33 +151,47 @@ class InjectionPatternDetector(IDetector):
             )
 
         self._patterns = tuple(resolved)
+        self._matcher = MultiPatternMatcher([p.regex for p in self._patterns], prefilter=True)
 
     def warmup(self) -> None:
-        """Warmup hook to ensure patterns are bound."""
-        _ = self._patterns
+        """Warmup hook: run the matcher once so its keyword pass is compiled and hot."""
+        list(self._matcher.finditer("warmup"))
+
+    def detect_batch(self, prompts: Sequence[str]) -> List[List[Finding]]:
+        """Run the resolved patterns over every prompt of a batch."""
+        return [self.detect(prompt) for prompt in prompts]
 
     def detect(self, prompt: str) -> List[Finding]:
+        return self.detect_context(PromptContext(prompt))
+
+    def detect_context(self, context: PromptContext) -> List[Finding]:
+        """Run the resolved patterns; the keyword pass reads the shared folded view."""
         findings: List[Finding] = []
+        prompt = context.text
 
         if not prompt or not self._patterns:
             return findings
 
-        for p in self._patterns:
-            for match in p.regex.finditer(prompt):
-                start, end = match.span()
-                snippet = prompt[start:end]
-
-                findings.append(
-                    Finding(
-                        type=p.type_id,
-                        start=start,
-                        end=end,
-                        snippet=snippet,
-                        message=p.message,
-                        severity=p.severity,
-                        confidence=1.0,
-                    )
+        # A pattern over its time budget is flagged on its own; the other patterns' hits stay
+        timed_out: List[int] = []
+        for idx, match in self._matcher.finditer(prompt, context.folded, timed_out):
+            p = self._patterns[idx]
+            start, end = match.span()
+            snippet = prompt[start:end]
+
+            findings.append(
+                Finding(
+                    type=p.type_id,
+                    start=start,
+                    end=end,
+                    snippet=snippet,
+                    message=p.message,
+                    severity=p.severity,
+                    confidence=1.0,
                 )
+            )
+
+        findings.extend(self._timeout_finding(prompt, idx) for idx in timed_out)
 
         if findings:
             counts: dict[str, int] = {}
@@ -173,3 +206,20 @@ class InjectionPatternDetector(IDetector):
             logger.debug("InjectionPatternDetector found no prompt injection patterns")
 
         return findings
+
+    def _timeout_finding(self, prompt: str, pattern_index: int) -> Finding:
+        p = self._patterns[pattern_index]
+        logger.warning(
+            "InjectionPatternDetector pattern for '%s' timed out on a %d-char prompt; flagging it",
+            p.type_id,
+            len(prompt),
+        )
+        return Finding(
+            type=p.type_id,
+            start=0,
+            end=len(prompt),
+            snippet="",
+            message=f"{p.message} (pattern exceeded its time budget; prompt treated as matching)",
+            severity=p.severity,
+            confidence=0.5,
+        )
@@ -0,0 +1,433 @@
+from __future__ import annotations
+
+import re
+import threading
+from dataclasses import dataclass
+from itertools import islice
+from re import _constants as sre_constants, _parser as sre_parse
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Generic,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+K = TypeVar("K", bound=Hashable)
+
+
+class MultiPatternMatcher:
+    """
+    Finds the matches of many regexes in one call, ordered by position.
+
+    Per pattern, matches are exactly those of ``pattern.finditer(text)``
+    (leftmost, non-overlapping); matches of different patterns may overlap.
+
+    Each pattern keeps its own compiled program. CPython's `re` has no
+    multi-literal prefix search, so a fused alternation has to try every
+    branch at every position and measured slower than separate scans;
+    separate programs keep each pattern's own literal/charset prefix skip.
+    A pattern that does not match at all costs one ``search`` call.
+
+    With ``prefilter=True`` a :class:`KeywordPrefilter` pass over the text
+    first picks the patterns whose required literals occur in it; only
+    those are run. Text that contains none of the literals then costs one
+    scan however many patterns there are. Results are unchanged.
+    """
+
+    def __init__(self, patterns: Sequence[re.Pattern[str]], prefilter: bool = False) -> None:
+        self._patterns: Tuple[re.Pattern[str], ...] = tuple(patterns)
+        self._prefilter: Optional[KeywordPrefilter[int]] = None
+        if prefilter:
+            self._prefilter = KeywordPrefilter({idx: (p,) for idx, p in enumerate(self._patterns)})
+
+    @property
+    def patterns(self) -> Tuple[re.Pattern[str], ...]:
+        return self._patterns
+
+    @property
+    def prefilter(self) -> Optional[KeywordPrefilter[int]]:
+        return self._prefilter
+
+    def finditer(
+        self,
+        text: str,
+        folded: Optional[str] = None,
+        timed_out: Optional[List[int]] = None,
+    ) -> Iterator[Tuple[int, re.Match[str]]]:
+        """Yield ``(pattern_index, match)`` ordered by start, then pattern index.
+
+        ``folded`` is ``fold_case(text)`` if the caller already has it.
+        Without ``timed_out`` a pattern exceeding its time budget raises
+        (``TimeoutError``); with it, that pattern's index is appended there,
+        its matches are left out and the other patterns' matches are kept.
+        """
+        hits: List[Tuple[int, int, re.Match[str]]] = []
+        if self._prefilter is None:
+            indices: Sequence[int] = range(len(self._patterns))
+        else:
+            indices = self._prefilter.candidates(text, folded)
+
+        for idx in indices:
+            if timed_out is None:
+                hits.extend(self._pattern_hits(idx, text))
+                continue
+            try:
+                hits.extend(self._pattern_hits(idx, text))
+            except TimeoutError:
+                timed_out.append(idx)
+
+        if len(hits) > 1:
+            hits.sort(key=_hit_order)
+        for _, idx, match in hits:
+            yield idx, match
+
+    def _pattern_hits(self, idx: int, text: str) -> List[Tuple[int, int, re.Match[str]]]:
+        """All matches of one pattern; complete or not at all if it times out."""
+        pattern = self._patterns[idx]
+        first = pattern.search(text)
+        if first is None:
+            return []
+        hits = [(first.start(), idx, first)]
+        # finditer from the first hit yields it again; skip that one
+        for match in islice(pattern.finditer(text, first.start()), 1, None):
+            hits.append((match.start(), idx, match))
+        return hits
+
+
+def _hit_order(hit: Tuple[int, int, re.Match[str]]) -> Tuple[int, int]:
+    return hit[0], hit[1]
+
+
+# ---------- Required literals ----------
+
+# Bounds that keep literal-set expansion cheap and the sets useful.
+_MAX_EXACT_STRINGS = 64
+_MAX_CLASS_LITERALS = 8
+_MAX_EXACT_REPEAT = 4
+_MIN_LITERAL_LENGTH = 2
+
+# Characters that `re.IGNORECASE` equates with an ASCII letter although
+# str.lower() does not map them onto it.
+_FOLD_TABLE = str.maketrans({"\u0130": "i", "\u0131": "i", "\u017f": "s", "\u212a": "k"})
+
+_REPEATS = (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT, sre_constants.POSSESSIVE_REPEAT)
+_ZERO_WIDTH = (sre_constants.AT, sre_constants.ASSERT, sre_constants.ASSERT_NOT)
+
+
+def fold_case(text: str) -> str:
+    """Case-fold ``text`` the same way :func:`required_literals` folds literals."""
+    return text.translate(_FOLD_TABLE).lower()
+
+
+def required_literals(regex: re.Pattern[str]) -> Optional[FrozenSet[str]]:
+    """Return case-folded literals of which every match of ``regex`` contains one.
+
+    Derived from the parsed pattern, e.g. ``(?:AKIA|ASIA)[0-9A-Z]{16}`` gives
+    ``{"akia", "asia"}``. Returns None when no useful set exists (a branch
+    without literals, only optional literals, or only single characters).
+    Folding makes the set valid for case-sensitive and IGNORECASE patterns.
+    """
+    if not isinstance(regex.pattern, str):
+        return None
+
+    try:
+        parsed = sre_parse.parse(regex.pattern, regex.flags)
+    except re.error:
+        return None
+
+    literals = _required_in_seq(list(parsed))
+    if not literals or min(len(lit) for lit in literals) < _MIN_LITERAL_LENGTH:
+        return None
+
+    # "contains one of" only needs the shortest form: drop literals that
+    # contain another literal of the set.
+    return frozenset(
+        lit for lit in literals
+        if not any(other != lit and other in lit for other in literals)
+    )
+
+
+def _better(a: Optional[FrozenSet[str]], b: Optional[FrozenSet[str]]) -> Optional[FrozenSet[str]]:
+    """Prefer the set whose weakest literal is longest, then the smaller set."""
+    if a is None:
+        return b
+    if b is None:
+        return a
+    score_a = (min(len(lit) for lit in a), -len(a))
+    score_b = (min(len(lit) for lit in b), -len(b))
+    return b if score_b > score_a else a
+
+
+def _required_in_seq(items: List[Tuple[Any, Any]]) -> Optional[FrozenSet[str]]:
+    best: Optional[FrozenSet[str]] = None
+    run: Set[str] = {""}  # exact strings the current run of items can match
+
+    for op, av in items:
+        exact = _exact(op, av)
+        if exact is not None:
+            joined = {a + b for a in run for b in exact}
+            if len(joined) <= _MAX_EXACT_STRINGS:
+                run = joined
+                continue
+            exact_start = exact
+        else:
+            exact_start = None
+
+        if exact_start is None:
+            # The run is always followed by one of the item's prefixes.
+            prefixes = _prefixes(op, av)
+            if prefixes is not None:
+                joined = {a + b for a in run for b in prefixes}
+                if len(joined) <= _MAX_EXACT_STRINGS:
+                    run = joined
+
+        if "" not in run:
+            best = _better(best, frozenset(run))
+        if exact_start is not None:
+            run = set(exact_start)
+        else:
+            run = {""}
+            best = _better(best, _required_in_item(op, av))
+
+    if "" not in run:
+        best = _better(best, frozenset(run))
+    return best
+
+
+def _required_in_item(op: Any, av: Any) -> Optional[FrozenSet[str]]:
+    if op is sre_constants.SUBPATTERN:
+        return _required_in_seq(list(av[-1]))
+    if op is sre_constants.ATOMIC_GROUP:
+        return _required_in_seq(list(av))
+    if op is sre_constants.BRANCH:
+        union: Set[str] = set()
+        for branch in av[1]:
+            required = _required_in_seq(list(branch))
+            if required is None:
+                return None
+            union |= required
+        return frozenset(union)
+    if op in _REPEATS and av[0] >= 1:
+        return _required_in_seq(list(av[2]))
+    return None
+
+
+def _exact(op: Any, av: Any) -> Optional[Set[str]]:
+    """All strings an item can match, if that set is small and finite."""
+    if op is sre_constants.LITERAL:
+        return {fold_case(chr(av))}
+    if op in _ZERO_WIDTH:
+        return {""}
+    if op is sre_constants.IN:
+        if len(av) > _MAX_CLASS_LITERALS or any(item_op is not sre_constants.LITERAL for item_op, _ in av):
+            return None
+        return {fold_case(chr(code)) for _, code in av}
+    if op is sre_constants.SUBPATTERN:
+        return _exact_seq(list(av[-1]))
+    if op is sre_constants.ATOMIC_GROUP:
+        return _exact_seq(list(av))
+    if op is sre_constants.BRANCH:
+        union: Set[str] = set()
+        for branch in av[1]:
+            exact = _exact_seq(list(branch))
+            if exact is None:
+                return None
+            union |= exact
+        return union if len(union) <= _MAX_EXACT_STRINGS else None
+    if op in _REPEATS and av[0] == av[1] and av[0] <= _MAX_EXACT_REPEAT:
+        return _exact_seq(list(av[2]) * av[0])
+    return None
+
+
+def _prefixes(op: Any, av: Any) -> Optional[Set[str]]:
+    """Non-empty strings one of which starts every match of an item, if known."""
+    if op is sre_constants.SUBPATTERN:
+        return _prefixes_seq(list(av[-1]))
+    if op is sre_constants.ATOMIC_GROUP:
+        return _prefixes_seq(list(av))
+    if op is sre_constants.BRANCH:
+        union: Set[str] = set()
+        for branch in av[1]:
+            prefixes = _prefixes_seq(list(branch))
+            if prefixes is None:
+                return None
+            union |= prefixes
+        return union if len(union) <= _MAX_EXACT_STRINGS else None
+    if op in _REPEATS and av[0] >= 1:
+        return _prefixes_seq(list(av[2]))
+    return None
+
+
+def _prefixes_seq(items: List[Tuple[Any, Any]]) -> Optional[Set[str]]:
+    run: Set[str] = {""}
+    for op, av in items:
+        step = _exact(op, av)
+        last = step is None
+        if last:
+            step = _prefixes(op, av)
+            if step is None:
+                break
+        joined = {a + b for a in run for b in step}
+        if len(joined) > _MAX_EXACT_STRINGS:
+            break
+        run = joined
+        if last:
+            break
+    return run if "" not in run else None
+
+
+def _exact_seq(items: List[Tuple[Any, Any]]) -> Optional[Set[str]]:
+    strings: Set[str] = {""}
+    for op, av in items:
+        exact = _exact(op, av)
+        if exact is None:
+            return None
+        strings = {a + b for a in strings for b in exact}
+        if len(strings) > _MAX_EXACT_STRINGS:
+            return None
+    return strings
+
+
+# ---------- Keyword prefilter ----------
+
+@dataclass(frozen=True)
+class PrefilterStats:
+    """Cumulative prefilter counters."""
+    lines: int = 0           # lines seen
+    lines_skipped: int = 0   # lines on which no gated key could match
+    checks: int = 0          # (line, key) pairs seen
+    checks_skipped: int = 0  # (line, key) pairs ruled out
+
+    @property
+    def skip_ratio(self) -> float:
+        """Share of (line, key) checks the prefilter ruled out."""
+        return self.checks_skipped / self.checks if self.checks else 0.0
+
+
+class KeywordPrefilter(Generic[K]):
+    """
+    Cheap literal gate in front of per-key regex scans.
+
+    Every key (e.g. a detect-secrets plugin) maps to its regexes. At build
+    time each regex is reduced to :func:`required_literals`; a key whose
+    regexes all have such literals is *gated* and only scanned on lines
+    that contain one of them. Keys without derivable literals are always
+    scanned, so the prefilter never changes results.
+
+    All literals are searched with one compiled regex over the case-folded
+    line. The literals are merged into a prefix trie (``abc|abd`` becomes
+    ``ab(?:c|d)``), so each position costs one walk down the trie rather
+    than one attempt per literal, and the cost stays flat as literals are
+    added. Of several literals starting at the same position only the
+    longest is reported; the shorter ones are its prefixes, so each
+    literal also carries the keys of its prefixes.
+    """
+
+    def __init__(self, regexes_by_key: Mapping[K, Iterable[re.Pattern[str]]]) -> None:
+        self._keys: Tuple[K, ...] = tuple(regexes_by_key)
+        self._order: Dict[K, int] = {key: idx for idx, key in enumerate(self._keys)}
+
+        keys_by_literal: Dict[str, Set[K]] = {}
+        always: List[K] = []
+        for key, regexes in regexes_by_key.items():
+            literals = _key_literals(regexes)
+            if literals is None:
+                always.append(key)
+                continue
+            for literal in literals:
+                keys_by_literal.setdefault(literal, set()).add(key)
+
+        self._always: FrozenSet[K] = frozenset(always)
+        self._keys_by_literal: Dict[str, FrozenSet[K]] = {
+            literal: frozenset().union(
+                *(keys for other, keys in keys_by_literal.items() if literal.startswith(other))
+            )
+            for literal in keys_by_literal
+        }
+
+        self._locator: Optional[re.Pattern[str]] = None
+        if keys_by_literal:
+            self._locator = re.compile("(?=(" + _trie_regex(keys_by_literal) + "))")
+
+        self._lock = threading.Lock()
+        self._stats = PrefilterStats()
+
+    @property
+    def gated_keys(self) -> int:
+        return len(self._keys) - len(self._always)
+
+    @property
+    def literals(self) -> int:
+        return len(self._keys_by_literal)
+
+    def candidates(self, line: str, folded: Optional[str] = None) -> Tuple[K, ...]:
+        """Keys whose regexes could match ``line``, in construction order.
+
+        ``folded`` is ``fold_case(line)`` if the caller already has it.
+        """
+        keys: Set[K] = set(self._always)
+        if self._locator is not None:
+            for hit in self._locator.finditer(fold_case(line) if folded is None else folded):
+                keys |= self._keys_by_literal[hit.group(1)]
+                if len(keys) == len(self._keys):
+                    break
+
+        if len(keys) == len(self._keys):
+            return self._keys
+        return tuple(sorted(keys, key=self._order.__getitem__))
+
+    def record(self, lines: int, lines_skipped: int, checks: int, checks_skipped: int) -> None:
+        """Add the counters of one scan to the cumulative stats."""
+        with self._lock:
+            current = self._stats
+            self._stats = PrefilterStats(
+                lines=current.lines + lines,
+                lines_skipped=current.lines_skipped + lines_skipped,
+                checks=current.checks + checks,
+                checks_skipped=current.checks_skipped + checks_skipped,
+            )
+
+    def stats(self) -> PrefilterStats:
+        with self._lock:
+            return self._stats
+
+
+def _trie_regex(literals: Iterable[str]) -> str:
+    """Alternation of ``literals`` factored by common prefix, longest match first."""
+    trie: Dict[str, Any] = {}
+    for literal in literals:
+        node = trie
+        for char in literal:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    return _render_trie(trie)
+
+
+def _render_trie(node: Dict[str, Any]) -> str:
+    branches = [re.escape(char) + _render_trie(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ""
+    if len(branches) == 1 and "" not in node:
+        return branches[0]
+    # A literal ending here is the empty branch; greedy `?` tries longer ones first
+    return "(?:" + "|".join(branches) + ")" + ("?" if "" in node else "")
+
+
+def _key_literals(regexes: Iterable[re.Pattern[str]]) -> Optional[Set[str]]:
+    literals: Set[str] = set()
+    for regex in regexes:
+        required = required_literals(regex)
+        if required is None:
+            return None
+        literals |= required
+    return literals or None
@@ -1,5 +1,17 @@
 from .base import PiiDetectionOrchestrator
-from .presidio.detector import PresidioPiiDetector
-from .presidio.engine import get_presidio_analyzer
 
-__all__ = ["PiiDetectionOrchestrator", "PresidioPiiDetector", "get_presidio_analyzer"]
\ No newline at end of file
+__all__ = ["PiiDetectionOrchestrator", "PresidioPiiDetector", "get_presidio_analyzer"]
+
+
+def __getattr__(name: str):
+    # Presidio pulls in spaCy; import it on first use, not with the package
+    # (e.g. when only the Presidio plan or chunking helpers are needed).
+    if name == "PresidioPiiDetector":
+        from .presidio.detector import PresidioPiiDetector
+
+        return PresidioPiiDetector
+    if name == "get_presidio_analyzer":
+        from .presidio.engine import get_presidio_analyzer
+
+        return get_presidio_analyzer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import re
+from typing import List, NamedTuple, Sequence
+
+from presidio_analyzer import RecognizerResult
+
+# Preferred cut points, best first: paragraph break, sentence end, any space.
+# A cut is placed right after the match, so chunks end on whitespace.
+_BOUNDARIES = (
+    re.compile(r"\n[ \t]*\n\s*"),
+    re.compile(r"(?:[.!?][)\]\"']*|\n)\s+"),
+    re.compile(r"\s+"),
+)
+_SPACE = re.compile(r"\s+")
+
+
+class TextChunk(NamedTuple):
+    """A slice ``text[start:end]`` that owns the results starting in ``[own_start, own_end)``.
+
+    Neighbouring chunks overlap; the seam between them sits in the middle
+    of the overlap, so every result is reported by exactly one chunk and
+    that chunk sees at least half the overlap of text past the seam.
+    """
+    start: int
+    end: int
+    own_start: int
+    own_end: int
+
+
+def split_chunks(text: str, chunk_chars: int, overlap_chars: int) -> List[TextChunk]:
+    """Cut ``text`` into chunks of at most ``chunk_chars`` sharing ``overlap_chars``.
+
+    Cuts prefer paragraph breaks, then sentence ends, then whitespace, in the
+    second half of each chunk; a word longer than that is cut hard. A chunk
+    after a cut starts on a word boundary inside the overlap.
+    """
+    if overlap_chars * 2 >= chunk_chars:
+        raise ValueError("overlap_chars must be less than half of chunk_chars")
+
+    spans: List[tuple[int, int]] = []
+    start = 0
+    length = len(text)
+    while True:
+        end = start + chunk_chars
+        if end >= length:
+            spans.append((start, length))
+            break
+
+        end = _cut_point(text, start + chunk_chars // 2, end)
+        spans.append((start, end))
+
+        next_start = end - overlap_chars
+        space = _SPACE.search(text, next_start, end)
+        if space is not None and space.end() < end:
+            next_start = space.end()
+        start = next_start
+
+    chunks: List[TextChunk] = []
+    own_start = 0
+    for idx, (start, end) in enumerate(spans):
+        own_end = length if idx == len(spans) - 1 else (spans[idx + 1][0] + end) // 2
+        chunks.append(TextChunk(start, end, own_start, own_end))
+        own_start = own_end
+    return chunks
+
+
+def _cut_point(text: str, lo: int, hi: int) -> int:
+    for boundary in _BOUNDARIES:
+        last = None
+        for last in boundary.finditer(text, lo, hi):
+            pass
+        if last is not None:
+            return last.end()
+    return hi
+
+
+def merge_chunk_results(
+    chunks: Sequence[TextChunk],
+    chunk_results: Sequence[List[RecognizerResult]],
+) -> List[RecognizerResult]:
+    """Map per-chunk results to prompt offsets and drop duplicates across seams.
+
+    A result is kept only by the chunk owning its start. One that runs across
+    the seam then absorbs same-type results of the next chunk it contains at
+    no higher score, as Presidio's own de-duplication would on the whole text.
+    Results are returned ordered by position.
+    """
+    merged: List[RecognizerResult] = []
+    crossing: List[RecognizerResult] = []
+
+    for chunk, results in zip(chunks, chunk_results):
+        for result in results:
+            result.start += chunk.start
+            result.end += chunk.start
+            if not chunk.own_start <= result.start < chunk.own_end:
+                continue
+            merged.append(result)
+            if result.end > chunk.own_end:
+                crossing.append(result)
+
+    if crossing:
+        merged = [
+            result
+            for result in merged
+            if not any(
+                other is not result
+                and other.entity_type == result.entity_type
+                and result.contained_in(other)
+                and result.score <= other.score
+                for other in crossing
+            )
+        ]
+
+    merged.sort(key=lambda r: (r.start, r.end, r.entity_type))
+    return merged
@@ -1,41 +1,46 @@
 from __future__ import annotations
 
 import logging
-from collections.abc import Mapping
-from typing import Dict, List
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Sequence
 
-from presidio_analyzer import AnalyzerEngine, RecognizerResult
+from presidio_analyzer import AnalyzerEngine, BatchAnalyzerEngine, RecognizerResult
 
+from core.batching import BatchingStats, MicroBatcher
 from core.config.models import InspectionConfig, PiiPresidioDetectorConfig, PiiPresidioEngineConfig
+from core.detectors.pii.presidio.chunking import merge_chunk_results, split_chunks
 from core.detectors.pii.presidio.engine import get_presidio_analyzer
+from core.detectors.pii.presidio.plan import PresidioPlan, build_presidio_plan
+from core.detectors.pii.presidio.process_pool import EntitySpan, PresidioProcessPool
 from core.models import Finding
-from core.detectors.protocols import IDetector
+from core.detectors.context import PromptContext
+from core.detectors.protocols import IBatchDetector, IContextDetector
 
 logger = logging.getLogger(__name__)
 
 
-_PiiLookup = Dict[str, PiiPresidioDetectorConfig]
-
-
-def _build_entity_lookup(detectors_cfg: Mapping[str, PiiPresidioDetectorConfig]) -> _PiiLookup:
-    """Map Presidio entity types to enabled PII configs for fast lookup.
-
-    Keys:   Presidio entity_type (e.g. "EMAIL_ADDRESS")
-    Values: PiiEntityConfig for that entity, but only if enabled=True
-    """
-    return {
-        cfg.presidio_type: cfg
-        for cfg in detectors_cfg.values()
-        if cfg.enabled
-    }
-
-
-class PresidioPiiDetector(IDetector):
+class PresidioPiiDetector(IContextDetector, IBatchDetector):
     """PII detector based on Presidio + spaCy.
 
     - Reads policy from the YAML config via `load_policy_config()`
     - Uses Presidio's AnalyzerEngine (cached in `get_analyzer()`)
-    - Only entities enabled in the policy are considered.
+    - Only entities enabled in the policy are analyzed: a `PresidioPlan` built
+      once passes them as `entities=` (so other recognizers never run) and
+      pushes the lowest per-entity threshold down into Presidio.
+    - Single prompts take the spaCy pass from the request's `PromptContext`,
+      so it runs at most once per prompt and language.
+    - Batches run through spaCy's `nlp.pipe` via Presidio's BatchAnalyzerEngine.
+    - With `chunking` enabled, prompts longer than `min_chars` are cut into
+      overlapping chunks on paragraph/sentence boundaries, analyzed on a
+      dedicated thread pool and merged back into prompt offsets, which keeps
+      spaCy's memory bounded and long prompts under `nlp.max_length`.
+    - With `process_pool` enabled, analysis runs in pre-warmed worker
+      processes (`PresidioProcessPool`) and this process never loads spaCy;
+      `warmup()` starts the workers and `close()` stops them.
+    - With `micro_batching` enabled, single prompts of concurrent requests
+      are collected for a few milliseconds and analyzed as one batch.
     """
 
     def __init__(
@@ -43,51 +48,192 @@ class PresidioPiiDetector(IDetector):
         config: InspectionConfig,
         analyzer: AnalyzerEngine | None = None,
     ) -> None:
-        # get_analyzer() caches, so this is cheap; reuse underlying spaCy/Presidio objects.
         self._config = config
-        self._analyzer: AnalyzerEngine = analyzer or get_presidio_analyzer(config)
-        enabled_count = sum(1 for cfg in (config.detection.pii.engines.presidio.detectors or {}).values() if cfg.enabled)
-        logger.info("PresidioPiiDetector initialized with %d enabled entities", enabled_count)
+        presidio_cfg = config.detection.pii.engines.presidio
+        self._process_pool: PresidioProcessPool | None = None
+        self._analyzer: AnalyzerEngine | None = None
+        if presidio_cfg.process_pool.enabled:
+            # Each worker process builds its own analyzer
+            self._process_pool = PresidioProcessPool(config, presidio_cfg.process_pool)
+        else:
+            # get_analyzer() caches, so this is cheap; reuse underlying spaCy/Presidio objects.
+            self._analyzer = analyzer or get_presidio_analyzer(config)
+        self._plan: PresidioPlan = build_presidio_plan(presidio_cfg)
+        logger.info(
+            "PresidioPiiDetector initialized with %d enabled entities (score floor %.2f, %s)",
+            len(self._plan.entities),
+            self._plan.score_threshold,
+            f"{presidio_cfg.process_pool.workers} worker process(es)" if self._process_pool else "in process",
+        )
+
+        self._batcher: MicroBatcher[str, Sequence[RecognizerResult | EntitySpan]] | None = None
+        if presidio_cfg.micro_batching.enabled:
+            self._batcher = MicroBatcher(
+                self._analyze_texts,
+                max_batch_size=presidio_cfg.micro_batching.max_batch_size,
+                max_wait_ms=presidio_cfg.micro_batching.max_wait_ms,
+                name="presidio-batcher",
+            )
+
+        self._chunking = presidio_cfg.chunking
+        self._chunk_pool: ThreadPoolExecutor | None = None
+        self._chunk_pool_pid: int | None = None
+        self._chunk_pool_lock = threading.Lock()
 
     def detect(self, prompt: str) -> List[Finding]:
         """Detect PII using Presidio with a spaCy backend.
 
         Enabled entities, thresholds and severities are driven by the YAML policy.
         """
+        return self.detect_context(PromptContext(prompt))
+
+    def detect_context(self, context: PromptContext) -> List[Finding]:
+        """Detect PII, reusing the context's spaCy pass for the configured language."""
+        prompt = context.text
         if not prompt:
             logger.debug("PresidioPiiDetector skipping empty prompt")
             return []
 
-        presidio_cfg: PiiPresidioEngineConfig = self._config.detection.pii.engines.presidio
-
-        # Build a mapping from Presidio entity type -> our PiiEntityConfig
-        entity_lookup: _PiiLookup = _build_entity_lookup(presidio_cfg.detectors or {})
-        if not entity_lookup:
+        if not self._plan.entities:
             # No PII entities are enabled -> no findings.
             logger.warning("PresidioPiiDetector has no enabled entities; skipping detection")
             return []
 
-        results: List[RecognizerResult] = self._analyzer.analyze(
+        if self._batcher is not None and not self._should_chunk(prompt):
+            return self._to_findings(prompt, self._batcher.submit(prompt))
+        if self._process_pool is not None:
+            return self._to_findings(prompt, self._process_pool.analyze(prompt))
+        return self._to_findings(prompt, self._analyze(prompt, context))
+
+    def detect_batch(self, prompts: Sequence[str]) -> List[List[Finding]]:
+        """Detect PII for several prompts with one batched spaCy pass.
+
+        Empty prompts are skipped and yield an empty findings list.
+        """
+        batch_findings: List[List[Finding]] = [[] for _ in prompts]
+
+        indices = [idx for idx, prompt in enumerate(prompts) if prompt]
+        if not indices:
+            return batch_findings
+
+        if not self._plan.entities:
+            logger.warning("PresidioPiiDetector has no enabled entities; skipping detection")
+            return batch_findings
+
+        texts = [prompts[idx] for idx in indices]
+        for idx, text, results in zip(indices, texts, self._analyze_texts(texts)):
+            batch_findings[idx] = self._to_findings(text, results)
+
+        return batch_findings
+
+    def batching_stats(self) -> BatchingStats | None:
+        """Batch counts and sizes of the micro-batcher; None when it is disabled."""
+        return self._batcher.stats() if self._batcher is not None else None
+
+    def _analyze_texts(self, texts: List[str]) -> List[Sequence[RecognizerResult | EntitySpan]]:
+        """Results for several non-empty prompts, in the worker processes if there are any."""
+        if self._process_pool is not None:
+            return self._process_pool.analyze_batch(texts)
+        return self._analyze_batch(texts)
+
+    def _analyze(self, prompt: str, context: PromptContext | None = None) -> List[RecognizerResult]:
+        """Presidio results for one non-empty prompt, in this process."""
+        if self._should_chunk(prompt):
+            return self._analyze_chunked(prompt)
+
+        presidio_cfg: PiiPresidioEngineConfig = self._config.detection.pii.engines.presidio
+        return self._analyzer.analyze(
             text=prompt,
             language=presidio_cfg.default_lang,
-            score_threshold=presidio_cfg.default_score_threshold,
+            entities=list(self._plan.entities),
+            score_threshold=self._plan.score_threshold,
+            nlp_artifacts=(
+                context.nlp_artifacts(self._analyzer.nlp_engine, presidio_cfg.default_lang)
+                if context is not None
+                else None
+            ),
+        )
+
+    def _analyze_batch(self, texts: Sequence[str]) -> List[List[RecognizerResult]]:
+        """Presidio results for several non-empty prompts, in this process."""
+        presidio_cfg: PiiPresidioEngineConfig = self._config.detection.pii.engines.presidio
+        batch_results: List[List[RecognizerResult]] = [[] for _ in texts]
+
+        # Long prompts are chunked one by one; the rest share one nlp.pipe pass
+        short_indices: List[int] = []
+        for idx, text in enumerate(texts):
+            if self._should_chunk(text):
+                batch_results[idx] = self._analyze_chunked(text)
+            else:
+                short_indices.append(idx)
+        if not short_indices:
+            return batch_results
+
+        piped = BatchAnalyzerEngine(analyzer_engine=self._analyzer).analyze_iterator(
+            texts=[texts[idx] for idx in short_indices],
+            language=presidio_cfg.default_lang,
+            batch_size=presidio_cfg.batch_size,
+            entities=list(self._plan.entities),
+            score_threshold=self._plan.score_threshold,
+        )
+        for idx, results in zip(short_indices, piped):
+            batch_results[idx] = results
+        return batch_results
+
+    def _should_chunk(self, prompt: str) -> bool:
+        return self._chunking.enabled and len(prompt) > self._chunking.min_chars
+
+    def _analyze_chunked(self, prompt: str) -> List[RecognizerResult]:
+        """Analyze overlapping chunks of ``prompt`` and merge them into prompt offsets."""
+        chunks = split_chunks(prompt, self._chunking.chunk_chars, self._chunking.overlap_chars)
+        texts = [prompt[chunk.start:chunk.end] for chunk in chunks]
+
+        chunk_pool = self._chunk_executor()
+        if chunk_pool is None:
+            chunk_results = [self._analyze_chunk(text) for text in texts]
+        else:
+            chunk_results = list(chunk_pool.map(self._analyze_chunk, texts))
+
+        logger.debug(
+            "PresidioPiiDetector analyzed a %d-char prompt in %d chunk(s)",
+            len(prompt),
+            len(chunks),
         )
+        return merge_chunk_results(chunks, chunk_results)
 
+    def _chunk_executor(self) -> ThreadPoolExecutor | None:
+        """This process's pool for the chunks of one prompt; None to analyze them in turn."""
+        if self._chunking.max_workers < 2:
+            return None
+        with self._chunk_pool_lock:
+            if self._chunk_pool is None or self._chunk_pool_pid != os.getpid():
+                # First use, or forked by the pre-fork server: the parent's pool threads do not exist here
+                self._chunk_pool = ThreadPoolExecutor(
+                    max_workers=self._chunking.max_workers, thread_name_prefix="presidio-chunk"
+                )
+                self._chunk_pool_pid = os.getpid()
+            return self._chunk_pool
+
+    def _analyze_chunk(self, text: str) -> List[RecognizerResult]:
+        return self._analyzer.analyze(
+            text=text,
+            language=self._config.detection.pii.engines.presidio.default_lang,
+            entities=list(self._plan.entities),
+            score_threshold=self._plan.score_threshold,
+        )
+
+    def _to_findings(self, prompt: str, results: Sequence[RecognizerResult | EntitySpan]) -> List[Finding]:
+        """Map Presidio results (or a worker's spans of them) to findings, applying per-entity thresholds."""
         findings: List[Finding] = []
 
         for result in results:
-            cfg: PiiPresidioDetectorConfig | None = entity_lookup.get(result.entity_type)
+            cfg: PiiPresidioDetectorConfig | None = self._plan.entity_lookup.get(result.entity_type)
             if cfg is None:
                 # Presidio entity not enabled in policy
                 continue
 
-            # Entity-specific score threshold, or fallback to global default
-            threshold: float = (
-                cfg.score_threshold
-                if cfg.score_threshold is not None
-                else presidio_cfg.default_score_threshold
-            )
-            if result.score < threshold:
+            # Entity-specific score threshold (already falls back to the engine default)
+            if result.score < self._plan.thresholds[result.entity_type]:
                 continue
 
             findings.append(
@@ -117,4 +263,18 @@ class PresidioPiiDetector(IDetector):
         return findings
 
     def warmup(self) -> None:
-        pass
+        """Start the worker processes when `process_pool` is enabled (also after a fork)."""
+        if self._process_pool is not None:
+            self._process_pool.start()
+
+    def close(self) -> None:
+        """Stop this process's batcher thread, worker processes and chunk threads; called when the pipeline is retired."""
+        if self._batcher is not None:
+            self._batcher.close()
+        if self._process_pool is not None:
+            self._process_pool.close()
+        with self._chunk_pool_lock:
+            chunk_pool, self._chunk_pool = self._chunk_pool, None
+            owned = self._chunk_pool_pid == os.getpid()
+        if chunk_pool is not None and owned:
+            chunk_pool.shutdown(wait=False)
@@ -1,45 +1,132 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import logging
+import re
+import threading
+from typing import Collection, Dict, List, Sequence, Tuple
+
+import spacy
+from pydantic import BaseModel
 from presidio_analyzer import AnalyzerEngine, EntityRecognizer, Pattern, PatternRecognizer, RecognizerRegistry
-from presidio_analyzer.nlp_engine import NlpEngineProvider, NlpEngine
+from presidio_analyzer.nlp_engine import NlpEngine, SpacyNlpEngine
 
-from core.config.models import InspectionConfig
+from core.config.models import InspectionConfig, PiiPresidioEngineConfig, RegexSafetyConfig
+from core.detectors.pii.presidio.plan import build_presidio_plan
+from core.detectors.regex_safety import compile_guarded
 
+logger = logging.getLogger(__name__)
 
-_ANALYZER: AnalyzerEngine | None = None
+
+# Last built analyzer and spaCy engine, each with the settings it was built
+# from. A config reload rebuilds the analyzer (recognizers, thresholds,
+# patterns) but keeps the spaCy engine while its model settings are unchanged.
+_ANALYZER: Tuple[str, AnalyzerEngine] | None = None
+_NLP_ENGINE: Tuple[Tuple[str, str, Tuple[str, ...]], NlpEngine] | None = None
+_CACHE_LOCK = threading.Lock()
+
+# spaCy pipeline package names end in their size, e.g. "en_core_web_lg"
+_MODEL_TIER_SUFFIX = re.compile(r"_(sm|md|lg|trf)$")
+
+# Rule-based lemmas are derived from these components' POS tags
+_LEMMATIZER_INPUTS = ("tagger", "attribute_ruler")
+
+
+class _PrunedSpacyNlpEngine(SpacyNlpEngine):
+    """SpacyNlpEngine that never loads the excluded pipeline components."""
+
+    def __init__(self, models: List[Dict[str, str]], exclude: Sequence[str]) -> None:
+        super().__init__(models=models)
+        self._exclude = list(exclude)
+
+    def load(self) -> None:
+        self._enable_gpu()
+
+        self.nlp = {}
+        for model in self.models:
+            self._validate_model_params(model)
+            self._download_spacy_model_if_needed(model["model_name"])
+            self.nlp[model["lang_code"]] = spacy.load(model["model_name"], exclude=self._exclude)
+
+
+def resolve_spacy_model(presidio_engine: PiiPresidioEngineConfig) -> str:
+    """Model to load: `default_spacy_model`, resized to `spacy_model_tier` if set."""
+    model_name = presidio_engine.default_spacy_model
+    tier = presidio_engine.spacy_model_tier
+    if tier is None:
+        return model_name
+
+    if not _MODEL_TIER_SUFFIX.search(model_name):
+        raise ValueError(
+            f"spacy_model_tier '{tier}' needs a sized default_spacy_model (e.g. 'en_core_web_lg'), "
+            f"got '{model_name}'"
+        )
+    return _MODEL_TIER_SUFFIX.sub(f"_{tier}", model_name)
 
 
 def get_presidio_analyzer(config: InspectionConfig) -> AnalyzerEngine:
-    """Create and cache a singleton Presidio AnalyzerEngine using the given config.
+    """Create and cache the Presidio AnalyzerEngine for the given config.
 
     - Reads language + model from policy config
     - Uses spaCy as NLP backend
-    - Loads Presidios predefined recognizers
+    - Loads Presidios predefined recognizers, pruned to the enabled entities
+    - Audits custom `patterns[].regex` and runs them on the bounded engine
+      from `runtime.regex` instead of Presidio's 60 s regex timeout
+
+    The analyzer is rebuilt only when the Presidio or regex settings change;
+    the loaded spaCy model is reused unless the model settings change too.
     """
     global _ANALYZER
 
-    if _ANALYZER is not None:
-        return _ANALYZER
-
     presidio_engine = config.detection.pii.engines.presidio
+    analyzer_key = _settings_digest(presidio_engine, config.runtime.regex)
+
+    with _CACHE_LOCK:
+        if _ANALYZER is not None and _ANALYZER[0] == analyzer_key:
+            return _ANALYZER[1]
+
+        analyzer = _build_analyzer(config, _get_nlp_engine(presidio_engine))
+        _ANALYZER = (analyzer_key, analyzer)
+        return analyzer
+
+
+def _settings_digest(*settings: BaseModel) -> str:
+    canonical = json.dumps([s.model_dump(mode="json") for s in settings], sort_keys=True)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
 
-    # Build NLP engine config for spaCy
-    nlp_configuration = {
-        "nlp_engine_name": "spacy",
-        "models": [
-            {
-                "lang_code": presidio_engine.default_lang,  
-                "model_name": presidio_engine.default_spacy_model,   
-            }
-        ],
-    }
-
-    # Create spaCy-based NLP engine via provider
-    provider = NlpEngineProvider(nlp_configuration=nlp_configuration)
-    nlp_engine: NlpEngine = provider.create_engine()
+def _get_nlp_engine(presidio_engine: PiiPresidioEngineConfig) -> NlpEngine:
+    """Loaded spaCy engine for the model settings; reused while they are unchanged (caller holds the lock)."""
+    global _NLP_ENGINE
+
+    model_key = (
+        presidio_engine.default_lang,
+        resolve_spacy_model(presidio_engine),
+        tuple(presidio_engine.spacy_exclude),
+    )
+    if _NLP_ENGINE is not None and _NLP_ENGINE[0] == model_key:
+        logger.info("Reusing loaded spaCy model '%s'", model_key[1])
+        return _NLP_ENGINE[1]
+
+    # spaCy NLP engine without the components Presidio never reads
+    nlp_engine: NlpEngine = _PrunedSpacyNlpEngine(
+        models=[{"lang_code": model_key[0], "model_name": model_key[1]}],
+        exclude=model_key[2],
+    )
+    nlp_engine.load()
+    _log_spacy_pipeline(nlp_engine, presidio_engine)
+
+    _NLP_ENGINE = (model_key, nlp_engine)
+    return nlp_engine
+
+
+def _build_analyzer(config: InspectionConfig, nlp_engine: NlpEngine) -> AnalyzerEngine:
+    presidio_engine = config.detection.pii.engines.presidio
 
     registry = RecognizerRegistry()
     registry.load_predefined_recognizers(nlp_engine=nlp_engine)
+    _prune_registry(registry, build_presidio_plan(presidio_engine).entities)
 
     for _, entity_cfg in (presidio_engine.detectors or {}).items():
         if not entity_cfg.enabled:
@@ -71,34 +158,90 @@ def get_presidio_analyzer(config: InspectionConfig) -> AnalyzerEngine:
             # add dedicated pattern recognizer if custom patterns are present
             if patterns:
                 registry.add_recognizer(
-                    PatternRecognizer(
-                        supported_entity=entity_type,
-                        supported_language=presidio_engine.default_lang,
-                        patterns=patterns,
-                        context=context_words,
+                    _guard_patterns(
+                        PatternRecognizer(
+                            supported_entity=entity_type,
+                            supported_language=presidio_engine.default_lang,
+                            patterns=patterns,
+                            context=context_words,
+                        ),
+                        config.runtime.regex,
                     )
                 )
         else:
             # create a minimal PatternRecognizer that only adds context
             if patterns or context_words:
                 registry.add_recognizer(
-                    PatternRecognizer(
-                        supported_entity=entity_type,
-                        supported_language=presidio_engine.default_lang,
-                        patterns=patterns,
-                        context=context_words,
+                    _guard_patterns(
+                        PatternRecognizer(
+                            supported_entity=entity_type,
+                            supported_language=presidio_engine.default_lang,
+                            patterns=patterns,
+                            context=context_words,
+                        ),
+                        config.runtime.regex,
                     )
                 )
 
-    analyzer = AnalyzerEngine(
+    return AnalyzerEngine(
         nlp_engine=nlp_engine,
         registry=registry,
         supported_languages=[presidio_engine.default_lang],
     )
 
-    _ANALYZER = analyzer
 
-    return analyzer
+def _log_spacy_pipeline(nlp_engine: NlpEngine, presidio_engine: PiiPresidioEngineConfig) -> None:
+    nlp = nlp_engine.get_nlp(presidio_engine.default_lang)
+    logger.info(
+        "spaCy model '%s' loaded with components %s (excluded: %s)",
+        resolve_spacy_model(presidio_engine),
+        nlp.pipe_names,
+        list(presidio_engine.spacy_exclude) or "none",
+    )
+    if "lemmatizer" in nlp.pipe_names and any(name not in nlp.pipe_names for name in _LEMMATIZER_INPUTS):
+        logger.warning(
+            "spaCy lemmatizer is loaded without %s; lemmas (used for PII context words) will be poor",
+            " + ".join(_LEMMATIZER_INPUTS),
+        )
+
+
+def _prune_registry(registry: RecognizerRegistry, entities: Collection[str]) -> None:
+    """Drop predefined recognizers that serve none of the enabled entities.
+
+    Keeps memory and per-call recognizer lookups proportional to the policy
+    rather than to Presidio's full catalogue (US_SSN, UK_NHS, crypto, ...).
+    """
+    enabled = set(entities)
+    loaded = len(registry.recognizers)
+    registry.recognizers = [r for r in registry.recognizers if enabled.intersection(r.supported_entities)]
+    logger.info(
+        "Presidio registry pruned to %d of %d predefined recognizer(s) for %d enabled entities",
+        len(registry.recognizers),
+        loaded,
+        len(enabled),
+    )
+
+
+def _guard_patterns(recognizer: PatternRecognizer, regex_cfg: RegexSafetyConfig) -> PatternRecognizer:
+    """Pre-compile the recognizer's custom patterns with `compile_guarded`.
+
+    PatternRecognizer only recompiles a pattern when its flags differ from
+    `compiled_with_flags`, so the bounded pattern is used as-is; a timeout
+    surfaces as TimeoutError, which Presidio logs and skips.
+    """
+    flags = int(recognizer.global_regex_flags or 0)
+    for pattern in recognizer.patterns:
+        pattern.compiled_regex = compile_guarded(
+            pattern.regex, flags, regex_cfg, f"PII pattern '{pattern.name}'"
+        )
+        pattern.compiled_with_flags = recognizer.global_regex_flags
+    return recognizer
+
+
+def load_nlp_engine(config: InspectionConfig) -> NlpEngine:
+    """Load (or reuse) the spaCy engine alone, so startup can time it apart from the registry build."""
+    with _CACHE_LOCK:
+        return _get_nlp_engine(config.detection.pii.engines.presidio)
 
 
 def warmup_analyzer(config: InspectionConfig) -> None:
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+from core.config.models import PiiPresidioDetectorConfig, PiiPresidioEngineConfig
+
+
+@dataclass(frozen=True)
+class PresidioPlan:
+    """What Presidio has to run for the enabled PII entities, resolved once.
+
+    - entities:        passed as `entities=` so only recognizers serving
+                       an enabled entity run per call
+    - entity_lookup:   Presidio entity type -> enabled detector config
+    - thresholds:      effective score threshold per entity type
+    - score_threshold: floor handed to Presidio (lowest entity threshold),
+                       so results no entity could report are dropped there
+    """
+    entities: Tuple[str, ...]
+    entity_lookup: Mapping[str, PiiPresidioDetectorConfig]
+    thresholds: Mapping[str, float]
+    score_threshold: float
+
+
+def build_presidio_plan(presidio_cfg: PiiPresidioEngineConfig) -> PresidioPlan:
+    """Plan analysis from the enabled `PiiPresidioDetectorConfig` entries only."""
+    entity_lookup: Dict[str, PiiPresidioDetectorConfig] = {
+        cfg.presidio_type: cfg
+        for cfg in (presidio_cfg.detectors or {}).values()
+        if cfg.enabled
+    }
+    thresholds: Dict[str, float] = {
+        entity: (
+            cfg.score_threshold
+            if cfg.score_threshold is not None
+            else presidio_cfg.default_score_threshold
+        )
+        for entity, cfg in entity_lookup.items()
+    }
+
+    return PresidioPlan(
+        entities=tuple(entity_lookup),
+        entity_lookup=entity_lookup,
+        thresholds=thresholds,
+        score_threshold=min(thresholds.values(), default=presidio_cfg.default_score_threshold),
+    )
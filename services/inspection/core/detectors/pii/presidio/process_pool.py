@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import logging
+import math
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import TYPE_CHECKING, Any, Callable, List, NamedTuple, Sequence, TypeVar
+
+from core.config.loader import with_presidio_settings
+from core.config.models import InspectionConfig, PiiPresidioProcessPoolConfig
+
+if TYPE_CHECKING:
+    from presidio_analyzer import RecognizerResult
+
+    from core.detectors.pii.presidio.detector import PresidioPiiDetector
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Run once by every worker before it takes requests
+_WARMUP_PROMPT = "Reach Jane Doe at jane.doe@example.com or +1 212 555 0100, she is based in Berlin."
+
+
+class EntitySpan(NamedTuple):
+    """A Presidio result as a worker sends it back: the fields findings are built from."""
+    entity_type: str
+    start: int
+    end: int
+    score: float
+
+
+class PresidioProcessPool:
+    """
+    Presidio analysis in pre-warmed worker processes, off the serving GIL.
+
+    - workers are spawned, not forked (the serving process runs threads);
+      each builds its own analyzer and spaCy model from the config and runs
+      a warmup prompt before `start()` returns
+    - prompts go out as plain strings and results come back as
+      `EntitySpan` tuples; the caller maps them to findings
+    - batches are split into one contiguous slice per worker
+    - a pool whose worker died (OOM kill, crash) is replaced and the call
+      retried once
+    - a process forked from the owner (pre-fork server) starts its own
+      workers on `start()`; the parent's pool is not usable there
+    """
+
+    def __init__(self, config: InspectionConfig, pool_cfg: PiiPresidioProcessPoolConfig) -> None:
+        self._config_data = config.model_dump(mode="json")
+        self._cfg = pool_cfg
+        self._lock = threading.Lock()
+        self._executor: ProcessPoolExecutor | None = None
+        self._owner_pid: int | None = None
+
+    @property
+    def workers(self) -> int:
+        return self._cfg.workers
+
+    def start(self) -> None:
+        """Spawn and warm the workers unless this process already has them."""
+        self._ensure_started()
+
+    def analyze(self, text: str) -> List[EntitySpan]:
+        return self._call(lambda executor: executor.submit(_analyze, text).result())
+
+    def analyze_batch(self, texts: Sequence[str]) -> List[List[EntitySpan]]:
+        size = math.ceil(len(texts) / self._cfg.workers)
+        slices = [list(texts[i:i + size]) for i in range(0, len(texts), size)]
+
+        def call(executor: ProcessPoolExecutor) -> List[List[EntitySpan]]:
+            futures = [executor.submit(_analyze_batch, part) for part in slices]
+            return [spans for future in futures for spans in future.result()]
+
+        return self._call(call) if texts else []
+
+    def close(self) -> None:
+        """Stop this process's workers; a later `start()` spawns new ones."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            owned = self._owner_pid == os.getpid()
+        if executor is not None and owned:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _call(self, call: Callable[[ProcessPoolExecutor], T]) -> T:
+        executor = self._ensure_started()
+        try:
+            return call(executor)
+        except BrokenProcessPool:
+            logger.error("Presidio worker process died; replacing the process pool and retrying")
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            executor.shutdown(wait=False, cancel_futures=True)
+            return call(self._ensure_started())
+
+    def _ensure_started(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None or self._owner_pid != os.getpid():
+                self._executor = self._spawn()
+                self._owner_pid = os.getpid()
+            return self._executor
+
+    def _spawn(self) -> ProcessPoolExecutor:
+        started = time.perf_counter()
+        deadline = started + self._cfg.startup_timeout_seconds
+        executor = ProcessPoolExecutor(
+            max_workers=self._cfg.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self._config_data,),
+        )
+        try:
+            # A worker takes tasks only once its initializer (model load +
+            # warmup) has finished, so a reply from every pid means all are warm
+            ready: set[int] = set()
+            while len(ready) < self._cfg.workers:
+                futures = [executor.submit(os.getpid) for _ in range(self._cfg.workers)]
+                done, _ = wait(futures, timeout=max(deadline - time.perf_counter(), 0.0))
+                if len(done) < len(futures):
+                    raise TimeoutError(
+                        f"Presidio process pool: {len(ready)} of {self._cfg.workers} worker(s) ready "
+                        f"after {self._cfg.startup_timeout_seconds:.0f}s"
+                    )
+                ready.update(future.result() for future in done)
+                if len(ready) < self._cfg.workers:
+                    time.sleep(0.05)
+        except BaseException:
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+        logger.info(
+            "Presidio process pool: %d worker(s) ready in %.0f ms",
+            self._cfg.workers,
+            (time.perf_counter() - started) * 1000.0,
+        )
+        return executor
+
+
+# ---------- worker process ----------
+
+_WORKER_DETECTOR: PresidioPiiDetector | None = None
+
+
+def _init_worker(config_data: dict[str, Any]) -> None:
+    global _WORKER_DETECTOR
+    from core.detectors.pii.presidio.detector import PresidioPiiDetector
+
+    config = InspectionConfig.model_validate(config_data)
+    _WORKER_DETECTOR = PresidioPiiDetector(_in_process(config))
+    _WORKER_DETECTOR.detect(_WARMUP_PROMPT)
+
+
+def _analyze(text: str) -> List[EntitySpan]:
+    return _to_spans(_WORKER_DETECTOR._analyze(text))
+
+
+def _analyze_batch(texts: List[str]) -> List[List[EntitySpan]]:
+    return [_to_spans(results) for results in _WORKER_DETECTOR._analyze_batch(texts)]
+
+
+def _to_spans(results: List[RecognizerResult]) -> List[EntitySpan]:
+    return [EntitySpan(r.entity_type, r.start, r.end, r.score) for r in results]
+
+
+def _in_process(config: InspectionConfig) -> InspectionConfig:
+    """``config`` with the process pool disabled: what a worker runs itself."""
+    return with_presidio_settings(config, process_pool={"enabled": False})
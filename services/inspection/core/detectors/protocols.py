@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from typing import Protocol, runtime_checkable
+from typing import Protocol, Sequence, runtime_checkable
 
+from core.detectors.context import PromptContext
 from core.models import Finding
 
 
@@ -34,6 +35,43 @@ class IDetector(Protocol):
         ...
 
 
+@runtime_checkable
+class IContextDetector(IDetector, Protocol):
+    """Detector that reads the shared :class:`PromptContext` of a request.
+
+    The rule engine builds one context per prompt and hands it to every
+    context-aware detector, so line splitting, case folding and the spaCy
+    pass run once per request instead of once per detector. Detectors
+    without this protocol keep receiving the plain prompt string, and
+    :meth:`IDetector.detect` stays available for direct callers.
+    """
+
+    def detect_context(self, context: PromptContext) -> list[Finding]:
+        """Analyze ``context.text`` and return all findings.
+
+        Must return the same findings as ``detect(context.text)``.
+        """
+        ...
+
+
+@runtime_checkable
+class IBatchDetector(IDetector, Protocol):
+    """Detector that can analyze several prompts in one call.
+
+    Batch-aware detectors amortize per-call setup (settings, NLP pipelines,
+    locks) across all prompts of a batch. The rule engine falls back to
+    calling :meth:`IDetector.detect` once per prompt for detectors that do
+    not implement this protocol.
+    """
+
+    def detect_batch(self, prompts: Sequence[str]) -> list[list[Finding]]:
+        """Analyze all prompts and return one findings list per prompt.
+
+        The returned list must have the same length and order as ``prompts``.
+        """
+        ...
+
+
 class IPiiDetector(IDetector, Protocol):
     """Marker protocol for detectors that focus on PII findings.
 
@@ -0,0 +1,395 @@
+from __future__ import annotations
+
+import logging
+import re
+from dataclasses import dataclass
+from re import _constants as sre_constants, _parser as sre_parse
+from typing import Any, FrozenSet, Iterator, List, Literal, Optional, Tuple
+
+import regex
+
+from core.config.models import RegexSafetyConfig
+
+try:  # optional: linear-time matching via google-re2
+    import re2
+except ImportError:  # pragma: no cover - depends on the deployment
+    re2 = None
+
+logger = logging.getLogger(__name__)
+
+
+AuditSeverity = Literal["exponential", "polynomial"]
+
+
+@dataclass(frozen=True)
+class RegexAuditIssue:
+    """One backtracking hazard found by :func:`audit_regex`."""
+    severity: AuditSeverity
+    reason: str
+
+
+class RegexTimeoutError(TimeoutError):
+    """A backtracking match exceeded its time budget.
+
+    Subclasses TimeoutError, which is what Presidio's PatternRecognizer
+    catches for its own regex timeouts.
+    """
+
+    def __init__(self, pattern: "BoundedPattern", timeout: float) -> None:
+        super().__init__(f"regex {pattern.pattern!r} exceeded its {timeout * 1000:.0f} ms budget")
+        self.pattern = pattern
+        self.timeout = timeout
+
+
+class BoundedPattern:
+    """
+    Compiled regex whose matching cost is bounded, for untrusted input.
+
+    - ``re2``: RE2 automaton, linear in the input; no lookaround/backrefs,
+      and ``\\d``/``\\w``/``\\s`` are ASCII-only
+    - ``backtracking``: the `regex` module (re-compatible syntax) with a
+      per-call timeout; raises :class:`RegexTimeoutError` when exceeded
+
+    Exposes ``pattern``/``flags`` like `re.Pattern`, so literal extraction
+    (`required_literals`) works on it unchanged.
+    """
+
+    def __init__(self, pattern: str, flags: int, compiled: Any, engine: str, timeout: float) -> None:
+        self.pattern = pattern
+        self.flags = flags
+        self._compiled = compiled
+        self._engine = engine
+        self._timeout = timeout
+
+    @property
+    def engine(self) -> str:
+        return self._engine
+
+    def search(self, text: str, pos: int = 0) -> Any:
+        if self._engine == "re2":
+            return self._compiled.search(text, pos)
+        try:
+            return self._compiled.search(text, pos, timeout=self._timeout, concurrent=True)
+        except TimeoutError as exc:
+            raise RegexTimeoutError(self, self._timeout) from exc
+
+    def finditer(self, text: str, pos: int = 0, timeout: Optional[float] = None) -> Iterator[Any]:
+        """Like `re.Pattern.finditer`; a caller ``timeout`` can only tighten the budget."""
+        if self._engine == "re2":
+            yield from self._compiled.finditer(text, pos)
+            return
+
+        budget = self._timeout if timeout is None else min(timeout, self._timeout)
+        try:
+            yield from self._compiled.finditer(text, pos, timeout=budget, concurrent=True)
+        except TimeoutError as exc:
+            raise RegexTimeoutError(self, budget) from exc
+
+
+def compile_guarded(pattern: str, flags: int, cfg: RegexSafetyConfig, label: str) -> BoundedPattern:
+    """Audit ``pattern`` and compile it for the configured engine.
+
+    Exponential-backtracking patterns are rejected with ValueError (or only
+    logged with ``on_unsafe_pattern: warn``); polynomial ones are logged
+    when they end up on the backtracking engine.
+    """
+    if cfg.engine == "re2" and re2 is None:
+        raise ValueError(
+            "runtime.regex.engine is 're2' but the optional 'google-re2' package is not installed"
+        )
+
+    compiled = _compile_re2(pattern, flags) if cfg.engine != "backtracking" else None
+    if compiled is None and cfg.engine == "re2":
+        logger.warning("%s is not RE2-compatible; using the backtracking engine: %r", label, pattern)
+
+    for issue in audit_regex(pattern, flags):
+        message = f"{label} risks {issue.severity} backtracking ({issue.reason}): {pattern!r}"
+        if issue.severity == "exponential" and cfg.on_unsafe_pattern == "reject":
+            raise ValueError(message + "; set runtime.regex.on_unsafe_pattern=warn to accept it")
+        if compiled is None:
+            logger.warning(message)
+        else:
+            logger.info("%s; runs on RE2, so matching stays linear", message)
+
+    if compiled is not None:
+        return BoundedPattern(pattern, flags, compiled, "re2", cfg.match_timeout_ms / 1000.0)
+    return BoundedPattern(
+        pattern, flags, regex.compile(pattern, flags), "backtracking", cfg.match_timeout_ms / 1000.0
+    )
+
+
+# RE2 understands these as inline flags; any other flag means "not portable".
+_RE2_INLINE_FLAGS = ((re.IGNORECASE, "i"), (re.MULTILINE, "m"), (re.DOTALL, "s"))
+_RE2_IGNORED_FLAGS = re.UNICODE
+
+
+def _compile_re2(pattern: str, flags: int) -> Any:
+    if re2 is None:
+        return None
+
+    inline = "".join(letter for flag, letter in _RE2_INLINE_FLAGS if flags & flag)
+    if flags & ~(_RE2_IGNORED_FLAGS | re.IGNORECASE | re.MULTILINE | re.DOTALL):
+        return None
+    try:
+        return re2.compile(f"(?{inline}){pattern}" if inline else pattern)
+    except re2.error:
+        return None
+
+
+# ---------- Static audit ----------
+
+# Character sets are approximated over ASCII plus one stand-in for "any
+# non-ASCII character"; precise enough to tell classes apart.
+_NON_ASCII = -1
+_ALL: FrozenSet[int] = frozenset(range(128)) | {_NON_ASCII}
+# Classes at least this large count as wildcards (".", "[^x]", "\S", ...).
+_WILDCARD_SIZE = 100
+
+_CATEGORIES = {
+    sre_constants.CATEGORY_DIGIT: frozenset(ord(c) for c in "0123456789") | {_NON_ASCII},
+    sre_constants.CATEGORY_WORD: frozenset(
+        i for i in range(128) if chr(i).isalnum() or chr(i) == "_"
+    ) | {_NON_ASCII},
+    # Unicode spaces are rare enough to ignore; keeps `\s*\w+` apart
+    sre_constants.CATEGORY_SPACE: frozenset(ord(c) for c in " \t\n\r\f\v"),
+}
+_CATEGORIES.update({
+    sre_constants.CATEGORY_NOT_DIGIT: _ALL - _CATEGORIES[sre_constants.CATEGORY_DIGIT] | {_NON_ASCII},
+    sre_constants.CATEGORY_NOT_WORD: _ALL - _CATEGORIES[sre_constants.CATEGORY_WORD] | {_NON_ASCII},
+    sre_constants.CATEGORY_NOT_SPACE: _ALL - _CATEGORIES[sre_constants.CATEGORY_SPACE] | {_NON_ASCII},
+})
+
+_REPEATS = (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT, sre_constants.POSSESSIVE_REPEAT)
+
+
+def audit_regex(pattern: str, flags: int = 0) -> List[RegexAuditIssue]:
+    """Report structures that make a backtracking engine super-linear.
+
+    A heuristic in the spirit of star-height checks, not a proof:
+
+    - exponential: an unbounded repeat inside another one, or an
+      alternation with overlapping branches inside one, unless each
+      iteration must consume a character the inner part cannot
+      (``(\\s*,\\s*\\w+)*`` is fine, ``(\\w+\\s?)+`` is not)
+    - polynomial: two unbounded repeats that can trade characters
+      (``\\d+\\d+``, ``.*x.*``), or an unbounded wildcard followed by
+      required text (``a.*b``), which rescans the rest of the line from
+      every candidate start
+    """
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except (re.error, OverflowError):
+        # regex-module-only syntax; nothing to audit with the re parser
+        logger.debug("Regex audit skipped, pattern not parseable by re: %r", pattern)
+        return []
+
+    issues: List[RegexAuditIssue] = []
+    _audit_seq(list(parsed), issues)
+    # One report per kind is enough to act on
+    unique = {(issue.severity, issue.reason): issue for issue in issues}
+    return list(unique.values())
+
+
+def _audit_seq(items: List[Tuple[Any, Any]], issues: List[RegexAuditIssue]) -> None:
+    for idx, (op, av) in enumerate(items):
+        if op in _REPEATS:
+            _, high, body = av
+            if high == sre_constants.MAXREPEAT:
+                _audit_repeat_body(list(body), issues)
+                _audit_following(items, idx, issues)
+            _audit_seq(list(body), issues)
+        elif op is sre_constants.SUBPATTERN:
+            _audit_seq(list(av[-1]), issues)
+        elif op is sre_constants.ATOMIC_GROUP:
+            # atomic groups never backtrack into their body
+            continue
+        elif op is sre_constants.BRANCH:
+            for alternative in av[1]:
+                _audit_seq(list(alternative), issues)
+        elif op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+            _audit_seq(list(av[1]), issues)
+
+
+def _audit_repeat_body(body: List[Tuple[Any, Any]], issues: List[RegexAuditIssue]) -> None:
+    """A variable-width part of a repeated body without a separator lets
+    one input split into iterations in exponentially many ways.
+
+    A body that can match the empty string never has a separator, so any
+    quantifier or optional branch in it is reported (``(a*)*``, ``(a|a?)+``).
+    """
+    for op, av in _variable_items(body):
+        if not _has_separator(body, _chars_item(op, av)):
+            reason = "nested quantifier" if op in _REPEATS else "ambiguous alternation in a quantifier"
+            issues.append(RegexAuditIssue("exponential", reason))
+            return
+    _audit_branches(body, issues)
+
+
+def _variable_items(items: List[Tuple[Any, Any]]) -> Iterator[Tuple[Any, Any]]:
+    """Items of ``items`` (looking into groups) that can match different lengths."""
+    for op, av in items:
+        if op is sre_constants.SUBPATTERN:
+            yield from _variable_items(list(av[-1]))
+        elif op in _REPEATS:
+            body_low, body_high = av[2].getwidth()
+            if av[0] != av[1] or body_low != body_high:
+                yield op, av
+        elif op is sre_constants.BRANCH:
+            widths = [alternative.getwidth() for alternative in av[1]]
+            if min(low for low, _ in widths) != max(high for _, high in widths):
+                yield op, av
+        elif op is sre_constants.GROUPREF:
+            yield op, av
+
+
+def _audit_following(items: List[Tuple[Any, Any]], idx: int, issues: List[RegexAuditIssue]) -> None:
+    """Check what follows the unbounded repeat ``items[idx]`` in its sequence."""
+    op, (_, _, body) = items[idx]
+    if op is sre_constants.POSSESSIVE_REPEAT:
+        return
+    chars = _chars_seq(list(body))
+
+    rest = items[idx + 1:]
+    if len(chars) >= _WILDCARD_SIZE and not _nullable_seq(rest):
+        issues.append(RegexAuditIssue("polynomial", "unbounded wildcard before required text"))
+
+    for next_op, next_av in rest:
+        if next_op in _REPEATS and next_av[1] == sre_constants.MAXREPEAT:
+            if chars & _first_seq(list(next_av[2])):
+                issues.append(RegexAuditIssue("polynomial", "adjacent overlapping quantifiers"))
+            return
+        # Optional items, or text the first repeat could also consume, keep them adjacent
+        if not _nullable_item(next_op, next_av) and not _chars_item(next_op, next_av) <= chars:
+            return
+
+
+def _audit_branches(body: List[Tuple[Any, Any]], issues: List[RegexAuditIssue]) -> None:
+    """Alternatives that can start with the same character, repeated without a separator."""
+    for op, av in body:
+        if op is sre_constants.SUBPATTERN:
+            _audit_branches(list(av[-1]), issues)
+            continue
+        if op is not sre_constants.BRANCH:
+            continue
+        firsts = [_first_seq(list(alternative)) for alternative in av[1]]
+        for i, first in enumerate(firsts):
+            if any(first & other for other in firsts[i + 1:]):
+                branch_chars = frozenset().union(*(_chars_seq(list(alt)) for alt in av[1]))
+                if not _has_separator(body, branch_chars, skip=av):
+                    issues.append(RegexAuditIssue("exponential", "overlapping alternation in a quantifier"))
+                return
+
+
+def _has_separator(body: List[Tuple[Any, Any]], inner: FrozenSet[int], skip: Any = None) -> bool:
+    """True if ``body`` always consumes a character outside ``inner``."""
+    for op, av in body:
+        if av is skip:
+            continue
+        if op is sre_constants.SUBPATTERN:
+            if _has_separator(list(av[-1]), inner, skip):
+                return True
+            continue
+        if _nullable_item(op, av):
+            continue
+        if not _chars_item(op, av) & inner:
+            return True
+    return False
+
+
+# ---------- Character-set helpers ----------
+
+def _fold(code: int) -> FrozenSet[int]:
+    if code >= 128:
+        return frozenset({_NON_ASCII})
+    char = chr(code)
+    return frozenset({ord(char.lower()), ord(char.upper())} & set(range(128)) | {code})
+
+
+def _chars_item(op: Any, av: Any) -> FrozenSet[int]:
+    """Every character ``(op, av)`` can consume (over-approximated)."""
+    if op is sre_constants.LITERAL:
+        return _fold(av)
+    if op is sre_constants.NOT_LITERAL:
+        return _ALL - _fold(av) | {_NON_ASCII}
+    if op is sre_constants.ANY:
+        return _ALL
+    if op is sre_constants.IN:
+        return _chars_in(av)
+    if op in _REPEATS:
+        return _chars_seq(list(av[2]))
+    if op is sre_constants.SUBPATTERN:
+        return _chars_seq(list(av[-1]))
+    if op is sre_constants.ATOMIC_GROUP:
+        return _chars_seq(list(av))
+    if op is sre_constants.BRANCH:
+        return frozenset().union(*(_chars_seq(list(alt)) for alt in av[1]))
+    if op in (sre_constants.AT, sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+        return frozenset()
+    return _ALL
+
+
+def _chars_seq(items: List[Tuple[Any, Any]]) -> FrozenSet[int]:
+    return frozenset().union(*(_chars_item(op, av) for op, av in items))
+
+
+def _chars_in(items: List[Tuple[Any, Any]]) -> FrozenSet[int]:
+    chars: set[int] = set()
+    negate = False
+    for op, av in items:
+        if op is sre_constants.NEGATE:
+            negate = True
+        elif op is sre_constants.LITERAL:
+            chars |= _fold(av)
+        elif op is sre_constants.RANGE:
+            low, high = av
+            for code in range(low, min(high, 127) + 1):
+                chars |= _fold(code)
+            if high >= 128:
+                chars.add(_NON_ASCII)
+        elif op is sre_constants.CATEGORY:
+            chars |= _CATEGORIES.get(av, _ALL)
+        else:
+            chars |= _ALL
+    if negate:
+        return _ALL - chars | {_NON_ASCII}
+    return frozenset(chars)
+
+
+def _first_seq(items: List[Tuple[Any, Any]]) -> FrozenSet[int]:
+    """Characters a match of ``items`` can start with."""
+    first: FrozenSet[int] = frozenset()
+    for op, av in items:
+        first |= _first_item(op, av)
+        if not _nullable_item(op, av):
+            break
+    return first
+
+
+def _first_item(op: Any, av: Any) -> FrozenSet[int]:
+    if op in _REPEATS:
+        return _first_seq(list(av[2]))
+    if op is sre_constants.SUBPATTERN:
+        return _first_seq(list(av[-1]))
+    if op is sre_constants.ATOMIC_GROUP:
+        return _first_seq(list(av))
+    if op is sre_constants.BRANCH:
+        return frozenset().union(*(_first_seq(list(alt)) for alt in av[1]))
+    return _chars_item(op, av)
+
+
+def _nullable_item(op: Any, av: Any) -> bool:
+    if op in _REPEATS:
+        return av[0] == 0 or _nullable_seq(list(av[2]))
+    if op is sre_constants.SUBPATTERN:
+        return _nullable_seq(list(av[-1]))
+    if op is sre_constants.ATOMIC_GROUP:
+        return _nullable_seq(list(av))
+    if op is sre_constants.BRANCH:
+        return any(_nullable_seq(list(alt)) for alt in av[1])
+    if op in (sre_constants.AT, sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+        return True
+    return op is sre_constants.GROUPREF
+
+
+def _nullable_seq(items: List[Tuple[Any, Any]]) -> bool:
+    return all(_nullable_item(op, av) for op, av in items)
@@ -1,16 +1,15 @@
 from __future__ import annotations
 
 import logging
-from typing import List, Tuple, Dict, Any
+from typing import List, Sequence, Tuple, Dict, Any
 from dataclasses import dataclass
-from threading import Lock
 
-from detect_secrets.core.scan import scan_line
-from detect_secrets.settings import transient_settings
-
-from core.detectors.protocols import ISecretDetector
+from core.detectors.patterns import KeywordPrefilter, PrefilterStats
+from core.detectors.context import PromptContext
+from core.detectors.protocols import IBatchDetector, IContextDetector, ISecretDetector
+from core.detectors.secret.detectsecret.scanner import PrebuiltSecretScanner
 from core.models import Finding
-from core.config.models import InspectionConfig, SecretDetectSecretEngineConfig  
+from core.config.models import InspectionConfig, SecretDetectSecretEngineConfig, SecretScanEngine
 
 logger = logging.getLogger(__name__)
 
@@ -23,15 +22,15 @@ class _SecretRuleRuntime:
     plugin_name: str  
 
 
-# detect-secrets mutates global settings; guard with a process-wide lock
-_DETECT_SECRETS_GLOBAL_LOCK = Lock()
-
-
 def _build_runtime_rules(
     engine_cfg: SecretDetectSecretEngineConfig,
+    scan_engine: SecretScanEngine = "detect_secrets",
 ) -> Tuple[Dict[str, _SecretRuleRuntime], Dict[str, Any], Tuple[str, ...]]:
     """Build runtime lookup tables for detect-secrets.
 
+    Only enabled rules whose `engine` equals ``scan_engine`` are included, so
+    each scan engine sees exactly the rules migrated to it.
+
     Returns:
       - rules_by_plugin: lookup by plugin type (e.g. "AWSKeyDetector") -> rule
       - settings: detect-secrets settings dict for `transient_settings()`
@@ -48,7 +47,7 @@ def _build_runtime_rules(
     filters_disabled: Tuple[str, ...] = ()
 
     for cfg in engine_cfg.detectors.values():
-        if not cfg.enabled:
+        if not cfg.enabled or cfg.engine != scan_engine:
             continue
 
         rule = _SecretRuleRuntime(
@@ -79,13 +78,17 @@ def _build_runtime_rules(
     return rules_by_plugin, settings, filters_disabled
 
 
-class DetectSecretsDetector(ISecretDetector):
+class DetectSecretsDetector(ISecretDetector, IContextDetector, IBatchDetector):
     """
     Adapter around `detect-secrets` to scan a single prompt string.
 
     - Uses config-driven rules (SecretDetectSecretEngineConfig)
     - Maps detect-secrets plugin outputs to internal Finding objects
-    - Thread-safe: guarded by a process-wide lock because detect-secrets settings are global.
+    - Thread-safe without locking: plugins and filters are resolved once into a
+      `PrebuiltSecretScanner`, so scans never touch detect-secrets' global settings.
+    - A `KeywordPrefilter` skips plugins whose regexes cannot match a line
+      (e.g. no "akia"/"asia" means no AWS key), so prose lines cost one
+      literal search instead of one regex pass per plugin.
     """
 
     def __init__(self, config: InspectionConfig) -> None:
@@ -96,74 +99,127 @@ class DetectSecretsDetector(ISecretDetector):
             "DetectSecretsDetector initialized with %d enabled rule(s)",
             len(self._rules_by_plugin),
         )
+        self._scanner = PrebuiltSecretScanner.build(self._settings, self._disabled_filters)
+
+        # Keyed by plugin index; plugins without a denylist (keyword and
+        # entropy detectors) have no literals and are always scanned.
+        self._prefilter: KeywordPrefilter[int] = KeywordPrefilter(
+            {idx: getattr(plugin, "denylist", ()) for idx, plugin in enumerate(self._scanner.plugins)}
+        )
+        logger.info(
+            "DetectSecretsDetector prefilter gates %d of %d plugin(s) on %d keyword(s)",
+            self._prefilter.gated_keys,
+            len(self._scanner.plugins),
+            self._prefilter.literals,
+        )
 
     def warmup(self) -> None:
-        """Warmup hook to ensure rules are built."""
-        _ = self._rules_by_plugin
+        """Warmup hook: run one scan so plugin regexes and filter caches are hot."""
+        self._scan_prompt(PromptContext("warmup"))
 
     def detect(self, prompt: str) -> List[Finding]:
         """Run detect-secrets on the given prompt and return mapped findings."""
-        if not prompt:
+        return self.detect_context(PromptContext(prompt))
+
+    def detect_context(self, context: PromptContext) -> List[Finding]:
+        """Run detect-secrets on the shared lines of the prompt."""
+        if not context.text:
             logger.debug("DetectSecretsDetector skipping empty prompt")
             return []
 
+        if not self._rules_by_plugin:
+            return []
+
+        findings = self._scan_prompt(context)
+        self._log_findings(findings)
+        return findings
+
+    def detect_batch(self, prompts: Sequence[str]) -> List[List[Finding]]:
+        """Run detect-secrets on several prompts."""
+        results: List[List[Finding]] = [[] for _ in prompts]
+        if not self._rules_by_plugin:
+            return results
+
+        for idx, prompt in enumerate(prompts):
+            if prompt:
+                results[idx] = self._scan_prompt(PromptContext(prompt))
+
+        for findings in results:
+            self._log_findings(findings)
+
+        return results
+
+    def prefilter_stats(self) -> PrefilterStats:
+        """Cumulative line/plugin skip counters of the keyword prefilter."""
+        return self._prefilter.stats()
+
+    def _scan_prompt(self, context: PromptContext) -> List[Finding]:
+        """Scan a prompt line by line with the prebuilt scanner."""
         findings: List[Finding] = []
 
-        # Apply detect-secrets settings only for this call; guard with a process-wide lock
-        # because detect-secrets mutates global settings.
-        with _DETECT_SECRETS_GLOBAL_LOCK:
-            with transient_settings(self._settings) as settings:
-                # Disable only the configured filters (blacklist-style).
-                # Note: detect-secrets mutates global settings, so this must remain inside
-                # the transient_settings scope and guarded by the global lock.
-                if self._disabled_filters:
-                    settings.disable_filters(*self._disabled_filters)
-
-                # scan_line() is line-oriented; scan per line and keep accurate offsets
-                offset = 0
-                for raw_line in prompt.splitlines(keepends=True):
-                    # Preserve offsets including newline characters
-                    line_for_scan = raw_line.rstrip("\r\n")
-
-                    secrets_iter = scan_line(line=line_for_scan)
-                    for secret in secrets_iter:
-                        plugin_type = secret.type  # e.g. "AWSKeyDetector"
-
-                        rule = self._rules_by_plugin.get(plugin_type)
-                        if rule is None:
-                            continue
-
-                        # Best effort: try to locate the detected secret value inside the line
-                        secret_value = getattr(secret, "secret_value", None)
-
-                        if secret_value:
-                            idx = line_for_scan.find(secret_value)
-                            if idx != -1:
-                                start = offset + idx
-                                end = start + len(secret_value)
-                            else:
-                                # fallback: mark the whole line (but not the whole prompt)
-                                start = offset
-                                end = offset + len(line_for_scan)
-                        else:
-                            # fallback: mark the whole line (but not the whole prompt)
-                            start = offset
-                            end = offset + len(line_for_scan)
-
-                        findings.append(
-                            Finding(
-                                type=rule.id,
-                                start=start,
-                                end=end,
-                                snippet="***",
-                                message=f"Secret detected: {plugin_type}",
-                                severity=rule.severity,
-                                confidence=1.0,
-                            )
-                        )
-
-                    offset += len(raw_line)
+        plugin_count = len(self._scanner.plugins)
+        lines = lines_skipped = checks_skipped = 0
+
+        # scan_line() is line-oriented; the context keeps each line's prompt offset
+        for (offset, line_for_scan), folded in zip(context.lines, context.folded_lines):
+            lines += 1
+
+            candidates = self._prefilter.candidates(line_for_scan, folded)
+            checks_skipped += plugin_count - len(candidates)
+            if not candidates:
+                lines_skipped += 1
+                continue
+
+            plugins = [self._scanner.plugins[idx] for idx in candidates]
+            secrets_iter = self._scanner.scan_line(line_for_scan, plugins=plugins)
+            for secret in secrets_iter:
+                plugin_type = secret.type  # e.g. "AWSKeyDetector"
+
+                rule = self._rules_by_plugin.get(plugin_type)
+                if rule is None:
+                    continue
+
+                # Best effort: try to locate the detected secret value inside the line
+                secret_value = getattr(secret, "secret_value", None)
+
+                if secret_value:
+                    idx = line_for_scan.find(secret_value)
+                    if idx != -1:
+                        start = offset + idx
+                        end = start + len(secret_value)
+                    else:
+                        # fallback: mark the whole line (but not the whole prompt)
+                        start = offset
+                        end = offset + len(line_for_scan)
+                else:
+                    # fallback: mark the whole line (but not the whole prompt)
+                    start = offset
+                    end = offset + len(line_for_scan)
+
+                findings.append(
+                    Finding(
+                        type=rule.id,
+                        start=start,
+                        end=end,
+                        snippet="***",
+                        message=f"Secret detected: {plugin_type}",
+                        severity=rule.severity,
+                        confidence=1.0,
+                    )
+                )
+
+        self._prefilter.record(lines, lines_skipped, lines * plugin_count, checks_skipped)
+        logger.debug(
+            "DetectSecretsDetector prefilter skipped %d of %d line(s), %d of %d plugin check(s)",
+            lines_skipped,
+            lines,
+            checks_skipped,
+            lines * plugin_count,
+        )
+        return findings
 
+    @staticmethod
+    def _log_findings(findings: List[Finding]) -> None:
         if findings:
             counts: Dict[str, int] = {}
             for f in findings:
@@ -175,5 +231,3 @@ class DetectSecretsDetector(ISecretDetector):
             )
         else:
             logger.debug("DetectSecretsDetector found no secrets")
-
-        return findings
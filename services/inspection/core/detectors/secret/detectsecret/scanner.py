@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import inspect
+import logging
+from threading import Lock
+from typing import Any, Dict, Iterator, Sequence, Tuple
+
+from detect_secrets.core.potential_secret import PotentialSecret
+from detect_secrets.core.scan import get_filters_with_parameter
+from detect_secrets.settings import get_plugins, transient_settings
+from detect_secrets.util.code_snippet import get_code_snippet
+from detect_secrets.util.inject import make_function_self_aware
+
+logger = logging.getLogger(__name__)
+
+
+# detect-secrets keeps its settings in process-wide globals. They are only
+# touched while a scanner is being built; scanning itself never mutates them.
+_DETECT_SECRETS_GLOBAL_LOCK = Lock()
+
+# Same pseudo filename detect-secrets uses for ad-hoc string scans.
+_ADHOC_FILENAME = "adhoc-string-scan"
+
+# scan_line() disables this filter for ad-hoc scans; mirror that here.
+_ADHOC_DISABLED_FILTERS = ("detect_secrets.filters.common.is_invalid_file",)
+
+# Arguments detect-secrets offers to each filter chain.
+_SECRET_FILTER_ARGS = frozenset({"filename", "secret", "plugin", "line"})
+_CONTEXT_FILTER_ARGS = _SECRET_FILTER_ARGS | {"context"}
+
+# A filter function plus the argument names it will be called with.
+_BoundFilter = Tuple[Any, Tuple[str, ...]]
+
+
+class PrebuiltSecretScanner:
+    """
+    detect-secrets plugins and filter chain, resolved once and reused.
+
+    Mirrors `detect_secrets.core.scan.scan_line()` but works on a frozen
+    snapshot of plugin instances and filter functions instead of the global
+    settings singleton. The snapshot is immutable and the regex-based
+    plugins keep no per-scan state, so a single instance is shared by all
+    threads; per-thread copies would only duplicate memory.
+    """
+
+    def __init__(
+        self,
+        plugins: Sequence[Any],
+        secret_filters: Sequence[Any],
+        context_filters: Sequence[Any],
+    ) -> None:
+        self._plugins: Tuple[Any, ...] = tuple(plugins)
+        # scan_line() asks for eager search; only plugins that accept it get it.
+        self._plugin_kwargs: Dict[int, Dict[str, Any]] = {
+            id(plugin): _eager_search_kwargs(plugin) for plugin in self._plugins
+        }
+        # Resolve each filter's injectable arguments once instead of per call.
+        self._secret_filters = _bind_filters(secret_filters, _SECRET_FILTER_ARGS)
+        self._context_filters = _bind_filters(context_filters, _CONTEXT_FILTER_ARGS)
+
+    @classmethod
+    def build(cls, settings: Dict[str, Any], disabled_filters: Sequence[str]) -> "PrebuiltSecretScanner":
+        """Resolve plugins and filters for the given settings under the global lock."""
+        with _DETECT_SECRETS_GLOBAL_LOCK:
+            with transient_settings(settings) as active:
+                active.disable_filters(*_ADHOC_DISABLED_FILTERS, *disabled_filters)
+                scanner = cls(
+                    plugins=get_plugins(),
+                    secret_filters=get_filters_with_parameter("secret"),
+                    context_filters=get_filters_with_parameter("context"),
+                )
+
+        logger.info(
+            "Prebuilt detect-secrets scanner with %d plugin(s), %d secret filter(s), %d context filter(s)",
+            len(scanner._plugins),
+            len(scanner._secret_filters),
+            len(scanner._context_filters),
+        )
+        return scanner
+
+    @property
+    def plugins(self) -> Tuple[Any, ...]:
+        return self._plugins
+
+    def scan_line(self, line: str, plugins: Sequence[Any] | None = None) -> Iterator[PotentialSecret]:
+        """Yield potential secrets in ``line`` (same semantics as detect-secrets' scan_line).
+
+        ``plugins`` restricts the scan to a subset of the prebuilt plugins.
+        """
+        context = get_code_snippet(lines=[line], line_number=1)
+
+        for plugin in self._plugins if plugins is None else plugins:
+            # analyze_line() only reads the global settings to decide whether to
+            # run network verification, which is never enabled for this service.
+            secrets = plugin.analyze_line(
+                filename=_ADHOC_FILENAME,
+                line=line,
+                line_number=0,
+                context=context,
+                **self._plugin_kwargs.get(id(plugin), {}),
+            )
+            for secret in secrets or ():
+                if not self.is_filtered_out(plugin, secret.secret_value, line, context):
+                    yield secret
+
+    def is_filtered_out(self, plugin: Any, secret: str, line: str, context: Any = None) -> bool:
+        """Apply the prebuilt secret filters, then the context filters, to one value."""
+        if _is_filtered_out(
+            self._secret_filters,
+            filename=_ADHOC_FILENAME,
+            secret=secret,
+            plugin=plugin,
+            line=line,
+        ):
+            return True
+
+        if context is None:
+            context = get_code_snippet(lines=[line], line_number=1)
+        return _is_filtered_out(
+            self._context_filters,
+            filename=_ADHOC_FILENAME,
+            secret=secret,
+            plugin=plugin,
+            line=line,
+            context=context,
+        )
+
+
+def _eager_search_kwargs(plugin: Any) -> Dict[str, Any]:
+    if "enable_eager_search" in inspect.signature(plugin.analyze_line).parameters:
+        return {"enable_eager_search": True}
+    return {}
+
+
+def _bind_filters(filters: Sequence[Any], offered: frozenset[str]) -> Tuple[_BoundFilter, ...]:
+    bound = []
+    for filter_fn in filters:
+        filter_fn = make_function_self_aware(filter_fn)
+        bound.append((filter_fn, tuple(sorted(filter_fn.injectable_variables & offered))))
+    return tuple(bound)
+
+
+def _is_filtered_out(filters: Sequence[_BoundFilter], **kwargs: Any) -> bool:
+    for filter_fn, arg_names in filters:
+        try:
+            if filter_fn(**{name: kwargs[name] for name in arg_names}):
+                return True
+        except TypeError:
+            # Same as detect-secrets: skip filters whose signature does not fit.
+            continue
+    return False
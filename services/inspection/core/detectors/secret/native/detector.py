@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from detect_secrets.plugins.base import RegexBasedDetector
+from detect_secrets.plugins.jwt import JwtTokenDetector
+from detect_secrets.util.code_snippet import get_code_snippet
+
+from core.config.models import InspectionConfig
+from core.detectors.patterns import MultiPatternMatcher
+from core.detectors.context import PromptContext
+from core.detectors.protocols import IBatchDetector, IContextDetector, ISecretDetector
+from core.detectors.secret.detectsecret.detector import _build_runtime_rules, _SecretRuleRuntime
+from core.detectors.secret.detectsecret.scanner import PrebuiltSecretScanner
+from core.models import Finding
+
+logger = logging.getLogger(__name__)
+
+
+# Plugins that post-process their regex hits in `analyze_string()`; the
+# native engine applies the same check to each candidate value.
+_VALUE_VALIDATORS: Dict[str, Callable[[str], bool]] = {
+    JwtTokenDetector.__name__: JwtTokenDetector.is_formally_valid,
+}
+
+
+@dataclass(frozen=True)
+class _NativePattern:
+    """One denylist regex of a plugin, bound to its rule."""
+    plugin_index: int
+    plugin: Any
+    rule: _SecretRuleRuntime
+    validator: Optional[Callable[[str], bool]]
+
+
+def _native_patterns(
+    plugins: Sequence[Any],
+    rules_by_plugin: Dict[str, _SecretRuleRuntime],
+) -> Tuple[List[_NativePattern], List[re.Pattern[str]]]:
+    """Flatten the plugins' denylists; fail fast for plugins we cannot reproduce."""
+    entries: List[_NativePattern] = []
+    regexes: List[re.Pattern[str]] = []
+
+    for plugin_index, plugin in enumerate(plugins):
+        plugin_cls = type(plugin)
+        rule = rules_by_plugin.get(plugin.secret_type)
+        if rule is None:
+            logger.warning(
+                "Native secret engine: plugin '%s' has no matching rule; skipping",
+                plugin_cls.__name__,
+            )
+            continue
+
+        custom_analyze = plugin_cls.analyze_string is not RegexBasedDetector.analyze_string
+        if not isinstance(plugin, RegexBasedDetector) or (
+            custom_analyze and plugin_cls.__name__ not in _VALUE_VALIDATORS
+        ):
+            raise ValueError(
+                f"Secret rule '{rule.id}' ({plugin_cls.__name__}) cannot use engine 'native'; "
+                "only regex-based detect-secrets plugins are supported."
+            )
+
+        for regex in plugin.denylist:
+            entries.append(
+                _NativePattern(
+                    plugin_index=plugin_index,
+                    plugin=plugin,
+                    rule=rule,
+                    validator=_VALUE_VALIDATORS.get(plugin_cls.__name__),
+                )
+            )
+            regexes.append(regex)
+
+    return entries, regexes
+
+
+def _reported_values(match: re.Match[str]) -> Iterator[Tuple[str, int, int]]:
+    """Yield (value, start, end) the way detect-secrets' `findall` loop reports values.
+
+    Without groups the whole match is the secret; otherwise every non-empty
+    group is reported, with its exact span.
+    """
+    if match.re.groups == 0:
+        yield match.group(0), match.start(), match.end()
+        return
+
+    for group in range(1, match.re.groups + 1):
+        value = match.group(group)
+        if value:
+            yield value, match.start(group), match.end(group)
+
+
+class NativeSecretDetector(ISecretDetector, IContextDetector, IBatchDetector):
+    """
+    Low-overhead secret scanner for rules configured with `engine: native`.
+
+    - Reuses the detect-secrets plugin regexes and heuristic filters, so
+      findings match `DetectSecretsDetector` for the same rules
+    - Compiles all enabled plugin regexes into one `MultiPatternMatcher`
+      table and scans each line with it directly, skipping detect-secrets'
+      per-plugin plumbing (generators, settings lookups, injected calls)
+    - Reports exact offsets from the regex match rather than searching the
+      line for the secret value afterwards
+    """
+
+    def __init__(self, config: InspectionConfig) -> None:
+        engine_cfg = config.detection.secrets.engines.detect_secrets
+
+        self._rules_by_plugin, settings, disabled_filters = _build_runtime_rules(
+            engine_cfg, scan_engine="native"
+        )
+        self._scanner: PrebuiltSecretScanner | None = None
+        self._patterns: List[_NativePattern] = []
+        self._matcher = MultiPatternMatcher(())
+
+        if self._rules_by_plugin:
+            self._scanner = PrebuiltSecretScanner.build(settings, disabled_filters)
+            self._patterns, regexes = _native_patterns(self._scanner.plugins, self._rules_by_plugin)
+            self._matcher = MultiPatternMatcher(regexes)
+
+        logger.info(
+            "NativeSecretDetector initialized with %d enabled rule(s), %d pattern(s)",
+            len(self._rules_by_plugin),
+            len(self._patterns),
+        )
+
+    def warmup(self) -> None:
+        """Warmup hook: run one scan so the matcher and filter caches are hot."""
+        self.detect("warmup")
+
+    def detect(self, prompt: str) -> List[Finding]:
+        """Scan the given prompt with the native matcher and return mapped findings."""
+        return self.detect_context(PromptContext(prompt))
+
+    def detect_context(self, context: PromptContext) -> List[Finding]:
+        """Scan the shared lines of the prompt with the native matcher."""
+        if not context.text:
+            logger.debug("NativeSecretDetector skipping empty prompt")
+            return []
+
+        if self._scanner is None:
+            return []
+
+        findings = self._scan_prompt(context)
+        self._log_findings(findings)
+        return findings
+
+    def detect_batch(self, prompts: Sequence[str]) -> List[List[Finding]]:
+        """Scan several prompts; there is no shared per-call setup to amortize."""
+        results: List[List[Finding]] = [[] for _ in prompts]
+        if self._scanner is None:
+            return results
+
+        for idx, prompt in enumerate(prompts):
+            if prompt:
+                results[idx] = self._scan_prompt(PromptContext(prompt))
+                self._log_findings(results[idx])
+
+        return results
+
+    def _scan_prompt(self, context: PromptContext) -> List[Finding]:
+        findings: List[Finding] = []
+
+        # Rules are line-oriented (same as detect-secrets); keep prompt offsets
+        for offset, line in context.lines:
+            # detect-secrets reports each distinct value once per plugin and line
+            seen: Set[Tuple[int, str]] = set()
+            snippet = None
+
+            for pattern_index, match in self._matcher.finditer(line):
+                pattern = self._patterns[pattern_index]
+                for value, start, end in _reported_values(match):
+                    key = (pattern.plugin_index, value)
+                    if key in seen:
+                        continue
+                    if pattern.validator is not None and not pattern.validator(value):
+                        continue
+                    seen.add(key)
+
+                    if snippet is None:
+                        snippet = get_code_snippet(lines=[line], line_number=1)
+                    if self._scanner.is_filtered_out(pattern.plugin, value, line, snippet):
+                        continue
+
+                    findings.append(
+                        Finding(
+                            type=pattern.rule.id,
+                            start=offset + start,
+                            end=offset + end,
+                            snippet="***",
+                            message=f"Secret detected: {pattern.rule.plugin_type}",
+                            severity=pattern.rule.severity,
+                            confidence=1.0,
+                        )
+                    )
+
+        return findings
+
+    @staticmethod
+    def _log_findings(findings: List[Finding]) -> None:
+        if findings:
+            logger.info(
+                "NativeSecretDetector found %d potential secret(s) across %d rule type(s)",
+                len(findings),
+                len({f.type for f in findings}),
+            )
+        else:
+            logger.debug("NativeSecretDetector found no secrets")
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Generic, List, Sequence, TypeVar
+
+from core.config.models import DetectorExecutionConfig, ExecutionMode
+from core.detectors.protocols import IDetector
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class DetectorRun(Generic[T]):
+    """Result of one detector call plus its wall-clock and CPU time."""
+    detector_name: str
+    result: T
+    wall_ms: float
+    cpu_ms: float   # CPU time of the executing thread only
+
+
+def _timed(detector: IDetector, call: Callable[[IDetector], T]) -> DetectorRun[T]:
+    wall_start = time.perf_counter()
+    cpu_start = time.thread_time()
+    result = call(detector)
+    return DetectorRun(
+        detector_name=detector.__class__.__name__,
+        result=result,
+        wall_ms=(time.perf_counter() - wall_start) * 1000.0,
+        cpu_ms=(time.thread_time() - cpu_start) * 1000.0,
+    )
+
+
+class DetectorExecutor:
+    """
+    Schedules the detectors of one request.
+
+    - sequential: detectors run one after another in the calling thread.
+    - parallel:   detectors fan out on a dedicated, bounded thread pool; the
+                  first detector runs in the calling thread to save a hop.
+
+    Results are always returned in detector order, so merged findings are
+    deterministic regardless of completion order.
+    """
+
+    def __init__(self, mode: ExecutionMode = "sequential", max_workers: int = 4) -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers must be >= 1")
+
+        self._mode: ExecutionMode = mode
+        self._pool: ThreadPoolExecutor | None = None
+        if mode == "parallel":
+            # Threads are spawned lazily on first submit.
+            self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="detector")
+
+    @classmethod
+    def from_config(cls, cfg: DetectorExecutionConfig) -> "DetectorExecutor":
+        return cls(mode=cfg.mode, max_workers=cfg.max_workers)
+
+    @property
+    def mode(self) -> ExecutionMode:
+        return self._mode
+
+    def run(self, detectors: Sequence[IDetector], call: Callable[[IDetector], T]) -> List[DetectorRun[T]]:
+        """Apply ``call`` to every detector and return timed results in detector order.
+
+        The first exception (in detector order) is re-raised after all
+        submitted work has finished.
+        """
+        if self._pool is None or len(detectors) < 2:
+            return [_timed(detector, call) for detector in detectors]
+
+        futures: List[Future[DetectorRun[T]]] = [
+            self._pool.submit(_timed, detector, call) for detector in detectors[1:]
+        ]
+
+        first_error: BaseException | None = None
+        runs: List[DetectorRun[T]] = []
+        try:
+            runs.append(_timed(detectors[0], call))
+        except BaseException as exc:
+            first_error = exc
+
+        for future in futures:
+            try:
+                runs.append(future.result())
+            except BaseException as exc:
+                if first_error is None:
+                    first_error = exc
+
+        if first_error is not None:
+            raise first_error
+
+        return runs
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
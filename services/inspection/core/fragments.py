@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import re
+from typing import List, NamedTuple, Sequence
+
+from core.models import Finding
+
+# Paragraph break: a blank line (optionally with spaces), kept with the
+# paragraph before it so fragments tile the prompt exactly.
+_PARAGRAPH_BREAK = re.compile(r"\n[ \t]*\n\s*")
+
+
+class Fragment(NamedTuple):
+    """``text[start:end]`` of a prompt; fragments tile the prompt without gaps."""
+    start: int
+    end: int
+
+
+class Seam(NamedTuple):
+    """Window ``text[start:end]`` around the fragment boundary at ``boundary``."""
+    boundary: int
+    start: int
+    end: int
+
+
+def split_fragments(text: str, min_fragment_chars: int) -> List[Fragment]:
+    """Split ``text`` at paragraph breaks into fragments of at least ``min_fragment_chars``.
+
+    Short paragraphs are grouped with the following ones. Boundaries depend
+    only on nearby text, so an edit in one paragraph leaves the fragments
+    before it and (once grouping realigns) after it unchanged.
+    """
+    fragments: List[Fragment] = []
+    start = 0
+    for match in _PARAGRAPH_BREAK.finditer(text):
+        end = match.end()
+        if end - start >= min_fragment_chars and end < len(text):
+            fragments.append(Fragment(start, end))
+            start = end
+
+    if start < len(text) or not fragments:
+        fragments.append(Fragment(start, len(text)))
+    return fragments
+
+
+def seams_between(fragments: Sequence[Fragment], seam_chars: int) -> List[Seam]:
+    """One window of ``seam_chars`` on each side of every inner fragment boundary."""
+    return [
+        Seam(boundary=left.end, start=max(left.start, left.end - seam_chars), end=min(right.end, right.start + seam_chars))
+        for left, right in zip(fragments, fragments[1:])
+    ]
+
+
+def merge_fragment_findings(
+    fragments: Sequence[Fragment],
+    fragment_findings: Sequence[Sequence[Finding]],
+    seams: Sequence[Seam],
+    seam_findings: Sequence[Sequence[Finding]],
+) -> List[Finding]:
+    """Shift findings to prompt offsets and add the matches that cross a boundary.
+
+    Seam findings are kept only if they cross their boundary; a fragment
+    finding of the same type overlapping such a match is the part of it
+    seen from one side and is dropped. Findings are ordered by position.
+    """
+    merged: List[Finding] = []
+    for fragment, findings in zip(fragments, fragment_findings):
+        merged.extend(_shifted(finding, fragment.start) for finding in findings)
+
+    crossing: List[Finding] = []
+    for seam, findings in zip(seams, seam_findings):
+        for finding in findings:
+            if finding.start + seam.start < seam.boundary < finding.end + seam.start:
+                crossing.append(_shifted(finding, seam.start))
+
+    if crossing:
+        merged = [
+            finding
+            for finding in merged
+            if not any(
+                other.type == finding.type and other.start < finding.end and finding.start < other.end
+                for other in crossing
+            )
+        ]
+        merged.extend(crossing)
+
+    merged.sort(key=lambda f: (f.start, f.end, f.type))
+    return merged
+
+
+def _shifted(finding: Finding, offset: int) -> Finding:
+    if not offset:
+        return finding
+    return finding.model_copy(update={"start": finding.start + offset, "end": finding.end + offset})
@@ -2,16 +2,32 @@ def check_liveness() -> dict:
     return {"status": "ok"}
 
 
-def check_readiness() -> dict:
+def check_readiness(
+    config_fingerprint: str | None = None,
+    reload_error: str | None = None,
+) -> dict:
     """
     Place for future readiness checks:
     - config loaded
     - models initialized
     - external dependencies reachable (if any)
+
+    Reports the fingerprint of the active config, the error of the last
+    config reload if it failed (the previous config keeps serving), and the
+    startup timeline and warmup rounds.
     """
-    from bootstrap import WARMUP_ERRORS, WARMUP_OK
+    from bootstrap import STARTUP_TIMELINE, WARMUP_ERRORS, WARMUP_OK, WARMUP_REPORT
 
     if not WARMUP_OK:
         return {"status": "degraded", "details": WARMUP_ERRORS}
 
-    return {"status": "ready"}
+    status: dict = {"status": "ready"}
+    if STARTUP_TIMELINE is not None:
+        status["startup"] = STARTUP_TIMELINE.as_dict()
+    if WARMUP_REPORT is not None:
+        status["warmup"] = WARMUP_REPORT.as_dict()
+    if config_fingerprint is not None:
+        status["config_fingerprint"] = config_fingerprint
+    if reload_error is not None:
+        status["last_reload_error"] = reload_error
+    return status
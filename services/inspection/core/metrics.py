@@ -0,0 +1,393 @@
+from __future__ import annotations
+
+import itertools
+import threading
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Dict, Iterable, List, Sequence, Tuple
+
+from core.config.models import MetricsConfig
+
+if TYPE_CHECKING:
+    from core.admission import AdmissionController
+    from core.detectors.protocols import IDetector
+    from core.execution import DetectorRun
+    from core.runtime import InspectionRuntime
+
+ENDPOINTS = ("/inspect", "/inspect/batch", "/inspect/conversation")
+OUTCOMES = ("ok", "rejected", "error")
+DETECTORS = ("DetectSecretsDetector", "NativeSecretDetector", "PresidioPiiDetector", "InjectionPatternDetector")
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PROMPT_CHARS_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+Sample = Tuple[str, Dict[str, str], float]
+
+
+class _PerThread:
+    """
+    Slots written by one thread each and summed on read.
+
+    A thread gets its own slots on first use (the only time a lock is
+    taken), so updates are plain list increments: no lock per update and
+    no increment lost between threads. Slots of threads that have exited
+    are folded into a retired total on read, so recycled pool threads do
+    not accumulate.
+    """
+
+    __slots__ = ("_width", "_local", "_lock", "_live", "_retired")
+
+    def __init__(self, width: int) -> None:
+        self._width = width
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._live: List[Tuple[threading.Thread, List[float]]] = []
+        self._retired = [0.0] * width
+
+    def slots(self) -> List[float]:
+        try:
+            return self._local.slots
+        except AttributeError:
+            slots = self._local.slots = [0.0] * self._width
+            with self._lock:
+                self._live.append((threading.current_thread(), slots))
+            return slots
+
+    def totals(self) -> List[float]:
+        with self._lock:
+            live = []
+            for thread, slots in self._live:
+                if thread.is_alive():
+                    live.append((thread, slots))
+                else:
+                    self._retired = [a + b for a, b in zip(self._retired, slots)]
+            self._live = live
+            totals = list(self._retired)
+            for _, slots in live:
+                totals = [a + b for a, b in zip(totals, slots)]
+        return totals
+
+
+class CounterChild:
+    __slots__ = ("_values",)
+
+    def __init__(self) -> None:
+        self._values = _PerThread(1)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._values.slots()[0] += amount
+
+    def value(self) -> float:
+        return self._values.totals()[0]
+
+
+class HistogramChild:
+    __slots__ = ("_bounds", "_values")
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        self._bounds = bounds
+        # one slot per bucket (le=bound, then +Inf), then the sum
+        self._values = _PerThread(len(bounds) + 2)
+
+    def observe(self, value: float) -> None:
+        slots = self._values.slots()
+        slots[bisect_left(self._bounds, value)] += 1
+        slots[-1] += value
+
+    def snapshot(self) -> Tuple[List[float], float]:
+        """Non-cumulative bucket counts (last one is +Inf) and the sum."""
+        totals = self._values.totals()
+        return totals[:-1], totals[-1]
+
+
+class _Metric:
+    """Named metric with a fixed label set; children for known label values are created up front."""
+
+    kind = ""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        labelsets: Iterable[Sequence[str]] = (),
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children: Dict[Tuple[str, ...], object] = {}
+        for values in labelsets if labelnames else [()]:
+            self._children[tuple(values)] = self._new_child()
+
+    def _new_child(self) -> object:
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        child = self._children.get(values)
+        if child is None:
+            # first sighting of a label value (e.g. a finding type); later calls are a dict lookup
+            with self._lock:
+                child = self._children.get(values)
+                if child is None:
+                    child = self._new_child()
+                    self._children = {**self._children, values: child}
+        return child
+
+    def _labels_of(self, values: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, values))
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increment an unlabelled counter."""
+        self._children[()].inc(amount)
+
+    def _new_child(self) -> CounterChild:
+        return CounterChild()
+
+    def samples(self) -> Iterable[Sample]:
+        for values, child in self._children.items():
+            yield self.name, self._labels_of(values), child.value()
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        buckets: Sequence[float],
+        labelnames: Sequence[str] = (),
+        labelsets: Iterable[Sequence[str]] = (),
+    ) -> None:
+        self._bounds = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, labelsets)
+
+    def observe(self, value: float) -> None:
+        """Observe into an unlabelled histogram."""
+        self._children[()].observe(value)
+
+    def _new_child(self) -> HistogramChild:
+        return HistogramChild(self._bounds)
+
+    def samples(self) -> Iterable[Sample]:
+        for values, child in self._children.items():
+            labels = self._labels_of(values)
+            counts, total = child.snapshot()
+            cumulative = 0.0
+            for bound, count in zip(self._bounds + (float("inf"),), counts):
+                cumulative += count
+                yield f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, cumulative
+
+
+class InspectionMetrics:
+    """
+    Metrics of one worker process, in the Prometheus text format.
+
+    Request-path metrics (counters, histograms) are recorded as they
+    happen; label sets of endpoints, outcomes and detectors are registered
+    up front. State the service already counts (caches, prefilter,
+    micro-batching, admission, coalescing, reloads, memory) is read from
+    its `stats()` when scraped, so it costs nothing per request.
+    """
+
+    def __init__(self) -> None:
+        self.requests = Counter(
+            "aegis_inspection_requests_total", "Inspection requests by endpoint and outcome.",
+            ("endpoint", "outcome"), itertools.product(ENDPOINTS, OUTCOMES),
+        )
+        self.request_seconds = Histogram(
+            "aegis_inspection_request_duration_seconds", "Inspection latency, admission queue included.",
+            LATENCY_BUCKETS, ("endpoint",), ((e,) for e in ENDPOINTS),
+        )
+        self.admission_wait_seconds = Histogram(
+            "aegis_inspection_admission_wait_seconds", "Time waited for an admission slot.", LATENCY_BUCKETS,
+        )
+        self.threadpool_wait_seconds = Histogram(
+            "aegis_inspection_threadpool_wait_seconds",
+            "Time from handing an inspection to the threadpool until it started.",
+            LATENCY_BUCKETS,
+        )
+        self.detector_seconds = Histogram(
+            "aegis_inspection_detector_duration_seconds", "Wall time of one detector call (a batch counts once).",
+            LATENCY_BUCKETS, ("detector",), ((d,) for d in DETECTORS),
+        )
+        self.detector_cpu_seconds = Counter(
+            "aegis_inspection_detector_cpu_seconds_total", "CPU time spent in detector calls.",
+            ("detector",), ((d,) for d in DETECTORS),
+        )
+        self.prompt_chars = Histogram(
+            "aegis_inspection_prompt_chars", "Prompt size in characters (per batch item / per conversation).",
+            PROMPT_CHARS_BUCKETS, ("endpoint",), ((e,) for e in ENDPOINTS),
+        )
+        self.findings = Counter("aegis_inspection_findings_total", "Reported findings by type.", ("type",))
+        self._recorded = (
+            self.requests, self.request_seconds, self.admission_wait_seconds, self.threadpool_wait_seconds,
+            self.detector_seconds, self.detector_cpu_seconds, self.prompt_chars, self.findings,
+        )
+
+    @classmethod
+    def from_config(cls, cfg: MetricsConfig) -> "InspectionMetrics | None":
+        """The process-wide instance, so counters survive config reloads; None when disabled."""
+        return _process_metrics() if cfg.enabled else None
+
+    def observe_detectors(self, runs: Sequence["DetectorRun"]) -> None:
+        for run in runs:
+            self.detector_seconds.labels(run.detector_name).observe(run.wall_ms / 1000.0)
+            self.detector_cpu_seconds.labels(run.detector_name).inc(run.cpu_ms / 1000.0)
+
+    def render(
+        self,
+        detectors: Sequence["IDetector"] = (),
+        runtime: "InspectionRuntime | None" = None,
+        admission: "AdmissionController | None" = None,
+        reloads: int | None = None,
+        rss_bytes: float | None = None,
+    ) -> str:
+        lines: List[str] = []
+        for metric in self._recorded:
+            _expose(lines, metric.name, metric.kind, metric.documentation, metric.samples())
+        for name, kind, documentation, samples in _scraped(detectors, runtime, admission, reloads, rss_bytes):
+            if samples:
+                _expose(lines, name, kind, documentation, samples)
+        lines.append("")
+        return "\n".join(lines)
+
+
+_PROCESS_METRICS: InspectionMetrics | None = None
+_PROCESS_METRICS_LOCK = threading.Lock()
+
+
+def _process_metrics() -> InspectionMetrics:
+    global _PROCESS_METRICS
+    with _PROCESS_METRICS_LOCK:
+        if _PROCESS_METRICS is None:
+            _PROCESS_METRICS = InspectionMetrics()
+        return _PROCESS_METRICS
+
+
+def _scraped(
+    detectors: Sequence["IDetector"],
+    runtime: "InspectionRuntime | None",
+    admission: "AdmissionController | None",
+    reloads: int | None,
+    rss_bytes: float | None,
+) -> Iterable[Tuple[str, str, str, List[Sample]]]:
+    p = "aegis_inspection_"
+
+    if rss_bytes is not None:
+        yield "process_resident_memory_bytes", "gauge", "Resident set size of this worker.", [
+            ("process_resident_memory_bytes", {}, rss_bytes)
+        ]
+
+    caches = []
+    if runtime is not None:
+        caches = [
+            (name, cache.stats())
+            for name, cache in (
+                ("result", runtime.result_cache),
+                ("fragment", runtime.fragment_cache),
+                ("conversation", runtime.conversation_cache),
+            )
+            if cache is not None
+        ]
+    for field, kind, documentation in (
+        ("hits", "counter", "Cache hits."),
+        ("misses", "counter", "Cache misses."),
+        ("evictions", "counter", "Entries dropped to honour the size bounds."),
+        ("entries", "gauge", "Cached entries."),
+        ("bytes", "gauge", "Approximate size of cached findings."),
+        ("hit_ratio", "gauge", "Hits per lookup since the cache was built."),
+    ):
+        name = f"{p}cache_{field}_total" if kind == "counter" else f"{p}cache_{field}"
+        yield name, kind, documentation, [(name, {"cache": c}, getattr(s, field)) for c, s in caches]
+
+    prefilters = [
+        (detector.__class__.__name__, detector.prefilter_stats())
+        for detector in detectors
+        if hasattr(detector, "prefilter_stats")
+    ]
+    for field, documentation in (
+        ("checks", "(line, key) pairs seen by the keyword prefilter."),
+        ("checks_skipped", "(line, key) pairs the keyword prefilter ruled out."),
+    ):
+        name = f"{p}prefilter_{field}_total"
+        yield name, "counter", documentation, [(name, {"detector": d}, getattr(s, field)) for d, s in prefilters]
+
+    batching = []
+    for detector in detectors:
+        stats = detector.batching_stats() if hasattr(detector, "batching_stats") else None
+        if stats is not None:
+            batching.append((detector.__class__.__name__, stats))
+    for field, documentation in (
+        ("batches", "Micro-batches run."),
+        ("items", "Prompts analyzed in micro-batches."),
+        ("full_batches", "Micro-batches closed by max_batch_size."),
+    ):
+        name = f"{p}micro_batch_{field}_total"
+        yield name, "counter", documentation, [(name, {"detector": d}, getattr(s, field)) for d, s in batching]
+    name = f"{p}micro_batch_queue_wait_seconds_total"
+    yield name, "counter", "Time prompts waited for their micro-batch to start, summed.", [
+        (name, {"detector": d}, s.queue_wait_ms / 1000.0) for d, s in batching
+    ]
+    name = f"{p}micro_batch_max_size"
+    yield name, "gauge", "Configured micro-batch size limit.", [
+        (name, {"detector": d}, s.max_batch_size) for d, s in batching
+    ]
+    name = f"{p}micro_batch_max_wait_seconds"
+    yield name, "gauge", "Configured micro-batch collection window.", [
+        (name, {"detector": d}, s.max_wait_ms / 1000.0) for d, s in batching
+    ]
+
+    if admission is not None:
+        stats = admission.stats()
+        for field, documentation in (
+            ("limit", "Current concurrency limit."),
+            ("in_flight", "Inspections holding a slot."),
+            ("queued", "Inspections waiting for a slot."),
+        ):
+            name = f"{p}admission_{field}"
+            yield name, "gauge", documentation, [(name, {}, getattr(stats, field))]
+        name = f"{p}admission_rejected_total"
+        yield name, "counter", "Inspections shed by admission control.", [
+            (name, {"reason": "queue_full"}, stats.rejected_queue_full),
+            (name, {"reason": "queue_timeout"}, stats.rejected_queue_timeout),
+        ]
+
+    if runtime is not None and runtime.coalescer is not None:
+        name = f"{p}coalesced_requests_total"
+        yield name, "counter", "Inspections answered by an identical in-flight inspection.", [
+            (name, {}, runtime.coalescer.stats().coalesced)
+        ]
+
+    if reloads is not None:
+        name = f"{p}config_reloads_total"
+        yield name, "counter", "Config reloads that swapped in a new pipeline.", [(name, {}, reloads)]
+
+
+def _expose(lines: List[str], name: str, kind: str, documentation: str, samples: Iterable[Sample]) -> None:
+    lines.append(f"# HELP {name} {documentation}")
+    lines.append(f"# TYPE {name} {kind}")
+    for sample_name, labels, value in samples:
+        if labels:
+            rendered = ",".join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+            lines.append(f"{sample_name}{{{rendered}}} {_format_value(value)}")
+        else:
+            lines.append(f"{sample_name} {_format_value(value)}")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
@@ -3,6 +3,18 @@ from __future__ import annotations
 from typing import List, Optional
 from pydantic import BaseModel, Field
 
+# Upper bound for a single /inspect/batch call to keep request memory bounded.
+MAX_BATCH_ITEMS = 256
+
+# Upper bound on messages in one /inspect/conversation call.
+MAX_CONVERSATION_MESSAGES = 1024
+
+# Joins message contents into the combined prompt that finding offsets refer to.
+CONVERSATION_SEPARATOR = "\n\n"
+
+# Request header that asks for the `timings` block, like `includeTimings` in the body.
+TIMINGS_HEADER = "X-Aegis-Timings"
+
 
 class PromptInspectionMeta(BaseModel):
     """Optional metadata about the prompt, forwarded by the gateway."""
@@ -17,6 +29,43 @@ class PromptInspectionRequest(BaseModel):
     """Request contract from the gateway to the ML service."""
     prompt: str = Field(..., description="The raw user prompt text.")
     meta: Optional[PromptInspectionMeta] = None
+    includeTimings: bool = Field(default=False, description="Return a per-stage `timings` block (/inspect only).")
+
+
+class PromptInspectionBatchRequest(BaseModel):
+    """Batch request contract: several prompts inspected in one call."""
+    items: List[PromptInspectionRequest] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BATCH_ITEMS,
+        description="Prompts to inspect; results are returned in the same order.",
+    )
+
+
+class ConversationMessage(BaseModel):
+    """One chat message of a conversation."""
+    role: Optional[str] = Field(default=None, description="Chat role, e.g. 'system', 'user', 'assistant'.")
+    content: str = Field(..., description="The message text.")
+
+
+class ConversationInspectionRequest(BaseModel):
+    """Conversation request: the full chat history, inspected message by message.
+
+    Findings are reported against the combined prompt, i.e. all message
+    contents joined with ``CONVERSATION_SEPARATOR`` in order.
+    """
+    messages: List[ConversationMessage] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_CONVERSATION_MESSAGES,
+        description="Chat history in order; messages already inspected are served from the result cache.",
+    )
+    conversationId: Optional[str] = Field(default=None, description="Opaque conversation id for correlation.")
+    meta: Optional[PromptInspectionMeta] = None
+    includeTimings: bool = Field(default=False, description="Return a per-stage `timings` block.")
+
+    def combined_prompt(self) -> str:
+        return CONVERSATION_SEPARATOR.join(message.content for message in self.messages)
 
 
 class Finding(BaseModel):
@@ -35,6 +84,38 @@ class Finding(BaseModel):
     )
 
 
+class DetectorTiming(BaseModel):
+    """Wall-clock and CPU time of one detector call."""
+    detector: str = Field(..., description="Detector class name, e.g. 'PresidioPiiDetector'.")
+    wallMs: float
+    cpuMs: float = Field(..., description="CPU time of the thread that ran the detector.")
+
+
+class InspectionTimings(BaseModel):
+    """Where the time of one inspection went; returned on request only."""
+    parseMs: float = Field(..., description="Reading and validating the request body.")
+    queueMs: float = Field(..., description="Waiting for an admission slot.")
+    threadpoolWaitMs: float = Field(..., description="Waiting for a worker thread after admission.")
+    processingMs: float = Field(..., description="Analysis, from handing it to the threadpool to its result.")
+    detectors: List[DetectorTiming] = Field(
+        default_factory=list,
+        description="Detector calls made for this request; empty when the findings came from a cache "
+        "or from an identical request in flight.",
+    )
+    promptChars: int
+    promptLines: int
+
+
 class PromptInspectionResponse(BaseModel):
     """Response back to the gateway: list of findings."""
-    findings: List[Finding] = Field(default_factory=list)
\ No newline at end of file
+    findings: List[Finding] = Field(default_factory=list)
+    timings: Optional[InspectionTimings] = Field(
+        default=None,
+        exclude_if=lambda timings: timings is None,
+        description="Per-stage timings; only present when asked for (`includeTimings` or the X-Aegis-Timings header).",
+    )
+
+
+class PromptInspectionBatchResponse(BaseModel):
+    """Batch response: one inspection response per request item, in order."""
+    results: List[PromptInspectionResponse] = Field(default_factory=list)
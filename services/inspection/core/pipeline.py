@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import logging
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Iterable, Iterator
+
+from core.config.models import InspectionConfig
+from core.detectors.protocols import IDetector
+from core.runtime import InspectionRuntime
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(eq=False)
+class InspectionPipeline:
+    """Detectors plus the runtime built for one config; swapped as a unit on reload."""
+    config: InspectionConfig
+    detectors: tuple[IDetector, ...]
+    runtime: InspectionRuntime
+    _in_flight: int = field(default=0, repr=False)
+    _retired: bool = field(default=False, repr=False)
+
+    @property
+    def config_fingerprint(self) -> str:
+        return self.runtime.config_fingerprint
+
+
+def close_detectors(detectors: Iterable[IDetector]) -> None:
+    """Release what detectors hold outside the heap (worker processes, threads), if anything."""
+    for detector in detectors:
+        close = getattr(detector, "close", None)
+        if close is not None:
+            close()
+
+
+class PipelineHolder:
+    """
+    Holds the active pipeline and swaps it atomically.
+
+    Requests take a lease on the pipeline that is active when they start
+    and finish on it, even if a reload swaps in a new one meanwhile. A
+    replaced pipeline is closed once its last lease is returned.
+    """
+
+    def __init__(self, pipeline: InspectionPipeline) -> None:
+        self._lock = Lock()
+        self._active = pipeline
+
+    @property
+    def active(self) -> InspectionPipeline:
+        return self._active
+
+    @contextmanager
+    def lease(self) -> Iterator[InspectionPipeline]:
+        with self._lock:
+            pipeline = self._active
+            pipeline._in_flight += 1
+        try:
+            yield pipeline
+        finally:
+            with self._lock:
+                pipeline._in_flight -= 1
+                close = pipeline._retired and pipeline._in_flight == 0
+            if close:
+                self._close(pipeline)
+
+    def swap(self, pipeline: InspectionPipeline) -> InspectionPipeline:
+        """Make ``pipeline`` active and return the one it replaced."""
+        with self._lock:
+            previous = self._active
+            self._active = pipeline
+            previous._retired = True
+            close = previous._in_flight == 0
+        if close:
+            self._close(previous)
+        logger.info(
+            "Inspection pipeline swapped (config_fingerprint %s -> %s)",
+            previous.config_fingerprint,
+            pipeline.config_fingerprint,
+        )
+        return previous
+
+    def close(self) -> None:
+        """Close the active pipeline; called on shutdown."""
+        self._close(self._active)
+
+    @staticmethod
+    def _close(pipeline: InspectionPipeline) -> None:
+        pipeline.runtime.close()
+        close_detectors(pipeline.detectors)
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import logging
+import pathlib
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple
+
+from core.config.loader import config_fingerprint, config_path, reload_config
+from core.config.models import InspectionConfig
+from core.pipeline import InspectionPipeline, PipelineHolder
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ReloadResult:
+    """Outcome of one reload attempt."""
+    status: str                 # "reloaded" | "unchanged" | "failed"
+    config_fingerprint: str     # fingerprint active after the attempt
+    error: Optional[str] = None
+
+
+class ConfigReloader:
+    """
+    Rebuilds the inspection pipeline when the config file changes.
+
+    - `reload()` re-reads and validates the file; an unchanged fingerprint
+      is a no-op, a new one builds a fresh pipeline (detectors warmed up)
+      off the request path and swaps it into the `PipelineHolder`
+    - a file that fails to load or build is logged and reported; the
+      running pipeline stays active
+    - `start()` polls the file's mtime/size in a daemon thread and calls
+      `reload()` when they change; reloads are serialized
+    """
+
+    def __init__(
+        self,
+        holder: PipelineHolder,
+        build: Callable[[InspectionConfig], InspectionPipeline],
+        path: str | pathlib.Path | None = None,
+        poll_interval_seconds: float = 2.0,
+    ) -> None:
+        self._holder = holder
+        self._build = build
+        self._path = path
+        self._poll_interval = poll_interval_seconds
+
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._file_state = self._stat()
+
+        self._reloads = 0
+        self._last_error: Optional[str] = None
+
+    @property
+    def reloads(self) -> int:
+        return self._reloads
+
+    @property
+    def last_error(self) -> Optional[str]:
+        """Error of the latest reload attempt, or None if it succeeded."""
+        return self._last_error
+
+    def reload(self) -> ReloadResult:
+        with self._reload_lock:
+            self._file_state = self._stat()
+            active = self._holder.active
+            try:
+                config = reload_config(self._path)
+                if config_fingerprint(config) == active.config_fingerprint:
+                    logger.info("Config reload: fingerprint unchanged (%s)", active.config_fingerprint)
+                    self._last_error = None
+                    return ReloadResult("unchanged", active.config_fingerprint)
+
+                started = time.perf_counter()
+                pipeline = self._build(config)
+            except Exception as exc:
+                self._last_error = f"{type(exc).__name__}: {exc}"
+                logger.exception("Config reload failed; keeping config %s", active.config_fingerprint)
+                return ReloadResult("failed", active.config_fingerprint, self._last_error)
+
+            self._holder.swap(pipeline)
+            self._reloads += 1
+            self._last_error = None
+            logger.info(
+                "Config reload: pipeline %s built in %.2fs and activated",
+                pipeline.config_fingerprint,
+                time.perf_counter() - started,
+            )
+            return ReloadResult("reloaded", pipeline.config_fingerprint)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._watch, name="config-watch", daemon=True)
+        self._thread.start()
+        logger.info("Watching config file for changes (every %.1fs)", self._poll_interval)
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self._poll_interval + 1.0)
+            self._thread = None
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self._poll_interval):
+            if self._stat() != self._file_state:
+                logger.info("Config file changed on disk; reloading")
+                self.reload()
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = config_path(self._path).stat()
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
@@ -3,8 +3,19 @@ from __future__ import annotations
 import logging
 from typing import List, Sequence
 
-from core.models import PromptInspectionRequest, PromptInspectionResponse, Finding
-from core.detectors.protocols import IDetector
+from core.models import (
+    CONVERSATION_SEPARATOR,
+    ConversationInspectionRequest,
+    Finding,
+    PromptInspectionRequest,
+    PromptInspectionResponse,
+)
+from core.cache import prompt_digest
+from core.detectors.context import PromptContext
+from core.detectors.protocols import IBatchDetector, IContextDetector, IDetector
+from core.execution import DetectorExecutor, DetectorRun
+from core.fragments import merge_fragment_findings, seams_between, split_fragments
+from core.runtime import InspectionRuntime
 
 logger = logging.getLogger(__name__)
 
@@ -12,42 +23,326 @@ logger = logging.getLogger(__name__)
 def analyze_prompt(
     req: PromptInspectionRequest,
     detectors: Sequence[IDetector] | None,
+    runtime: InspectionRuntime | None = None,
+    detector_runs: List[DetectorRun] | None = None,
 ) -> PromptInspectionResponse:
     """
     Central rule engine for the inspection service.
 
     Responsibilities:
+    - serve byte-identical prompts from the result cache (if configured)
+    - let concurrent identical prompts share one analysis (if configured)
+    - reuse cached findings of repeated paragraphs in long prompts (if configured)
     - fan-out the prompt to all configured detectors
     - aggregate their findings
+
+    If `detector_runs` is given, the timed detector calls made for this
+    request are appended to it (none when the answer came from a cache or
+    from an identical request in flight).
     """
     if detectors is None:
         logger.error("Detector pipeline is not configured; refusing to analyze prompt")
         raise RuntimeError("Detector pipeline is not configured. Ensure warmup ran before handling requests.")
 
     text = req.prompt or ""
+    cache = runtime.result_cache if runtime is not None else None
+
+    if cache is not None:
+        cached = cache.get(text, runtime.config_fingerprint)
+        if cached is not None:
+            logger.info("Prompt analysis served from result cache; total findings=%d", len(cached))
+            return PromptInspectionResponse(findings=cached)
+
+    def analyze() -> List[Finding]:
+        findings = _run_fragmented(text, detectors, runtime, detector_runs)
+        if findings is None:
+            findings = _run_detectors(text, detectors, runtime, detector_runs)
+        if cache is not None:
+            cache.put(text, runtime.config_fingerprint, findings)
+        return findings
+
+    coalescer = runtime.coalescer if runtime is not None else None
+    if coalescer is not None:
+        # Identical prompts already being analyzed (same config) wait for that run
+        all_findings = coalescer.run((prompt_digest(text), runtime.config_fingerprint), analyze)
+    else:
+        all_findings = analyze()
+
+    logger.info("Prompt analysis complete; total findings=%d", len(all_findings))
+    return PromptInspectionResponse(findings=all_findings)
+
+
+def analyze_prompts(
+    reqs: Sequence[PromptInspectionRequest],
+    detectors: Sequence[IDetector] | None,
+    runtime: InspectionRuntime | None = None,
+) -> List[PromptInspectionResponse]:
+    """
+    Batch variant of :func:`analyze_prompt`.
+
+    Cached prompts are answered directly; every detector sees the remaining
+    prompts at once so batch-aware detectors (:class:`IBatchDetector`) can
+    amortize their setup. Findings per prompt are aggregated in detector
+    order, exactly as :func:`analyze_prompt` would.
+    """
+    if detectors is None:
+        logger.error("Detector pipeline is not configured; refusing to analyze prompts")
+        raise RuntimeError("Detector pipeline is not configured. Ensure warmup ran before handling requests.")
+
+    texts = [req.prompt or "" for req in reqs]
+    cache = runtime.result_cache if runtime is not None else None
+
+    results: List[List[Finding] | None] = [None] * len(texts)
+    if cache is not None:
+        for idx, text in enumerate(texts):
+            results[idx] = cache.get(text, runtime.config_fingerprint)
+
+    pending = [idx for idx, findings in enumerate(results) if findings is None]
+    logger.info(
+        "Analyzing batch of %d prompts with %d detectors (cached=%d)",
+        len(texts),
+        len(detectors),
+        len(texts) - len(pending),
+    )
+
+    if pending:
+        pending_findings = _run_detectors_batch([texts[idx] for idx in pending], detectors, runtime)
+        for idx, findings in zip(pending, pending_findings):
+            results[idx] = findings
+            if cache is not None:
+                cache.put(texts[idx], runtime.config_fingerprint, findings)
+
+    logger.info(
+        "Batch analysis complete; prompts=%d, total findings=%d",
+        len(texts),
+        sum(len(findings) for findings in results),
+    )
+    return [PromptInspectionResponse(findings=findings) for findings in results]
+
+
+def analyze_conversation(
+    req: ConversationInspectionRequest,
+    detectors: Sequence[IDetector] | None,
+    runtime: InspectionRuntime | None = None,
+    detector_runs: List[DetectorRun] | None = None,
+) -> PromptInspectionResponse:
+    """
+    Inspect a chat history message by message, reusing earlier turns.
+
+    Each message is analyzed on its own and its findings are kept in the
+    conversation cache under the message content, so a turn that resends
+    the history only runs the detectors on new or changed messages;
+    everything else is a cache hit. That cache is independent of the result
+    cache; without it (or once a message expired) every message is analyzed.
+    Findings are shifted to offsets in the combined prompt
+    (:meth:`ConversationInspectionRequest.combined_prompt`).
+    `detector_runs` collects the detector calls as in :func:`analyze_prompt`.
+    """
+    if detectors is None:
+        logger.error("Detector pipeline is not configured; refusing to analyze conversation")
+        raise RuntimeError("Detector pipeline is not configured. Ensure warmup ran before handling requests.")
+
+    texts = [message.content for message in req.messages]
+    cache = runtime.conversation_cache if runtime is not None else None
+
+    # Identical messages (repeated system prompts, "ok", ...) are analyzed once
+    by_text: dict[str, List[Finding] | None] = dict.fromkeys(texts)
+    if cache is not None:
+        for text in by_text:
+            by_text[text] = cache.get(text, runtime.config_fingerprint)
+
+    pending = [text for text, findings in by_text.items() if findings is None and text]
+    for text in by_text:
+        if not text:
+            by_text[text] = []
+
+    if pending:
+        for text, findings in zip(pending, _run_detectors_batch(pending, detectors, runtime, detector_runs)):
+            by_text[text] = findings
+            if cache is not None:
+                cache.put(text, runtime.config_fingerprint, findings)
+
     all_findings: List[Finding] = []
+    offset = 0
+    for text in texts:
+        for finding in by_text[text]:
+            all_findings.append(
+                finding.model_copy(update={"start": finding.start + offset, "end": finding.end + offset})
+                if offset
+                else finding
+            )
+        offset += len(text) + len(CONVERSATION_SEPARATOR)
 
-    logger.info("Analyzing prompt with %d detectors", len(detectors))
-
-    for detector in detectors:
-        detector_name = detector.__class__.__name__
-        # Each detector is responsible for:
-        # - reading its own config (severity, enabled flags, thresholds)
-        # - talking to Presidio / regex / ML, etc.
-        logger.debug("Running detector: %s", detector_name)
-        try:
-            findings = detector.detect(text)
-        except Exception:
-            logger.exception("Detector '%s' raised an exception", detector_name)
-            raise
-
-        if findings:
+    logger.info(
+        "Conversation analysis complete (conversation_id=%s, messages=%d, analyzed=%d, total findings=%d)",
+        req.conversationId,
+        len(texts),
+        len(pending),
+        len(all_findings),
+    )
+    return PromptInspectionResponse(findings=all_findings)
+
+
+def _run_fragmented(
+    text: str,
+    detectors: Sequence[IDetector],
+    runtime: InspectionRuntime | None,
+    detector_runs: List[DetectorRun] | None = None,
+) -> List[Finding] | None:
+    """Analyze a long prompt per paragraph, reusing cached fragment findings.
+
+    Returns None when the fragment cache is off or the prompt is too short
+    or has a single fragment; the caller then analyzes it whole.
+    """
+    cache = runtime.fragment_cache if runtime is not None else None
+    if cache is None or len(text) < runtime.fragment_cfg.min_prompt_chars:
+        return None
+
+    cfg = runtime.fragment_cfg
+    fragments = split_fragments(text, cfg.min_fragment_chars)
+    if len(fragments) < 2:
+        return None
+    seams = seams_between(fragments, cfg.seam_chars)
+
+    # Fragments and seam windows are cached alike, by content
+    pieces = [text[f.start:f.end] for f in fragments] + [text[s.start:s.end] for s in seams]
+    by_text: dict[str, List[Finding] | None] = {
+        piece: cache.get(piece, runtime.config_fingerprint) for piece in dict.fromkeys(pieces)
+    }
+
+    pending = [piece for piece, findings in by_text.items() if findings is None]
+    if pending:
+        for piece, findings in zip(pending, _run_detectors_batch(pending, detectors, runtime, detector_runs)):
+            by_text[piece] = findings
+            cache.put(piece, runtime.config_fingerprint, findings)
+
+    results = [by_text[piece] for piece in pieces]
+    logger.info(
+        "Fragmented analysis: %d fragment(s) + %d seam(s), %d of %d distinct piece(s) served from cache",
+        len(fragments),
+        len(seams),
+        len(by_text) - len(pending),
+        len(by_text),
+    )
+    return merge_fragment_findings(fragments, results[: len(fragments)], seams, results[len(fragments):])
+
+
+def _run_detectors(
+    text: str,
+    detectors: Sequence[IDetector],
+    runtime: InspectionRuntime | None,
+    detector_runs: List[DetectorRun] | None = None,
+) -> List[Finding]:
+    """Run all detectors on one prompt and merge findings in detector order."""
+    executor = _executor_for(runtime)
+
+    logger.info("Analyzing prompt with %d detectors (mode=%s)", len(detectors), executor.mode)
+
+    # Each detector is responsible for:
+    # - reading its own config (severity, enabled flags, thresholds)
+    # - talking to Presidio / regex / ML, etc.
+    # Derived views of the prompt (lines, folded case, spaCy pass) are built
+    # once in the shared context and reused by every detector.
+    context = PromptContext(text)
+    runs = executor.run(detectors, lambda detector: _call_detector(detector, context))
+
+    all_findings: List[Finding] = []
+    for run in runs:
+        if run.result:
             logger.info(
                 "Detector '%s' returned %d findings",
-                detector_name,
-                len(findings),
+                run.detector_name,
+                len(run.result),
             )
-            all_findings.extend(findings)
+            all_findings.extend(run.result)
 
-    logger.info("Prompt analysis complete; total findings=%d", len(all_findings))
-    return PromptInspectionResponse(findings=all_findings)
+    _record_timings(runs, runtime, detector_runs)
+    return all_findings
+
+
+def _run_detectors_batch(
+    texts: List[str],
+    detectors: Sequence[IDetector],
+    runtime: InspectionRuntime | None,
+    detector_runs: List[DetectorRun] | None = None,
+) -> List[List[Finding]]:
+    """Run all detectors on a batch and merge findings per prompt in detector order."""
+    executor = _executor_for(runtime)
+    contexts = [PromptContext(text) for text in texts]
+    runs = executor.run(detectors, lambda detector: _call_detector_batch(detector, contexts))
+
+    all_findings: List[List[Finding]] = [[] for _ in texts]
+    for run in runs:
+        total = 0
+        for idx, findings in enumerate(run.result):
+            if findings:
+                all_findings[idx].extend(findings)
+                total += len(findings)
+
+        if total:
+            logger.info(
+                "Detector '%s' returned %d findings across the batch",
+                run.detector_name,
+                total,
+            )
+
+    _record_timings(runs, runtime, detector_runs)
+    return all_findings
+
+
+_SEQUENTIAL = DetectorExecutor()
+
+
+def _executor_for(runtime: InspectionRuntime | None) -> DetectorExecutor:
+    if runtime is None or runtime.executor is None:
+        return _SEQUENTIAL
+    return runtime.executor
+
+
+def _call_detector(detector: IDetector, context: PromptContext) -> List[Finding]:
+    detector_name = detector.__class__.__name__
+    logger.debug("Running detector: %s", detector_name)
+    try:
+        if isinstance(detector, IContextDetector):
+            return detector.detect_context(context)
+        return detector.detect(context.text)
+    except Exception:
+        logger.exception("Detector '%s' raised an exception", detector_name)
+        raise
+
+
+def _call_detector_batch(detector: IDetector, contexts: List[PromptContext]) -> List[List[Finding]]:
+    detector_name = detector.__class__.__name__
+    logger.debug("Running detector on batch: %s", detector_name)
+    try:
+        if isinstance(detector, IBatchDetector):
+            batch_findings = detector.detect_batch([context.text for context in contexts])
+        elif isinstance(detector, IContextDetector):
+            batch_findings = [detector.detect_context(context) for context in contexts]
+        else:
+            batch_findings = [detector.detect(context.text) for context in contexts]
+    except Exception:
+        logger.exception("Detector '%s' raised an exception", detector_name)
+        raise
+
+    if len(batch_findings) != len(contexts):
+        raise RuntimeError(
+            f"Detector '{detector_name}' returned {len(batch_findings)} results for {len(contexts)} prompts"
+        )
+    return batch_findings
+
+
+def _record_timings(
+    runs: Sequence[DetectorRun],
+    runtime: InspectionRuntime | None,
+    detector_runs: List[DetectorRun] | None,
+) -> None:
+    if detector_runs is not None:
+        detector_runs.extend(runs)
+    if runtime is not None and runtime.metrics is not None:
+        runtime.metrics.observe_detectors(runs)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Detector timings: %s",
+            ", ".join(f"{r.detector_name}=wall {r.wall_ms:.1f}ms/cpu {r.cpu_ms:.1f}ms" for r in runs),
+        )
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from core.cache import InspectionResultCache
+from core.coalescing import RequestCoalescer
+from core.config.loader import config_fingerprint
+from core.config.models import FragmentCacheConfig, InspectionConfig
+from core.execution import DetectorExecutor
+from core.metrics import InspectionMetrics
+
+
+@dataclass(frozen=True)
+class InspectionRuntime:
+    """
+    Shared runtime services used by the rule engine for every request.
+
+    Detectors stay config-driven and stateless; anything that keeps state
+    across requests (caches, executors, ...) lives here and is built once
+    per loaded config.
+    """
+    config_fingerprint: str
+    result_cache: InspectionResultCache | None = None
+    executor: DetectorExecutor | None = None
+    fragment_cache: InspectionResultCache | None = None
+    fragment_cfg: FragmentCacheConfig | None = None
+    conversation_cache: InspectionResultCache | None = None
+    coalescer: RequestCoalescer | None = None
+    metrics: InspectionMetrics | None = None
+
+    @classmethod
+    def from_config(cls, config: InspectionConfig) -> "InspectionRuntime":
+        runtime_cfg = config.runtime
+        return cls(
+            config_fingerprint=config_fingerprint(config),
+            result_cache=InspectionResultCache.from_config(runtime_cfg.result_cache),
+            executor=DetectorExecutor.from_config(runtime_cfg.execution),
+            fragment_cache=InspectionResultCache.from_config(runtime_cfg.fragment_cache),
+            fragment_cfg=runtime_cfg.fragment_cache,
+            conversation_cache=InspectionResultCache.from_config(runtime_cfg.conversation_cache),
+            coalescer=RequestCoalescer.from_config(runtime_cfg.coalescing),
+            metrics=InspectionMetrics.from_config(runtime_cfg.metrics),
+        )
+
+    def close(self) -> None:
+        """Release pooled resources; called on shutdown."""
+        if self.executor is not None:
+            self.executor.shutdown()
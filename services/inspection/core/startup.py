@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, NamedTuple, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class StartupPhase(NamedTuple):
+    """One timed step of startup; times in ms since the timeline began."""
+    name: str
+    start_ms: float
+    duration_ms: float
+
+    @property
+    def end_ms(self) -> float:
+        return self.start_ms + self.duration_ms
+
+
+class StartupTimeline:
+    """
+    Wall-clock timeline of service startup (config parse, model load, ...).
+
+    Phases may run concurrently during parallel warmup, so they are recorded
+    with their start offset and can overlap; `total_ms` is the end of the
+    last phase, not the sum of their durations. Each phase is logged as it
+    completes.
+    """
+
+    def __init__(self) -> None:
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._phases: List[StartupPhase] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record(name, started, time.perf_counter())
+
+    @property
+    def phases(self) -> Tuple[StartupPhase, ...]:
+        with self._lock:
+            return tuple(sorted(self._phases, key=lambda p: p.start_ms))
+
+    @property
+    def total_ms(self) -> float:
+        return max((p.end_ms for p in self.phases), default=0.0)
+
+    def as_dict(self) -> dict:
+        return {
+            "total_ms": round(self.total_ms, 1),
+            "phases": [
+                {"name": p.name, "start_ms": round(p.start_ms, 1), "duration_ms": round(p.duration_ms, 1)}
+                for p in self.phases
+            ],
+        }
+
+    def _record(self, name: str, started: float, ended: float) -> None:
+        phase = StartupPhase(name, (started - self._origin) * 1000.0, (ended - started) * 1000.0)
+        with self._lock:
+            self._phases.append(phase)
+        logger.info("Startup: %s took %.1f ms (at +%.1f ms)", name, phase.duration_ms, phase.start_ms)
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import dataclasses
+import logging
+import pathlib
+import time
+from dataclasses import dataclass
+from typing import Any, Sequence, Tuple
+
+import yaml
+from yaml import YAMLError
+
+from core.config.loader import ConfigError
+from core.config.models import WarmupConfig
+from core.detectors.protocols import IDetector
+from core.models import PromptInspectionRequest
+from core.rules import analyze_prompt
+from core.runtime import InspectionRuntime
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CORPUS_PATH = pathlib.Path(__file__).parent / "config" / "warmup_corpus.yml"
+
+
+@dataclass(frozen=True)
+class WarmupReport:
+    """Per-round latency of a warmup run and whether it settled."""
+    prompts: int
+    round_ms: Tuple[float, ...]
+    stable: bool
+
+    @property
+    def rounds(self) -> int:
+        return len(self.round_ms)
+
+    def as_dict(self) -> dict:
+        return {
+            "prompts": self.prompts,
+            "rounds": self.rounds,
+            "round_ms": [round(ms, 1) for ms in self.round_ms],
+            "stable": self.stable,
+        }
+
+
+def load_warmup_corpus(path: str | pathlib.Path | None = None) -> Tuple[str, ...]:
+    """
+    Read the warmup prompts from a YAML file with a `prompts:` list.
+
+    - Defaults to the bundled warmup_corpus.yml next to config.yml.
+    - A relative path is tried as given, then next to the bundled corpus.
+    """
+    corpus_path = _resolve_corpus_path(path)
+    try:
+        with corpus_path.open("r", encoding="utf-8") as f:
+            data: Any = yaml.safe_load(f)
+    except YAMLError as exc:
+        raise ConfigError(f"Invalid YAML in warmup corpus {corpus_path}: {exc}") from exc
+
+    prompts = data.get("prompts") if isinstance(data, dict) else None
+    if not prompts or not all(isinstance(p, str) and p for p in prompts):
+        raise ConfigError(f"Warmup corpus {corpus_path} must define a non-empty `prompts:` list of strings")
+    return tuple(prompts)
+
+
+def run_warmup(
+    prompts: Sequence[str],
+    detectors: Sequence[IDetector],
+    runtime: InspectionRuntime | None,
+    warmup_cfg: WarmupConfig,
+) -> WarmupReport:
+    """
+    Run ``prompts`` through `analyze_prompt` until latency settles.
+
+    One round inspects every prompt once. Rounds repeat until one takes
+    within `stable_tolerance` of the round before (at least `min_rounds`),
+    or until `max_rounds` / `max_seconds` run out. The runtime's executor
+    is used as in production, but the caches are bypassed (cached answers
+    would make every round after the first look warm) and nothing is
+    recorded in the metrics.
+    """
+    if runtime is not None:
+        runtime = dataclasses.replace(runtime, result_cache=None, fragment_cache=None, metrics=None)
+
+    deadline = time.perf_counter() + warmup_cfg.max_seconds
+    round_ms: list[float] = []
+    stable = False
+
+    while len(round_ms) < warmup_cfg.max_rounds:
+        started = time.perf_counter()
+        for prompt in prompts:
+            analyze_prompt(PromptInspectionRequest(prompt=prompt), detectors, runtime)
+        round_ms.append((time.perf_counter() - started) * 1000.0)
+
+        if len(round_ms) >= max(warmup_cfg.min_rounds, 2):
+            previous, latest = round_ms[-2], round_ms[-1]
+            if abs(latest - previous) <= warmup_cfg.stable_tolerance * previous:
+                stable = True
+                break
+        if time.perf_counter() >= deadline:
+            break
+
+    report = WarmupReport(prompts=len(prompts), round_ms=tuple(round_ms), stable=stable)
+    if stable:
+        logger.info(
+            "Warmup: latency settled after %d round(s) of %d prompts (first %.1f ms, last %.1f ms)",
+            report.rounds, report.prompts, round_ms[0], round_ms[-1],
+        )
+    else:
+        logger.warning(
+            "Warmup: latency did not settle within %d round(s) / %.0fs (rounds ms: %s); serving anyway",
+            report.rounds, warmup_cfg.max_seconds, ", ".join(f"{ms:.1f}" for ms in round_ms),
+        )
+    return report
+
+
+def _resolve_corpus_path(path: str | pathlib.Path | None) -> pathlib.Path:
+    if path is None:
+        candidates = [DEFAULT_CORPUS_PATH]
+    else:
+        provided = pathlib.Path(path).expanduser()
+        candidates = [provided]
+        if not provided.is_absolute():
+            candidates.append(DEFAULT_CORPUS_PATH.parent / provided)
+
+    for candidate in candidates:
+        if candidate.is_file():
+            return candidate
+
+    tried = ", ".join(str(c.resolve()) for c in candidates)
+    raise FileNotFoundError(f"Warmup corpus not found. Looked for: {tried}")
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import gc
+import logging
+import os
+import random
+import signal
+import socket
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict
+
+import uvicorn
+
+from core.config.models import ServerConfig
+
+logger = logging.getLogger(__name__)
+
+# A worker that dies sooner than this after being forked is respawned with a
+# delay, so a crash on startup does not turn into a fork loop.
+_MIN_WORKER_LIFETIME_SECONDS = 5.0
+_RESPAWN_DELAY_SECONDS = 1.0
+
+
+@dataclass(frozen=True)
+class ProcessMemory:
+    """Resident memory of one process in MB, split into shared and private pages."""
+    rss_mb: float
+    shared_mb: float    # pages also mapped by another process (e.g. copy-on-write from the master)
+    private_mb: float   # pages only this process maps: its own allocations and copied pages
+    pss_mb: float       # shared pages divided among the processes mapping them
+
+
+def read_process_memory(pid: int | str = "self") -> ProcessMemory | None:
+    """Memory of ``pid`` from /proc/<pid>/smaps_rollup; None where that is unavailable (non-Linux)."""
+    fields: Dict[str, int] = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", "r", encoding="ascii") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 3 and parts[2] == "kB":
+                    fields[parts[0].rstrip(":")] = int(parts[1])
+    except OSError:
+        return None
+
+    return ProcessMemory(
+        rss_mb=fields.get("Rss", 0) / 1024.0,
+        shared_mb=(fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0)) / 1024.0,
+        private_mb=(fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0)) / 1024.0,
+        pss_mb=fields.get("Pss", 0) / 1024.0,
+    )
+
+
+def prepare_for_fork() -> None:
+    """
+    Keep the master's heap shared once workers are forked.
+
+    Objects alive now (config, detectors, spaCy/Presidio) are moved to the
+    permanent GC generation: the workers' collector then never traverses
+    them, so it does not write to their pages and copy them.
+    """
+    gc.collect()
+    gc.freeze()
+    logger.info("Pre-fork: %d objects frozen out of garbage collection", gc.get_freeze_count())
+
+
+class PreforkServer:
+    """
+    Pre-forking server for an ASGI app whose heavy state is loaded up front.
+
+    - the master binds the socket, freezes its heap out of GC and forks
+      `workers` processes; each runs uvicorn on the shared socket, so the
+      kernel spreads connections across them
+    - workers inherit the loaded config, detectors and spaCy model and
+      share those pages with the master copy-on-write
+    - a worker exits gracefully after `max_requests` (+ random jitter) or
+      when its private memory exceeds `max_worker_memory_mb`; the master
+      forks a fresh one from its clean state
+    - SIGTERM/SIGINT stop the workers gracefully, then the master exits
+    """
+
+    def __init__(self, app: Any, host: str, port: int, server_cfg: ServerConfig) -> None:
+        self._app = app
+        self._host = host
+        self._port = port
+        self._cfg = server_cfg
+        self._workers: Dict[int, tuple[int, float]] = {}   # pid -> (slot, forked at)
+        self._respawn_at: Dict[int, float] = {}            # slot -> earliest respawn time
+        self._stopping = False
+
+    @property
+    def worker_pids(self) -> list[int]:
+        return list(self._workers)
+
+    def run(self) -> None:
+        sock = self._bind()
+        prepare_for_fork()
+
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+        logger.info(
+            "Pre-fork master %d listening on %s:%d with %d worker(s)",
+            os.getpid(), self._host, self._port, self._cfg.workers,
+        )
+
+        try:
+            for slot in range(self._cfg.workers):
+                self._spawn(slot, sock)
+            while not self._stopping:
+                self._reap()
+                self._respawn(sock)
+                time.sleep(0.2)
+        finally:
+            self._stop_workers()
+            sock.close()
+            logger.info("Pre-fork master %d stopped", os.getpid())
+
+    def _bind(self) -> socket.socket:
+        sock = socket.socket(socket.AF_INET6 if ":" in self._host else socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self._host, self._port))
+        sock.listen(2048)
+        sock.set_inheritable(True)
+        return sock
+
+    def _request_stop(self, signum: int, frame: Any) -> None:
+        self._stopping = True
+
+    def _spawn(self, slot: int, sock: socket.socket) -> None:
+        max_requests = self._cfg.max_requests
+        if max_requests:
+            max_requests += random.randint(0, self._cfg.max_requests_jitter)
+
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                self._run_worker(sock, max_requests)
+            except BaseException:
+                logger.exception("Worker %d crashed", os.getpid())
+                code = 1
+            finally:
+                os._exit(code)
+
+        self._workers[pid] = (slot, time.monotonic())
+        logger.info("Forked worker %d (slot %d, max_requests=%s)", pid, slot, max_requests or "unlimited")
+
+    def _run_worker(self, sock: socket.socket, max_requests: int) -> None:
+        # uvicorn installs its own graceful-shutdown handlers
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+
+        config = uvicorn.Config(
+            self._app,
+            lifespan="on",
+            limit_max_requests=max_requests or None,
+            timeout_graceful_shutdown=int(self._cfg.graceful_timeout_seconds),
+        )
+        if self._cfg.max_worker_memory_mb:
+            threading.Thread(target=self._watch_memory, name="worker-memory", daemon=True).start()
+        uvicorn.Server(config).run(sockets=[sock])
+
+    def _watch_memory(self) -> None:
+        limit_mb = self._cfg.max_worker_memory_mb
+        while True:
+            time.sleep(self._cfg.memory_check_interval_seconds)
+            memory = read_process_memory()
+            if memory is None:
+                logger.warning("Worker memory limit set but /proc/self/smaps_rollup is unavailable; not enforced")
+                return
+            if memory.private_mb > limit_mb:
+                logger.warning(
+                    "Worker %d private memory %.0f MB exceeds %.0f MB; recycling",
+                    os.getpid(), memory.private_mb, limit_mb,
+                )
+                # Same graceful path as a shutdown: in-flight requests finish first
+                os.kill(os.getpid(), signal.SIGTERM)
+                return
+
+    def _reap(self) -> None:
+        while self._workers:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            slot, forked_at = self._workers.pop(pid, (None, 0.0))
+            if slot is None:
+                continue
+
+            code = os.waitstatus_to_exitcode(status)
+            lifetime = time.monotonic() - forked_at
+            # uvicorn re-raises the SIGTERM it shut down on, so -SIGTERM is a clean exit too
+            crashed = code not in (0, -signal.SIGTERM)
+            if crashed and lifetime < _MIN_WORKER_LIFETIME_SECONDS:
+                logger.error("Worker %d exited with %d after %.1fs; respawning with a delay", pid, code, lifetime)
+                self._respawn_at[slot] = time.monotonic() + _RESPAWN_DELAY_SECONDS
+            else:
+                logger.info("Worker %d exited with %d after %.0fs; respawning", pid, code, lifetime)
+                self._respawn_at[slot] = time.monotonic()
+
+    def _respawn(self, sock: socket.socket) -> None:
+        now = time.monotonic()
+        for slot, due in list(self._respawn_at.items()):
+            if due <= now and not self._stopping:
+                del self._respawn_at[slot]
+                self._spawn(slot, sock)
+
+    def _stop_workers(self) -> None:
+        for pid in self._workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+        deadline = time.monotonic() + self._cfg.graceful_timeout_seconds + 5.0
+        while self._workers and time.monotonic() < deadline:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid:
+                self._workers.pop(pid, None)
+            else:
+                time.sleep(0.1)
+
+        for pid in self._workers:
+            logger.warning("Worker %d did not stop in time; killing it", pid)
+            try:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
+        self._workers.clear()
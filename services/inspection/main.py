@@ -6,7 +6,7 @@ from infra.logging import configure_logging
 
 
 def main() -> None:
-    """Entry point for running the ML inspection service."""
+    """Entry point for running the ML inspection service in development (production: server.py)."""
     configure_logging()
     uvicorn.run(
         "app:app",
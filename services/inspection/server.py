@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import argparse
+import os
+
+from infra.logging import configure_logging
+
+
+def main() -> None:
+    """
+    Production entry point: pre-forking multi-worker server.
+
+    Loads the config and builds + warms the detectors (spaCy/Presidio
+    model included) once in the master, then forks `runtime.server.workers`
+    uvicorn workers that share them copy-on-write. See `infra.prefork`.
+    """
+    parser = argparse.ArgumentParser(description="Aegis ML Inspection Service (pre-fork server)")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, help="overrides runtime.server.workers")
+    args = parser.parse_args()
+
+    configure_logging()
+
+    from app import app
+    from bootstrap import preload_pipeline
+    from core.config.loader import load_config
+    from infra.prefork import PreforkServer
+
+    preload_pipeline()
+    server_cfg = load_config(os.getenv("INSPECTION_CONFIG_PATH")).runtime.server
+    if args.workers:
+        server_cfg = server_cfg.model_copy(update={"workers": args.workers})
+
+    PreforkServer(app, args.host, args.port, server_cfg).run()
+
+
+if __name__ == "__main__":
+    main()
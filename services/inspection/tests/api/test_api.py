@@ -1,9 +1,16 @@
 from __future__ import annotations
 
+import os
+from contextlib import asynccontextmanager
+
 import pytest
+import yaml
 from fastapi.testclient import TestClient
 
 from app import app
+from core.admission import AdmissionController, AdmissionRejected
+from core.config.loader import config_path
+from core.config.models import AdmissionConfig
 
 
 @pytest.fixture
@@ -31,3 +38,148 @@ def test_inspect_endpoint_with_findings_in_prompt(client: TestClient):
     assert secret_finding["severity"] == "high"
     assert secret_finding["confidence"] is not None
     assert 0.0 <= secret_finding["confidence"] <= 1.0
+
+
+def test_inspect_batch_endpoint_returns_one_result_per_item(client: TestClient):
+    resp = client.post(
+        "/inspect/batch",
+        json={
+            "items": [
+                {"prompt": "Hello world"},
+                {"prompt": "Here is my key: AKIA1234567890ABCDEF"},
+            ]
+        },
+    )
+    assert resp.status_code == 200
+    results = resp.json()["results"]
+    assert len(results) == 2
+    assert results[0]["findings"] == []
+    types = {f["type"] for f in results[1]["findings"]}
+    assert "secret_aws_access_key" in types
+
+
+def test_inspect_batch_endpoint_rejects_empty_batch(client: TestClient):
+    resp = client.post("/inspect/batch", json={"items": []})
+    assert resp.status_code == 422
+
+
+def test_inspect_conversation_endpoint_reports_combined_offsets(client: TestClient):
+    messages = [
+        {"role": "system", "content": "You are a helpful assistant."},
+        {"role": "user", "content": "Here is my key: AKIA1234567890ABCDEF"},
+    ]
+    resp = client.post("/inspect/conversation", json={"messages": messages, "conversationId": "c-1"})
+    assert resp.status_code == 200
+    findings = resp.json()["findings"]
+    secret_finding = next(f for f in findings if f["type"] == "secret_aws_access_key")
+    combined = "\n\n".join(m["content"] for m in messages)
+    assert combined[secret_finding["start"]:secret_finding["end"]] == "AKIA1234567890ABCDEF"
+
+
+def test_health_ready_reports_the_active_config_fingerprint(client: TestClient):
+    ready = client.get("/health/ready").json()
+    assert ready["status"] == "ready"
+    assert ready["config_fingerprint"] == client.app.state.pipelines.active.config_fingerprint
+
+
+def test_health_ready_reports_the_startup_timeline(client: TestClient):
+    startup = client.get("/health/ready").json()["startup"]
+    names = [phase["name"] for phase in startup["phases"]]
+    assert {"config_parse", "model_load", "registry_build", "first_inference", "warmup_corpus"} <= set(names)
+    assert startup["total_ms"] >= max(phase["start_ms"] + phase["duration_ms"] for phase in startup["phases"]) - 0.2
+
+
+def test_health_ready_reports_the_warmup_rounds(client: TestClient):
+    warmup = client.get("/health/ready").json()["warmup"]
+    assert warmup["prompts"] > 0
+    assert warmup["rounds"] == len(warmup["round_ms"]) >= 1
+
+
+def test_admin_reload_is_off_by_default(client: TestClient):
+    assert client.post("/admin/reload").status_code == 404
+
+
+def test_admin_reload_keeps_an_unchanged_config(tmp_path, monkeypatch):
+    raw = yaml.safe_load(config_path(os.getenv("INSPECTION_CONFIG_PATH")).read_text(encoding="utf-8"))
+    raw["runtime"]["reload"] = {"admin_endpoint": True}
+    cfg = tmp_path / "config.yml"
+    cfg.write_text(yaml.safe_dump(raw), encoding="utf-8")
+    monkeypatch.setenv("INSPECTION_CONFIG_PATH", str(cfg))
+
+    with TestClient(app) as client:
+        before = client.get("/health/ready").json()["config_fingerprint"]
+        resp = client.post("/admin/reload")
+    assert resp.status_code == 200
+    assert resp.json() == {"status": "unchanged", "config_fingerprint": before}
+
+
+def test_inspect_is_shed_with_retry_after_when_admission_rejects(client: TestClient):
+    assert isinstance(client.app.state.admission, AdmissionController)
+
+    class _FullQueue:
+        @asynccontextmanager
+        async def admit(self):
+            raise AdmissionRejected(429, "inspection queue is full", 3)
+            yield
+
+    client.app.state.admission = _FullQueue()
+    resp = client.post("/inspect", json={"prompt": "Hello world"})
+    assert resp.status_code == 429
+    assert resp.headers["Retry-After"] == "3"
+    assert resp.json() == {"detail": "inspection queue is full"}
+
+    client.app.state.admission = AdmissionController(AdmissionConfig(enabled=True, max_concurrency=1))
+    assert client.post("/inspect", json={"prompt": "Hello world"}).status_code == 200
+
+
+def _metric(client: TestClient, sample: str) -> float:
+    lines = client.get("/metrics").text.splitlines()
+    return float(next(line.rsplit(" ", 1)[1] for line in lines if line.startswith(sample + " ")))
+
+
+def test_metrics_count_requests_detector_latency_and_findings(client: TestClient):
+    requests = 'aegis_inspection_requests_total{endpoint="/inspect",outcome="ok"}'
+    secrets = 'aegis_inspection_findings_total{type="secret_aws_access_key"}'
+    before = _metric(client, requests)
+
+    assert client.post("/inspect", json={"prompt": "Here is my key: AKIA1234567890ABCDEF"}).status_code == 200
+
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert _metric(client, requests) == before + 1
+    assert _metric(client, secrets) >= 1
+    assert _metric(client, 'aegis_inspection_detector_duration_seconds_count{detector="PresidioPiiDetector"}') >= 1
+    assert _metric(client, "aegis_inspection_threadpool_wait_seconds_count") >= 1
+    assert _metric(client, "aegis_inspection_admission_limit") >= 1
+    assert "# TYPE process_resident_memory_bytes gauge" in resp.text
+
+
+def test_inspect_returns_timings_only_when_asked(client: TestClient):
+    prompt = "Mail bob@example.com\nabout the release #timings"
+    assert "timings" not in client.post("/inspect", json={"prompt": prompt}).json()
+
+    flagged = client.post("/inspect", json={"prompt": prompt + " (flag)", "includeTimings": True})
+    via_header = client.post("/inspect", json={"prompt": prompt + " (header)"}, headers={"X-Aegis-Timings": "1"})
+    for text, resp in ((prompt + " (flag)", flagged), (prompt + " (header)", via_header)):
+        assert resp.status_code == 200
+        timings = resp.json()["timings"]
+        assert timings["promptChars"] == len(text)
+        assert timings["promptLines"] == 2
+        assert {d["detector"] for d in timings["detectors"]} >= {"PresidioPiiDetector", "InjectionPatternDetector"}
+        assert all(d["wallMs"] >= 0 and d["cpuMs"] >= 0 for d in timings["detectors"])
+        assert timings["parseMs"] >= 0 and timings["queueMs"] >= 0 and timings["processingMs"] > 0
+
+
+def test_trailing_newline_does_not_count_as_a_prompt_line(client: TestClient):
+    timings = client.post("/inspect", json={"prompt": "line one\nline two\n", "includeTimings": True}).json()["timings"]
+    assert timings["promptLines"] == 2
+
+
+def test_cached_inspection_reports_no_detector_calls(client: TestClient):
+    body = {"prompt": "Hello again, cache", "includeTimings": True}
+    client.post("/inspect", json=body)
+
+    timings = client.post("/inspect", json=body).json()["timings"]
+    assert timings["detectors"] == []
+    assert timings["promptChars"] == len(body["prompt"])
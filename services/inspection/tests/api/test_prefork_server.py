@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+import pytest
+import yaml
+
+from core.config.loader import config_path
+
+SERVICE_DIR = pathlib.Path(__file__).resolve().parents[2]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _children(pid: int) -> set[int]:
+    children = set()
+    for stat in pathlib.Path("/proc").glob("[0-9]*/stat"):
+        try:
+            fields = stat.read_text().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[1]) == pid:
+            children.add(int(stat.parent.name))
+    return children
+
+
+def _get(url: str) -> dict:
+    with urllib.request.urlopen(url, timeout=5) as resp:
+        return json.loads(resp.read())
+
+
+def _inspect(port: int, prompt: str) -> dict:
+    req = urllib.request.Request(
+        f"http://127.0.0.1:{port}/inspect",
+        data=json.dumps({"prompt": prompt}).encode(),
+        headers={"content-type": "application/json", "connection": "close"},
+    )
+    with urllib.request.urlopen(req, timeout=30) as resp:
+        return json.loads(resp.read())
+
+
+@pytest.fixture
+def server(tmp_path):
+    if not pathlib.Path("/proc/self/stat").exists():
+        pytest.skip("needs /proc to find the workers")
+
+    raw = yaml.safe_load(config_path(os.getenv("INSPECTION_CONFIG_PATH")).read_text(encoding="utf-8"))
+    raw["runtime"]["server"] = {"workers": 1, "max_requests": 3, "max_requests_jitter": 0}
+    raw["runtime"]["reload"] = {"watch": False}
+    cfg = tmp_path / "config.yml"
+    cfg.write_text(yaml.safe_dump(raw), encoding="utf-8")
+
+    port = _free_port()
+    proc = subprocess.Popen(
+        [sys.executable, "server.py", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=SERVICE_DIR,
+        env={**os.environ, "INSPECTION_CONFIG_PATH": str(cfg)},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + 120
+        while True:
+            try:
+                assert _get(f"http://127.0.0.1:{port}/health/ready")["status"] == "ready"
+                break
+            except OSError:
+                if proc.poll() is not None or time.monotonic() > deadline:
+                    pytest.fail("pre-fork server did not become ready")
+                time.sleep(0.5)
+        yield proc, port
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        proc.wait(timeout=60)
+
+
+def test_workers_are_recycled_after_max_requests(server):
+    proc, port = server
+    first = _children(proc.pid)
+    assert len(first) == 1
+
+    for _ in range(4):
+        response = _inspect(port, "Here is my key: AKIA1234567890ABCDEF")
+        assert "secret_aws_access_key" in {f["type"] for f in response["findings"]}
+
+    # uvicorn checks the limit on its 0.1 s tick; the master then forks a replacement
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        current = _children(proc.pid)
+        if current and not current & first:
+            break
+        time.sleep(0.1)
+    else:
+        pytest.fail("worker was not replaced after max_requests")
+
+    response = _inspect(port, "Here is my key: AKIA1234567890ABCDEF")
+    assert "secret_aws_access_key" in {f["type"] for f in response["findings"]}
+
+
+def test_master_stops_its_workers_on_sigterm(server):
+    proc, port = server
+    workers = _children(proc.pid)
+    assert len(workers) == 1
+
+    proc.send_signal(signal.SIGTERM)
+    assert proc.wait(timeout=60) == 0
+    assert not any(pathlib.Path(f"/proc/{pid}").exists() for pid in workers)
@@ -7,6 +7,7 @@ import pytest
 from core.config.loader import (
     DEFAULT_POLICY_PATH,
     ConfigError,
+    config_fingerprint,
     load_config,
 )
 
@@ -42,3 +43,15 @@ def test_load_policy_config_caches_by_path(tmp_path: pathlib.Path):
 
     copy_config = load_config(copy_path)
     assert copy_config is not first  # different cache entry
+
+
+def test_config_fingerprint_is_stable_and_content_based(tmp_path: pathlib.Path):
+    default_fp = config_fingerprint(load_config())
+    assert default_fp == config_fingerprint(load_config())
+
+    changed = tmp_path / "changed.yml"
+    changed.write_text(
+        DEFAULT_POLICY_PATH.read_text(encoding="utf-8").replace("ttl_seconds: 300", "ttl_seconds: 301"),
+        encoding="utf-8",
+    )
+    assert config_fingerprint(load_config(changed)) != default_fp
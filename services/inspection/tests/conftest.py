@@ -1,5 +1,6 @@
 # conftest.py
 import pytest
+from core.config.loader import with_presidio_settings
 from core.models import PromptInspectionRequest, PromptInspectionResponse
 from core.rules import analyze_prompt
 
@@ -10,3 +11,9 @@ def run_with_detector():
         detector.warmup()
         return analyze_prompt(req, (detector,))
     return _run
+
+
+@pytest.fixture(scope="session")
+def presidio_settings():
+    """Return `with_presidio_settings`: a copy of a config with Presidio engine settings changed."""
+    return with_presidio_settings
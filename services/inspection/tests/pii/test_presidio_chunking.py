@@ -0,0 +1,119 @@
+import os
+import random
+
+import pytest
+from presidio_analyzer import RecognizerResult
+
+from core.config.loader import load_config
+from core.detectors.pii.presidio.chunking import merge_chunk_results, split_chunks
+from core.detectors.pii.presidio.detector import PresidioPiiDetector
+from core.detectors.pii.presidio.engine import get_presidio_analyzer
+
+# Pattern-based entities: their spans do not depend on the spaCy model
+_PATTERN_TYPES = {"pii_email", "pii_iban", "pii_ip_address", "pii_credit_card"}
+
+_FILLER = (
+    "The quarterly report covers revenue, churn and hiring plans for the next cycle.",
+    "Please review the attached draft before Friday and leave comments inline.",
+    "Nothing in this paragraph is sensitive at all!",
+)
+_ENTITIES = (
+    "alice.smith@example.com",
+    "DE89 3704 0044 0532 0130 00",
+    "192.168.10.42",
+    "4111 1111 1111 1111",
+)
+
+
+def _document(size: int, seed: int = 7, prose: bool = True) -> str:
+    """Filler with entities; without ``prose`` there are only spaces to cut at."""
+    rnd = random.Random(seed)
+    parts = []
+    length = 0
+    while length < size:
+        if rnd.random() < 0.3:
+            part = f"Contact {rnd.choice(_ENTITIES)} for details."
+        else:
+            part = rnd.choice(_FILLER)
+        if not prose:
+            part = part.rstrip(".!")
+        part += "\n\n" if prose and rnd.random() < 0.2 else " "
+        parts.append(part)
+        length += len(part)
+    return "".join(parts)
+
+
+@pytest.fixture(scope="module")
+def config():
+    return load_config(os.getenv("INSPECTION_CONFIG_PATH"))
+
+
+@pytest.fixture(scope="module")
+def analyzer(config):
+    return get_presidio_analyzer(config)
+
+
+def test_chunks_cover_text_within_size_and_overlap():
+    text = _document(50_000)
+    chunks = split_chunks(text, chunk_chars=2_000, overlap_chars=200)
+
+    assert chunks[0].start == 0 and chunks[-1].end == len(text)
+    for prev, chunk in zip(chunks, chunks[1:]):
+        assert chunk.end - chunk.start <= 2_000
+        assert prev.end - chunk.start <= 200
+        assert chunk.start < prev.end
+        assert prev.own_end == chunk.own_start
+        assert chunk.start <= chunk.own_start and prev.own_end <= prev.end
+        # cuts land on whitespace, never inside a word
+        assert text[prev.end - 1].isspace()
+
+
+def test_chunks_prefer_paragraph_breaks():
+    text = ("word " * 300 + "\n\n") * 4
+    chunks = split_chunks(text, chunk_chars=2_000, overlap_chars=100)
+
+    assert all(text[:chunk.end].endswith("\n\n") for chunk in chunks[:-1])
+
+
+def test_overlap_must_be_less_than_half_a_chunk():
+    with pytest.raises(ValueError):
+        split_chunks("text", chunk_chars=1_000, overlap_chars=500)
+
+
+def test_merge_keeps_each_result_once_and_prefers_the_whole_entity():
+    text = "x" * 200
+    chunks = split_chunks(text, chunk_chars=120, overlap_chars=40)
+    seam = chunks[0].own_end
+    # Same entity seen by both chunks; the second one also sees a truncated tail
+    first = [RecognizerResult("PERSON", seam - 5, seam + 5, 0.85)]
+    second = [
+        RecognizerResult("PERSON", seam - 5 - chunks[1].start, seam + 5 - chunks[1].start, 0.85),
+        RecognizerResult("PERSON", seam + 1 - chunks[1].start, seam + 5 - chunks[1].start, 0.6),
+    ]
+
+    merged = merge_chunk_results(chunks, [first, second])
+
+    assert [(r.entity_type, r.start, r.end) for r in merged] == [("PERSON", seam - 5, seam + 5)]
+
+
+@pytest.mark.parametrize("size, prose", [(30_000, True), (120_000, True), (60_000, False)])
+def test_chunked_offsets_match_unchunked(config, analyzer, presidio_settings, size, prose):
+    text = _document(size, prose=prose)
+    whole = PresidioPiiDetector(presidio_settings(config, chunking={"enabled": False}), analyzer=analyzer)
+    chunked = PresidioPiiDetector(
+        presidio_settings(
+            config, chunking={"enabled": True, "min_chars": 1_000, "chunk_chars": 4_000, "overlap_chars": 300}
+        ),
+        analyzer=analyzer,
+    )
+
+    def spans(findings):
+        return sorted((f.type, f.start, f.end, f.snippet) for f in findings if f.type in _PATTERN_TYPES)
+
+    expected = spans(whole.detect(text))
+    assert expected
+    assert spans(chunked.detect(text)) == expected
+    assert [spans(f) for f in chunked.detect_batch([text, "mail bob@example.com"])] == [
+        expected,
+        spans(whole.detect("mail bob@example.com")),
+    ]
@@ -0,0 +1,36 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from core.config.loader import load_config
+from core.detectors.pii.presidio.detector import PresidioPiiDetector
+
+_PROMPTS = [
+    "Mail bob@example.com or ping 192.168.10.42 before noon.",
+    "Nothing sensitive in here.",
+    "Pay to DE89 3704 0044 0532 0130 00 with card 4111 1111 1111 1111.",
+    "Reach carol@example.org about the invoice.",
+] * 3
+
+
+def test_concurrent_prompts_are_batched_with_unchanged_findings(presidio_settings):
+    config = load_config(os.getenv("INSPECTION_CONFIG_PATH"))
+    in_process = PresidioPiiDetector(config)
+    batched = PresidioPiiDetector(
+        presidio_settings(config, micro_batching={"enabled": True, "max_batch_size": 8, "max_wait_ms": 100})
+    )
+    barrier = threading.Barrier(len(_PROMPTS))
+
+    def detect(prompt):
+        barrier.wait()
+        return batched.detect(prompt)
+
+    with ThreadPoolExecutor(max_workers=len(_PROMPTS)) as pool:
+        results = list(pool.map(detect, _PROMPTS))
+
+    assert results == [in_process.detect(prompt) for prompt in _PROMPTS]
+    stats = batched.batching_stats()
+    assert stats.items == len(_PROMPTS)
+    assert stats.mean_batch_size > 1
+    assert in_process.batching_stats() is None
+    batched.close()
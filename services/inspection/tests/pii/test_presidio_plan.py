@@ -0,0 +1,50 @@
+from presidio_analyzer import RecognizerRegistry
+
+from core.config.loader import load_config
+from core.detectors.pii.presidio.engine import _prune_registry
+from core.detectors.pii.presidio.plan import build_presidio_plan
+
+
+def _presidio_cfg(**detector_updates):
+    presidio_cfg = load_config().detection.pii.engines.presidio
+    detectors = {
+        key: cfg.model_copy(update=detector_updates.get(key, {}))
+        for key, cfg in presidio_cfg.detectors.items()
+    }
+    return presidio_cfg.model_copy(update={"detectors": detectors})
+
+
+def test_plan_covers_only_enabled_entities():
+    plan = build_presidio_plan(_presidio_cfg(phone={"enabled": False}, person={"enabled": False}))
+
+    assert "PHONE_NUMBER" not in plan.entities
+    assert "PERSON" not in plan.entities
+    assert {"EMAIL_ADDRESS", "IBAN_CODE", "CUSTOM"} <= set(plan.entities)
+    assert set(plan.entity_lookup) == set(plan.entities) == set(plan.thresholds)
+
+
+def test_plan_resolves_thresholds_and_pushes_down_the_lowest():
+    plan = build_presidio_plan(_presidio_cfg(email={"score_threshold": 0.2}, iban={"score_threshold": None}))
+
+    assert plan.thresholds["EMAIL_ADDRESS"] == 0.2
+    assert plan.thresholds["IBAN_CODE"] == load_config().detection.pii.engines.presidio.default_score_threshold
+    assert plan.score_threshold == 0.2
+
+
+def test_plan_without_enabled_entities_is_empty():
+    cfg = _presidio_cfg(**{key: {"enabled": False} for key in load_config().detection.pii.engines.presidio.detectors})
+
+    plan = build_presidio_plan(cfg)
+
+    assert plan.entities == ()
+    assert plan.score_threshold == cfg.default_score_threshold
+
+
+def test_registry_is_pruned_to_enabled_entities():
+    registry = RecognizerRegistry()
+    registry.load_predefined_recognizers()
+
+    _prune_registry(registry, ["EMAIL_ADDRESS", "IBAN_CODE"])
+
+    assert registry.recognizers
+    assert all({"EMAIL_ADDRESS", "IBAN_CODE"} & set(r.supported_entities) for r in registry.recognizers)
@@ -0,0 +1,68 @@
+import multiprocessing
+import os
+import signal
+
+import pytest
+
+from core.config.loader import load_config
+from core.detectors.pii.presidio.detector import PresidioPiiDetector
+
+_PROMPTS = [
+    "Mail bob@example.com or ping 192.168.10.42 before noon.",
+    "",
+    "Nothing sensitive in here.",
+    "Pay to DE89 3704 0044 0532 0130 00 with card 4111 1111 1111 1111.",
+    # longer than chunking.min_chars: chunked inside the worker
+    "Contact alice.smith@example.com for details. " * 600,
+]
+
+
+@pytest.fixture(scope="module")
+def config():
+    return load_config(os.getenv("INSPECTION_CONFIG_PATH"))
+
+
+@pytest.fixture(scope="module")
+def pooled(config, presidio_settings):
+    detector = PresidioPiiDetector(presidio_settings(config, process_pool={"enabled": True, "workers": 1}))
+    detector.warmup()
+    yield detector
+    detector.close()
+
+
+def _worker_pids() -> set[int]:
+    return {p.pid for p in multiprocessing.active_children()}
+
+
+def test_process_pool_matches_in_process_findings(config, pooled):
+    in_process = PresidioPiiDetector(config)
+
+    assert pooled.detect_batch(_PROMPTS) == in_process.detect_batch(_PROMPTS)
+    for prompt in _PROMPTS:
+        assert pooled.detect(prompt) == in_process.detect(prompt)
+
+
+def test_dead_worker_is_replaced_and_call_retried(pooled):
+    expected = pooled.detect(_PROMPTS[0])
+    before = _worker_pids()
+    assert before
+    for pid in before:
+        os.kill(pid, signal.SIGKILL)
+
+    assert pooled.detect(_PROMPTS[0]) == expected
+    assert _worker_pids() and not _worker_pids() & before
+
+
+def test_close_stops_workers_and_warmup_restarts_them(config, presidio_settings):
+    detector = PresidioPiiDetector(presidio_settings(config, process_pool={"enabled": True, "workers": 1}))
+    before = _worker_pids()
+    detector.warmup()
+    started = _worker_pids() - before
+    assert len(started) == 1
+
+    detector.close()
+    assert not _worker_pids() & started
+
+    detector.warmup()
+    assert detector.detect(_PROMPTS[0])
+    detector.close()
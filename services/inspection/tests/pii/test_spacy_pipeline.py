@@ -0,0 +1,38 @@
+import pytest
+import spacy
+
+from core.config.loader import load_config
+from core.detectors.pii.presidio.engine import _PrunedSpacyNlpEngine, resolve_spacy_model
+
+
+def _presidio_cfg(**updates):
+    return load_config().detection.pii.engines.presidio.model_copy(update=updates)
+
+
+def test_model_tier_swaps_the_size_suffix():
+    assert resolve_spacy_model(_presidio_cfg(default_spacy_model="en_core_web_lg", spacy_model_tier="sm")) == "en_core_web_sm"
+    assert resolve_spacy_model(_presidio_cfg(default_spacy_model="de_core_news_md", spacy_model_tier="lg")) == "de_core_news_lg"
+
+
+def test_without_tier_the_model_is_used_as_is():
+    assert resolve_spacy_model(_presidio_cfg(default_spacy_model="/models/custom", spacy_model_tier=None)) == "/models/custom"
+
+
+def test_tier_needs_a_sized_model_name():
+    with pytest.raises(ValueError, match="spacy_model_tier"):
+        resolve_spacy_model(_presidio_cfg(default_spacy_model="/models/custom", spacy_model_tier="md"))
+
+
+def test_excluded_components_are_never_loaded(tmp_path):
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    nlp.add_pipe("attribute_ruler")
+    nlp.to_disk(tmp_path)
+
+    engine = _PrunedSpacyNlpEngine(
+        models=[{"lang_code": "en", "model_name": str(tmp_path)}],
+        exclude=("sentencizer",),
+    )
+    engine.load()
+
+    assert engine.get_nlp("en").pipe_names == ["attribute_ruler"]
@@ -0,0 +1,206 @@
+import asyncio
+import random
+
+import pytest
+
+from core.admission import AdmissionController, AdmissionRejected, AimdLimit
+from core.config.models import AdaptiveConcurrencyConfig, AdmissionConfig
+
+
+def _controller(**cfg) -> AdmissionController:
+    return AdmissionController(AdmissionConfig(enabled=True, **cfg))
+
+
+async def _hold(controller: AdmissionController, release: asyncio.Event) -> float:
+    async with controller.admit() as queue_ms:
+        await release.wait()
+    return queue_ms
+
+
+def test_disabled_config_builds_no_controller():
+    assert AdmissionController.from_config(AdmissionConfig()) is None
+    assert AdmissionController.from_config(AdmissionConfig(enabled=True)) is not None
+
+
+def test_requests_beyond_concurrency_wait_and_report_queue_time():
+    async def scenario():
+        controller = _controller(max_concurrency=1, max_queue=4)
+        release = asyncio.Event()
+        first = asyncio.create_task(_hold(controller, release))
+        second = asyncio.create_task(_hold(controller, release))
+        await asyncio.sleep(0.05)
+
+        stats = controller.stats()
+        assert (stats.limit, stats.in_flight, stats.queued) == (1, 1, 1)
+
+        release.set()
+        return await first, await second, controller.stats()
+
+    first_ms, second_ms, stats = asyncio.run(scenario())
+
+    assert first_ms < 5.0
+    assert second_ms >= 40.0
+    assert (stats.admitted, stats.in_flight, stats.queued) == (2, 0, 0)
+
+
+def test_full_queue_is_rejected_at_once_with_429():
+    async def scenario():
+        controller = _controller(max_concurrency=1, max_queue=1, retry_after_seconds=2)
+        release = asyncio.Event()
+        running = [asyncio.create_task(_hold(controller, release)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+
+        with pytest.raises(AdmissionRejected) as rejected:
+            async with controller.admit():
+                pass
+
+        release.set()
+        await asyncio.gather(*running)
+        return rejected.value, controller.stats()
+
+    rejected, stats = asyncio.run(scenario())
+
+    assert (rejected.status_code, rejected.retry_after_seconds) == (429, 2)
+    assert stats.rejected_queue_full == 1 and stats.admitted == 2
+
+
+def test_queue_wait_past_the_timeout_is_rejected_with_503():
+    async def scenario():
+        controller = _controller(max_concurrency=1, max_queue=4, queue_timeout_seconds=0.05)
+        release = asyncio.Event()
+        running = asyncio.create_task(_hold(controller, release))
+        await asyncio.sleep(0.01)
+
+        with pytest.raises(AdmissionRejected) as rejected:
+            async with controller.admit():
+                pass
+
+        release.set()
+        await running
+        # the timed-out waiter gave its place back
+        async with controller.admit():
+            pass
+        return rejected.value, controller.stats()
+
+    rejected, stats = asyncio.run(scenario())
+
+    assert rejected.status_code == 503
+    assert stats.rejected_queue_timeout == 1
+    assert (stats.admitted, stats.queued, stats.in_flight) == (2, 0, 0)
+
+
+def test_cancelled_waiter_does_not_leak_its_slot():
+    async def scenario():
+        controller = _controller(max_concurrency=1, max_queue=4)
+        release = asyncio.Event()
+        running = asyncio.create_task(_hold(controller, release))
+        waiting = asyncio.create_task(_hold(controller, asyncio.Event()))
+        await asyncio.sleep(0.01)
+
+        waiting.cancel()
+        release.set()
+        await running
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        return controller.stats()
+
+    stats = asyncio.run(scenario())
+
+    assert (stats.in_flight, stats.queued) == (0, 0)
+
+
+def _window(limit: AimdLimit, latency_ms: float, in_flight: int) -> None:
+    for _ in range(max(5, limit.limit)):
+        limit.on_admit(in_flight)
+        limit.on_sample(latency_ms)
+
+
+def test_aimd_starts_at_the_minimum_and_grows_by_one_per_saturated_window():
+    limit = AimdLimit(AdaptiveConcurrencyConfig(enabled=True, window=5, target_latency_ms=50, min_concurrency=4))
+    assert limit.limit == 4
+
+    _window(limit, 10.0, in_flight=4)
+    _window(limit, 10.0, in_flight=5)
+    assert limit.limit == 6
+
+    # never reached: no evidence that more concurrency would help
+    _window(limit, 10.0, in_flight=2)
+    assert limit.limit == 6 and limit.increases == 2
+
+
+def test_aimd_shrinks_multiplicatively_above_target_within_bounds():
+    cfg = AdaptiveConcurrencyConfig(
+        enabled=True, window=5, target_latency_ms=50, decrease_factor=0.5, min_concurrency=2, max_concurrency=8
+    )
+    limit = AimdLimit(cfg)
+    for _ in range(10):
+        _window(limit, 10.0, in_flight=limit.limit)
+    assert limit.limit == 8
+
+    _window(limit, 80.0, in_flight=8)
+    assert limit.limit == 4
+    _window(limit, 80.0, in_flight=4)
+    _window(limit, 80.0, in_flight=4)
+    assert limit.limit == 2 and limit.decreases == 2
+
+
+def test_aimd_without_target_backs_off_from_the_no_load_latency():
+    limit = AimdLimit(AdaptiveConcurrencyConfig(enabled=True, window=5, latency_tolerance=2.0))
+
+    _window(limit, 10.0, in_flight=1)
+    _window(limit, 15.0, in_flight=2)
+    _window(limit, 18.0, in_flight=3)
+    # no-load estimate: 10 ms, from the only window with one request in flight
+    assert limit.limit == 4 and limit.target_ms == pytest.approx(20.0)
+
+    _window(limit, 30.0, in_flight=4)
+    assert limit.limit == 3
+
+
+def _drive(limit: AimdLimit, latency_ms, samples: int) -> list[int]:
+    """Every slot busy; ``latency_ms(limit)`` is the latency of the next sample."""
+    seen = []
+    for _ in range(samples):
+        limit.on_admit(limit.limit)
+        limit.on_sample(latency_ms(limit.limit))
+        seen.append(limit.limit)
+    return seen[samples // 2:]
+
+
+def test_aimd_ignores_a_heavy_tail_of_slow_prompts_when_latency_does_not_grow_with_load():
+    rng = random.Random(7)
+
+    def mixed_prompt_sizes(_limit: int) -> float:
+        # mostly short chat turns, some long RAG prompts, a few huge ones
+        roll = rng.random()
+        return 200.0 if roll < 0.05 else 40.0 if roll < 0.20 else rng.uniform(1.5, 3.0)
+
+    limits = _drive(AimdLimit(AdaptiveConcurrencyConfig(enabled=True)), mixed_prompt_sizes, 20_000)
+
+    assert min(limits) >= 24
+
+
+def test_aimd_settles_near_the_knee_when_latency_grows_with_load():
+    rng = random.Random(7)
+
+    def knee_at_four(limit: int) -> float:
+        base = 200.0 if rng.random() < 0.05 else 2.0
+        return base * max(1.0, limit / 4)
+
+    limits = _drive(AimdLimit(AdaptiveConcurrencyConfig(enabled=True)), knee_at_four, 20_000)
+
+    # latency_tolerance 2.0: up to about twice the knee
+    assert 4 <= min(limits) and max(limits) <= 10
+
+
+def test_aimd_remeasures_the_no_load_latency_after_the_host_got_slower():
+    limit = AimdLimit(AdaptiveConcurrencyConfig(enabled=True, window=5, min_concurrency=1, max_concurrency=8))
+    _drive(limit, lambda _: 10.0, 400)
+    assert limit.limit == 8 and limit.target_ms == pytest.approx(20.0)
+
+    # every request now takes 3x as long, whatever the concurrency
+    _drive(limit, lambda _: 30.0, 400)
+
+    # backed off to one request in flight, measured the new latency there and grew again
+    assert limit.limit == 8 and limit.target_ms > 30.0
+    assert limit.decreases >= 1
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import os
+import pathlib
+import time
+
+import pytest
+import yaml
+
+from core.config.loader import config_fingerprint, config_path, load_config
+from core.detectors.pii.presidio.engine import get_presidio_analyzer
+from core.pipeline import InspectionPipeline, PipelineHolder
+from core.reload import ConfigReloader
+from core.runtime import InspectionRuntime
+
+
+class _CountingExecutor:
+    """Executor double that only counts shutdowns."""
+
+    mode = "sequential"
+
+    def __init__(self) -> None:
+        self.shutdowns = 0
+
+    def shutdown(self) -> None:
+        self.shutdowns += 1
+
+
+def _pipeline(config, fingerprint: str | None = None) -> InspectionPipeline:
+    return InspectionPipeline(
+        config=config,
+        detectors=(),
+        runtime=InspectionRuntime(
+            config_fingerprint=fingerprint or config_fingerprint(config),
+            executor=_CountingExecutor(),
+        ),
+    )
+
+
+@pytest.fixture
+def config_file(tmp_path: pathlib.Path) -> pathlib.Path:
+    path = tmp_path / "config.yml"
+    path.write_text(config_path(os.getenv("INSPECTION_CONFIG_PATH")).read_text())
+    return path
+
+
+def _set_threshold(path: pathlib.Path, value: float) -> None:
+    raw = yaml.safe_load(path.read_text())
+    raw["detection"]["pii"]["engines"]["presidio"]["default_score_threshold"] = value
+    path.write_text(yaml.safe_dump(raw))
+
+
+def test_swap_waits_for_in_flight_requests():
+    config = load_config()
+    old, new = _pipeline(config, "old"), _pipeline(config, "new")
+    holder = PipelineHolder(old)
+
+    with holder.lease() as leased:
+        holder.swap(new)
+        assert leased is old
+        assert holder.active is new
+        assert old.runtime.executor.shutdowns == 0
+
+    assert old.runtime.executor.shutdowns == 1
+    with holder.lease() as leased:
+        assert leased is new
+
+
+def test_reload_swaps_only_on_a_changed_config(config_file):
+    holder = PipelineHolder(_pipeline(load_config(config_file)))
+    reloader = ConfigReloader(holder, _pipeline, path=config_file)
+    first = holder.active.config_fingerprint
+
+    assert reloader.reload().status == "unchanged"
+
+    _set_threshold(config_file, 0.77)
+    result = reloader.reload()
+
+    assert result.status == "reloaded"
+    assert result.config_fingerprint == holder.active.config_fingerprint != first
+    assert holder.active.config.detection.pii.engines.presidio.default_score_threshold == 0.77
+    assert reloader.reloads == 1
+
+
+def test_broken_config_keeps_the_running_pipeline(config_file):
+    holder = PipelineHolder(_pipeline(load_config(config_file)))
+    reloader = ConfigReloader(holder, _pipeline, path=config_file)
+    active = holder.active
+
+    config_file.write_text("detection: [unclosed")
+    result = reloader.reload()
+
+    assert result.status == "failed"
+    assert holder.active is active
+    assert "ConfigError" in reloader.last_error
+
+
+def test_watcher_reloads_when_the_file_changes(config_file):
+    holder = PipelineHolder(_pipeline(load_config(config_file)))
+    reloader = ConfigReloader(holder, _pipeline, path=config_file, poll_interval_seconds=0.02)
+    reloader.start()
+    try:
+        _set_threshold(config_file, 0.66)
+        deadline = time.monotonic() + 5.0
+        while reloader.reloads == 0 and time.monotonic() < deadline:
+            time.sleep(0.02)
+    finally:
+        reloader.stop()
+
+    assert holder.active.config.detection.pii.engines.presidio.default_score_threshold == 0.66
+
+
+def test_presidio_rebuild_reuses_the_loaded_spacy_model(presidio_settings):
+    config = load_config(os.getenv("INSPECTION_CONFIG_PATH"))
+    changed = presidio_settings(config, default_score_threshold=0.9)
+
+    before = get_presidio_analyzer(config)
+    after = get_presidio_analyzer(changed)
+
+    assert after is not before
+    assert after.nlp_engine is before.nlp_engine
+    assert get_presidio_analyzer(changed) is after
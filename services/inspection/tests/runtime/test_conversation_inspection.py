@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import pytest
+
+from core.cache import InspectionResultCache
+from core.config.loader import load_config
+from core.models import ConversationInspectionRequest, ConversationMessage, Finding
+from core.rules import analyze_conversation
+from core.runtime import InspectionRuntime
+
+
+class _WordDetector:
+    """Detector double that flags every 'secret' and records what it analyzed."""
+
+    def __init__(self) -> None:
+        self.prompts: list[str] = []
+
+    def warmup(self) -> None:
+        pass
+
+    def detect(self, prompt: str) -> list[Finding]:
+        self.prompts.append(prompt)
+        findings = []
+        start = prompt.find("secret")
+        while start != -1:
+            findings.append(
+                Finding(
+                    type="word",
+                    start=start,
+                    end=start + 6,
+                    snippet="secret",
+                    message="m",
+                    severity="low",
+                    confidence=1.0,
+                )
+            )
+            start = prompt.find("secret", start + 1)
+        return findings
+
+
+def _conversation(*contents: str) -> ConversationInspectionRequest:
+    return ConversationInspectionRequest(
+        messages=[ConversationMessage(role="user", content=content) for content in contents],
+        conversationId="c-1",
+    )
+
+
+@pytest.fixture
+def runtime():
+    cache = InspectionResultCache(max_entries=100, max_bytes=1_000_000, ttl_seconds=60)
+    return InspectionRuntime(config_fingerprint="fp", conversation_cache=cache)
+
+
+def test_offsets_refer_to_the_combined_prompt(runtime):
+    req = _conversation("You are helpful.", "my secret is x", "", "another secret")
+    detector = _WordDetector()
+
+    resp = analyze_conversation(req, (detector,), runtime)
+
+    combined = req.combined_prompt()
+    assert [combined[f.start:f.end] for f in resp.findings] == ["secret", "secret"]
+    assert [f.start for f in resp.findings] == [combined.find("secret"), combined.rfind("secret")]
+    assert "" not in detector.prompts
+
+
+def test_only_new_messages_are_analyzed_each_turn(runtime):
+    detector = _WordDetector()
+    history = ["system prompt", "first secret question", "answer"]
+
+    analyze_conversation(_conversation(*history), (detector,), runtime)
+    detector.prompts.clear()
+
+    resp = analyze_conversation(_conversation(*history, "second secret question"), (detector,), runtime)
+
+    assert detector.prompts == ["second secret question"]
+    assert len(resp.findings) == 2
+    assert runtime.conversation_cache.stats().hits == 3
+
+
+def test_earlier_turns_are_reused_with_the_result_cache_off():
+    config = load_config()
+    runtime_cfg = config.runtime.model_copy(
+        update={"result_cache": config.runtime.result_cache.model_copy(update={"enabled": False})}
+    )
+    runtime = InspectionRuntime.from_config(config.model_copy(update={"runtime": runtime_cfg}))
+    detector = _WordDetector()
+    try:
+        analyze_conversation(_conversation("system prompt", "first question"), (detector,), runtime)
+        detector.prompts.clear()
+        analyze_conversation(_conversation("system prompt", "first question", "follow-up"), (detector,), runtime)
+    finally:
+        runtime.close()
+
+    assert runtime.result_cache is None
+    assert detector.prompts == ["follow-up"]
+
+
+def test_repeated_messages_are_analyzed_once(runtime):
+    detector = _WordDetector()
+
+    resp = analyze_conversation(_conversation("secret", "secret"), (detector,), runtime)
+
+    assert detector.prompts == ["secret"]
+    assert [(f.start, f.end) for f in resp.findings] == [(0, 6), (8, 14)]
+
+
+def test_without_a_cache_every_message_is_analyzed():
+    detector = _WordDetector()
+
+    analyze_conversation(_conversation("a", "b"), (detector,), InspectionRuntime(config_fingerprint="fp"))
+
+    assert detector.prompts == ["a", "b"]
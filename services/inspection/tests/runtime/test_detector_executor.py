@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from core.execution import DetectorExecutor
+from core.models import Finding, PromptInspectionRequest
+from core.rules import analyze_prompt
+from core.runtime import InspectionRuntime
+
+
+class _SleepyDetector:
+    """Detector double that sleeps, then reports one finding tagged with its name."""
+
+    def __init__(self, name: str, delay: float, fail: bool = False) -> None:
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.thread_name: str | None = None
+
+    def warmup(self) -> None:
+        pass
+
+    def detect(self, prompt: str) -> list[Finding]:
+        self.thread_name = threading.current_thread().name
+        time.sleep(self.delay)
+        if self.fail:
+            raise ValueError(f"{self.name} failed")
+        return [
+            Finding(type=self.name, start=0, end=1, snippet="x", message="m", severity="low", confidence=1.0)
+        ]
+
+
+def test_parallel_mode_merges_findings_in_detector_order():
+    detectors = (
+        _SleepyDetector("first", 0.05),
+        _SleepyDetector("second", 0.0),
+        _SleepyDetector("third", 0.02),
+    )
+    executor = DetectorExecutor(mode="parallel", max_workers=4)
+    runtime = InspectionRuntime(config_fingerprint="fp", executor=executor)
+
+    try:
+        resp = analyze_prompt(PromptInspectionRequest(prompt="p", meta=None), detectors, runtime)
+    finally:
+        executor.shutdown()
+
+    assert [f.type for f in resp.findings] == ["first", "second", "third"]
+    assert detectors[1].thread_name != detectors[0].thread_name
+
+
+def test_parallel_mode_overlaps_detector_work():
+    detectors = tuple(_SleepyDetector(f"d{i}", 0.1) for i in range(3))
+    executor = DetectorExecutor(mode="parallel", max_workers=4)
+
+    try:
+        started = time.perf_counter()
+        runs = executor.run(detectors, lambda d: d.detect("p"))
+        elapsed = time.perf_counter() - started
+    finally:
+        executor.shutdown()
+
+    assert elapsed < 0.25
+    assert [r.detector_name for r in runs] == ["_SleepyDetector"] * 3
+    assert all(r.wall_ms >= 90 for r in runs)
+    assert all(r.cpu_ms < r.wall_ms for r in runs)
+
+
+def test_parallel_mode_reraises_first_error_in_detector_order():
+    detectors = (
+        _SleepyDetector("ok", 0.0),
+        _SleepyDetector("slow-bad", 0.05, fail=True),
+        _SleepyDetector("fast-bad", 0.0, fail=True),
+    )
+    executor = DetectorExecutor(mode="parallel", max_workers=4)
+
+    try:
+        with pytest.raises(ValueError, match="slow-bad"):
+            executor.run(detectors, lambda d: d.detect("p"))
+    finally:
+        executor.shutdown()
+
+
+def test_sequential_mode_runs_in_calling_thread():
+    detectors = (_SleepyDetector("a", 0.0), _SleepyDetector("b", 0.0))
+    executor = DetectorExecutor(mode="sequential")
+
+    runs = executor.run(detectors, lambda d: d.detect("p"))
+
+    caller = threading.current_thread().name
+    assert all(d.thread_name == caller for d in detectors)
+    assert [r.result[0].type for r in runs] == ["a", "b"]
@@ -0,0 +1,107 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from core.batching import BatchingStats
+from core.cache import InspectionResultCache
+from core.coalescing import RequestCoalescer
+from core.metrics import Counter, Histogram, InspectionMetrics
+from core.models import Finding, PromptInspectionRequest
+from core.rules import analyze_prompt
+from core.runtime import InspectionRuntime
+
+
+class _EchoDetector:
+    def warmup(self) -> None:
+        pass
+
+    def detect(self, prompt: str) -> list[Finding]:
+        return [
+            Finding(type="echo", start=0, end=len(prompt), snippet=prompt, message="m", severity="low", confidence=1.0)
+        ]
+
+
+def _sample_lines(text: str) -> dict[str, str]:
+    return dict(line.rsplit(" ", 1) for line in text.splitlines() if line and not line.startswith("#"))
+
+
+def test_histogram_exposes_cumulative_buckets_sum_and_count():
+    histogram = Histogram("h_seconds", "test", buckets=(0.1, 1.0), labelnames=("stage",), labelsets=[("a",)])
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.labels("a").observe(value)
+
+    samples = {(name, labels.get("le")): value for name, labels, value in histogram.samples()}
+
+    assert samples[("h_seconds_bucket", "0.1")] == 2
+    assert samples[("h_seconds_bucket", "1")] == 3
+    assert samples[("h_seconds_bucket", "+Inf")] == 4
+    assert samples[("h_seconds_count", None)] == 4
+    assert samples[("h_seconds_sum", None)] == pytest.approx(3.65)
+
+
+def test_concurrent_increments_are_not_lost():
+    counter = Counter("c_total", "test")
+    barrier = threading.Barrier(8)
+
+    def work(_):
+        barrier.wait()
+        for _ in range(10_000):
+            counter.inc()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(work, range(8)))
+
+    # the pool's threads have exited: their slots are folded into the retired total
+    assert counter.labels().value() == 80_000
+    assert counter.labels().value() == 80_000
+
+
+def test_label_values_outside_the_registered_set_are_added_on_first_use():
+    counter = Counter("findings_total", "test", labelnames=("type",))
+
+    counter.labels("email").inc()
+    counter.labels("email").inc(2)
+
+    assert list(counter.samples()) == [("findings_total", {"type": "email"}, 3.0)]
+
+
+def test_analyze_prompt_records_detector_latency():
+    metrics = InspectionMetrics()
+    runtime = InspectionRuntime(config_fingerprint="fp", metrics=metrics)
+
+    analyze_prompt(PromptInspectionRequest(prompt="hello"), [_EchoDetector()], runtime)
+
+    samples = _sample_lines(metrics.render())
+    assert samples['aegis_inspection_detector_duration_seconds_count{detector="_EchoDetector"}'] == "1"
+    # pre-registered detectors are exposed before their first call
+    assert samples['aegis_inspection_detector_duration_seconds_count{detector="PresidioPiiDetector"}'] == "0"
+
+
+def test_runtime_stats_are_read_at_scrape_time():
+    cache = InspectionResultCache(max_entries=10, max_bytes=1_000_000, ttl_seconds=60)
+    runtime = InspectionRuntime(config_fingerprint="fp", result_cache=cache, coalescer=RequestCoalescer())
+    for _ in range(3):
+        analyze_prompt(PromptInspectionRequest(prompt="hello"), [_EchoDetector()], runtime)
+
+    samples = _sample_lines(InspectionMetrics().render(runtime=runtime, reloads=2, rss_bytes=1024.0))
+
+    assert samples['aegis_inspection_cache_hits_total{cache="result"}'] == "2"
+    assert samples['aegis_inspection_cache_misses_total{cache="result"}'] == "1"
+    assert samples["aegis_inspection_coalesced_requests_total"] == "0"
+    assert samples["aegis_inspection_config_reloads_total"] == "2"
+    assert samples["process_resident_memory_bytes"] == "1024"
+
+
+def test_micro_batching_settings_and_queue_wait_are_exported():
+    class _BatchingDetector(_EchoDetector):
+        def batching_stats(self) -> BatchingStats:
+            return BatchingStats(max_batch_size=16, max_wait_ms=2.0, batches=3, items=30, queue_wait_ms=1500.0)
+
+    samples = _sample_lines(InspectionMetrics().render(detectors=[_BatchingDetector()]))
+
+    labels = '{detector="_BatchingDetector"}'
+    assert samples[f"aegis_inspection_micro_batch_items_total{labels}"] == "30"
+    assert samples[f"aegis_inspection_micro_batch_queue_wait_seconds_total{labels}"] == "1.5"
+    assert samples[f"aegis_inspection_micro_batch_max_size{labels}"] == "16"
+    assert samples[f"aegis_inspection_micro_batch_max_wait_seconds{labels}"] == "0.002"
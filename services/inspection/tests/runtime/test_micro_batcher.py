@@ -0,0 +1,89 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from core.batching import MicroBatcher
+
+
+class _Recorder:
+    def __init__(self, fail_on=None):
+        self.batches = []
+        self._fail_on = fail_on
+
+    def __call__(self, items):
+        self.batches.append(list(items))
+        if self._fail_on in items:
+            raise ValueError("boom")
+        return [item * 2 for item in items]
+
+
+def _submit_together(batcher, items):
+    barrier = threading.Barrier(len(items))
+
+    def call(item):
+        barrier.wait()
+        return batcher.submit(item)
+
+    with ThreadPoolExecutor(max_workers=len(items)) as pool:
+        return list(pool.map(call, items))
+
+
+def test_concurrent_submits_share_a_batch_and_get_their_own_result():
+    recorder = _Recorder()
+    batcher = MicroBatcher(recorder, max_batch_size=8, max_wait_ms=200)
+
+    assert _submit_together(batcher, list(range(6))) == [0, 2, 4, 6, 8, 10]
+
+    assert len(recorder.batches) < 6
+    stats = batcher.stats()
+    assert stats.items == 6 and stats.batches == len(recorder.batches)
+    assert stats.mean_batch_size > 1
+    batcher.close()
+
+
+def test_batch_is_closed_at_max_batch_size():
+    recorder = _Recorder()
+    batcher = MicroBatcher(recorder, max_batch_size=2, max_wait_ms=200)
+
+    _submit_together(batcher, list(range(5)))
+
+    assert all(len(batch) <= 2 for batch in recorder.batches)
+    assert batcher.stats().full_batches >= 1
+    batcher.close()
+
+
+def test_single_submit_waits_at_most_the_window():
+    batcher = MicroBatcher(_Recorder(), max_batch_size=8, max_wait_ms=0)
+
+    assert batcher.submit(21) == 42
+    assert batcher.stats().batches == 1
+    batcher.close()
+
+
+def test_batch_error_reaches_every_caller_of_that_batch():
+    batcher = MicroBatcher(_Recorder(fail_on=3), max_batch_size=8, max_wait_ms=0)
+
+    with pytest.raises(ValueError):
+        batcher.submit(3)
+    assert batcher.submit(4) == 8
+    batcher.close()
+
+
+def test_short_result_list_fails_the_callers_instead_of_leaving_them_waiting():
+    batcher = MicroBatcher(lambda items: [], max_batch_size=8, max_wait_ms=0)
+
+    with pytest.raises(RuntimeError, match="returned 0 result"):
+        batcher.submit(1)
+    batcher.close()
+
+
+def test_submit_after_close_starts_a_new_collector():
+    batcher = MicroBatcher(_Recorder(), max_batch_size=4, max_wait_ms=0)
+    assert batcher.submit(1) == 2
+
+    batcher.close()
+
+    assert batcher.submit(2) == 4
+    assert batcher.stats().batches == 2
+    batcher.close()
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import gc
+
+import pytest
+
+from infra.prefork import prepare_for_fork, read_process_memory
+
+
+def test_process_memory_splits_resident_pages():
+    memory = read_process_memory()
+    if memory is None:
+        pytest.skip("/proc/self/smaps_rollup not available")
+    assert memory.rss_mb > 0
+    assert memory.shared_mb + memory.private_mb == pytest.approx(memory.rss_mb, abs=1.0)
+    assert memory.pss_mb <= memory.rss_mb
+
+
+def test_process_memory_of_a_missing_process_is_none():
+    assert read_process_memory(2**22 + 1) is None
+
+
+def test_prepare_for_fork_freezes_the_current_heap():
+    try:
+        prepare_for_fork()
+        assert gc.get_freeze_count() > 0
+    finally:
+        gc.unfreeze()
@@ -0,0 +1,117 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from core.coalescing import RequestCoalescer
+from core.models import Finding, PromptInspectionRequest
+from core.rules import analyze_prompt
+from core.runtime import InspectionRuntime
+
+
+class _SlowDetector:
+    """Detector double that takes a while, so concurrent calls overlap."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def warmup(self) -> None:
+        pass
+
+    def detect(self, prompt: str) -> list[Finding]:
+        with self._lock:
+            self.calls += 1
+        time.sleep(0.2)
+        return [
+            Finding(
+                type="test_finding",
+                start=0,
+                end=len(prompt),
+                snippet=prompt,
+                message="test",
+                severity="low",
+                confidence=1.0,
+            )
+        ]
+
+
+def _together(fn, args):
+    barrier = threading.Barrier(len(args))
+
+    def call(arg):
+        barrier.wait()
+        return fn(arg)
+
+    with ThreadPoolExecutor(max_workers=len(args)) as pool:
+        return list(pool.map(call, args))
+
+
+def test_concurrent_calls_with_one_key_share_a_single_computation():
+    coalescer = RequestCoalescer()
+    runs = []
+
+    def compute():
+        runs.append(1)
+        time.sleep(0.2)
+        return "result"
+
+    assert _together(lambda _: coalescer.run("k", compute), range(6)) == ["result"] * 6
+
+    assert len(runs) == 1
+    stats = coalescer.stats()
+    assert stats.leaders == 1 and stats.coalesced == 5 and stats.in_flight == 0
+
+
+def test_distinct_keys_and_later_calls_are_computed_again():
+    coalescer = RequestCoalescer()
+
+    assert _together(lambda key: coalescer.run(key, lambda: key * 2), [1, 2, 3]) == [2, 4, 6]
+    assert coalescer.run(1, lambda: "again") == "again"
+
+    assert coalescer.stats().leaders == 4
+    assert coalescer.stats().coalesced == 0
+
+
+def test_error_reaches_every_waiting_caller():
+    coalescer = RequestCoalescer()
+
+    def compute():
+        time.sleep(0.2)
+        raise ValueError("boom")
+
+    def call(_):
+        with pytest.raises(ValueError):
+            coalescer.run("k", compute)
+
+    _together(call, range(4))
+    assert coalescer.run("k", lambda: "recovered") == "recovered"
+
+
+def test_identical_inspections_are_coalesced_without_a_result_cache():
+    detector = _SlowDetector()
+    runtime = InspectionRuntime(config_fingerprint="fp", coalescer=RequestCoalescer())
+    assert runtime.result_cache is None
+
+    responses = _together(
+        lambda prompt: analyze_prompt(PromptInspectionRequest(prompt=prompt), [detector], runtime),
+        ["same prompt"] * 5 + ["other prompt"],
+    )
+
+    assert detector.calls == 2
+    assert all(response == responses[0] for response in responses[:5])
+    assert responses[5].findings[0].snippet == "other prompt"
+    assert runtime.coalescer.stats().coalesced == 4
+
+
+def test_without_a_coalescer_every_inspection_runs_the_detectors():
+    detector = _SlowDetector()
+    runtime = InspectionRuntime(config_fingerprint="fp")
+
+    _together(
+        lambda prompt: analyze_prompt(PromptInspectionRequest(prompt=prompt), [detector], runtime),
+        ["same prompt"] * 3,
+    )
+
+    assert detector.calls == 3
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import pytest
+
+from core.cache import InspectionResultCache
+from core.models import Finding, PromptInspectionRequest
+from core.rules import analyze_prompt
+from core.runtime import InspectionRuntime
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _CountingDetector:
+    """Detector double that flags every prompt and counts invocations."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def warmup(self) -> None:
+        pass
+
+    def detect(self, prompt: str) -> list[Finding]:
+        self.calls += 1
+        return [
+            Finding(
+                type="test_finding",
+                start=0,
+                end=len(prompt),
+                snippet=prompt,
+                message="test",
+                severity="low",
+                confidence=1.0,
+            )
+        ]
+
+
+def _finding(snippet: str = "x") -> Finding:
+    return Finding(type="t", start=0, end=1, snippet=snippet, message="m", severity="low", confidence=1.0)
+
+
+def test_cache_hit_and_miss_are_counted():
+    cache = InspectionResultCache(max_entries=10, max_bytes=1_000_000, ttl_seconds=60)
+
+    assert cache.get("prompt", "fp1") is None
+    cache.put("prompt", "fp1", [_finding()])
+    cached = cache.get("prompt", "fp1")
+
+    assert cached is not None and len(cached) == 1
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+
+
+def test_cache_evicts_least_recently_used_entry():
+    cache = InspectionResultCache(max_entries=2, max_bytes=1_000_000, ttl_seconds=60)
+    cache.put("a", "fp", [])
+    cache.put("b", "fp", [])
+    assert cache.get("a", "fp") is not None  # "a" becomes most recently used
+
+    cache.put("c", "fp", [])
+
+    assert cache.get("b", "fp") is None
+    assert cache.get("a", "fp") is not None
+    assert cache.stats().evictions == 1
+
+
+def test_cache_respects_byte_budget():
+    cache = InspectionResultCache(max_entries=100, max_bytes=4_000, ttl_seconds=60)
+    for i in range(10):
+        cache.put(f"prompt-{i}", "fp", [_finding("s" * 500)])
+
+    stats = cache.stats()
+    assert stats.bytes <= 4_000
+    assert stats.evictions > 0
+    assert cache.get("prompt-9", "fp") is not None
+
+
+def test_cache_entries_expire_after_ttl():
+    clock = _FakeClock()
+    cache = InspectionResultCache(max_entries=10, max_bytes=1_000_000, ttl_seconds=5, clock=clock)
+    cache.put("prompt", "fp", [])
+
+    clock.now = 4.9
+    assert cache.get("prompt", "fp") is not None
+    clock.now = 5.0
+    assert cache.get("prompt", "fp") is None
+    assert cache.stats().expirations == 1
+
+
+def test_cache_flushes_on_config_fingerprint_change():
+    cache = InspectionResultCache(max_entries=10, max_bytes=1_000_000, ttl_seconds=60)
+    cache.put("prompt", "fp-old", [_finding()])
+
+    assert cache.get("prompt", "fp-new") is None
+
+    stats = cache.stats()
+    assert stats.invalidations == 1
+    assert stats.entries == 0
+
+
+def test_cache_rejects_invalid_bounds():
+    with pytest.raises(ValueError):
+        InspectionResultCache(max_entries=0, max_bytes=1, ttl_seconds=1)
+
+
+def test_analyze_prompt_skips_detectors_for_cached_prompt():
+    detector = _CountingDetector()
+    runtime = InspectionRuntime(
+        config_fingerprint="fp",
+        result_cache=InspectionResultCache(max_entries=10, max_bytes=1_000_000, ttl_seconds=60),
+    )
+    req = PromptInspectionRequest(prompt="same prompt", meta=None)
+
+    first = analyze_prompt(req, (detector,), runtime)
+    second = analyze_prompt(req, (detector,), runtime)
+
+    assert detector.calls == 1
+    assert [f.type for f in second.findings] == [f.type for f in first.findings]
+
+
+def test_analyze_prompt_without_runtime_always_runs_detectors():
+    detector = _CountingDetector()
+    req = PromptInspectionRequest(prompt="same prompt", meta=None)
+
+    analyze_prompt(req, (detector,))
+    analyze_prompt(req, (detector,))
+
+    assert detector.calls == 2
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+import threading
+import time
+
+from bootstrap import build_detectors
+from core.config.loader import load_config
+from core.startup import StartupTimeline
+
+
+def _with_parallel_warmup(config, parallel: bool):
+    startup = config.runtime.startup.model_copy(update={"parallel_warmup": parallel})
+    return config.model_copy(update={"runtime": config.runtime.model_copy(update={"startup": startup})})
+
+
+def test_timeline_records_overlapping_phases_from_several_threads():
+    timeline = StartupTimeline()
+    barrier = threading.Barrier(2)
+
+    def work(name: str) -> None:
+        with timeline.phase(name):
+            barrier.wait()
+            time.sleep(0.02)
+
+    threads = [threading.Thread(target=work, args=(name,)) for name in ("a", "b")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    a, b = timeline.phases
+    assert {a.name, b.name} == {"a", "b"}
+    assert b.start_ms < a.end_ms  # overlapped
+    assert timeline.total_ms == max(a.end_ms, b.end_ms)
+    assert timeline.total_ms < a.duration_ms + b.duration_ms
+
+    as_dict = timeline.as_dict()
+    assert [p["name"] for p in as_dict["phases"]] == [a.name, b.name]
+    assert as_dict["total_ms"] == round(timeline.total_ms, 1)
+
+
+def test_importing_the_app_does_not_import_heavy_detector_libraries():
+    code = (
+        "import sys, app; "
+        "print(','.join(m for m in ('spacy', 'presidio_analyzer', 'detect_secrets') if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ""
+
+
+def test_parallel_warmup_keeps_the_detector_order(presidio_settings):
+    config = presidio_settings(load_config(), enabled=False)
+    sequential = build_detectors(_with_parallel_warmup(config, parallel=False))
+
+    timeline = StartupTimeline()
+    parallel = build_detectors(_with_parallel_warmup(config, parallel=True), timeline)
+
+    assert [type(d).__name__ for d in parallel] == [type(d).__name__ for d in sequential] == [
+        "DetectSecretsDetector",
+        "NativeSecretDetector",
+        "InjectionPatternDetector",
+    ]
+    names = {phase.name for phase in timeline.phases}
+    assert "first_inference" in names
+    assert "model_load" not in names  # Presidio disabled: spaCy never loaded
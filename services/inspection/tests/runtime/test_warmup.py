@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from bootstrap import build_detectors
+from core.cache import InspectionResultCache
+from core.config.loader import ConfigError, load_config
+from core.config.models import ResultCacheConfig, WarmupConfig
+from core.models import Finding, PromptInspectionRequest
+from core.rules import analyze_prompt
+from core.runtime import InspectionRuntime
+from core.warmup import load_warmup_corpus, run_warmup
+
+
+class _SleepingDetector:
+    """Detector double whose calls take the given times in turn (the last one repeats)."""
+
+    def __init__(self, *delays_ms: float) -> None:
+        self._delays = list(delays_ms)
+        self.calls = 0
+
+    def warmup(self) -> None:
+        pass
+
+    def detect(self, prompt: str) -> list[Finding]:
+        delay = self._delays[min(self.calls, len(self._delays) - 1)]
+        self.calls += 1
+        time.sleep(delay / 1000.0)
+        return []
+
+
+def test_bundled_corpus_covers_the_model_free_rules(presidio_settings):
+    config = presidio_settings(load_config(), enabled=False)
+    prompts = load_warmup_corpus()
+    detectors = build_detectors(config)
+
+    found = {finding.type for prompt in prompts for d in detectors for finding in d.detect(prompt)}
+    injection_ids = {d.id for d in config.detection.prompt_injection.engines.pattern.detectors.values() if d.enabled}
+    assert injection_ids <= found
+    assert {"secret_aws_access_key", "secret_github_token", "secret_private_key", "secret_jwt"} <= found
+    assert any(not any(d.detect(prompt) for d in detectors) for prompt in prompts)  # clean prompts too
+
+
+def test_warmup_stops_once_round_latency_settles():
+    detector = _SleepingDetector(40, 5)
+    cfg = WarmupConfig(min_rounds=2, max_rounds=10, stable_tolerance=0.5)
+
+    report = run_warmup(["one prompt"], (detector,), None, cfg)
+
+    assert report.stable
+    assert report.rounds == 3  # 40 ms, then 5 ms twice
+    assert report.round_ms[0] > report.round_ms[-1]
+    assert report.as_dict()["rounds"] == 3
+
+
+def test_warmup_gives_up_after_max_rounds():
+    detector = _SleepingDetector(1, 20, 1, 20, 1, 20)
+    cfg = WarmupConfig(min_rounds=2, max_rounds=4, stable_tolerance=0.1)
+
+    report = run_warmup(["one prompt"], (detector,), None, cfg)
+
+    assert not report.stable
+    assert report.rounds == 4
+
+
+def test_warmup_bypasses_the_result_cache():
+    detector = _SleepingDetector(0)
+    cache = InspectionResultCache.from_config(ResultCacheConfig())
+    runtime = InspectionRuntime(config_fingerprint="fp", result_cache=cache)
+
+    report = run_warmup(["a", "b"], (detector,), runtime, WarmupConfig(max_rounds=3, stable_tolerance=100))
+
+    assert detector.calls == 2 * report.rounds
+    analyze_prompt(PromptInspectionRequest(prompt="a"), (detector,), runtime)
+    assert detector.calls == 2 * report.rounds + 1  # nothing was cached during warmup
+
+
+def test_corpus_without_prompts_is_rejected(tmp_path):
+    corpus = tmp_path / "corpus.yml"
+    corpus.write_text("prompts: []\n", encoding="utf-8")
+    with pytest.raises(ConfigError):
+        load_warmup_corpus(corpus)